@@ -1,13 +1,35 @@
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException, status
+from fastapi import FastAPI, UploadFile, File, Form, Header, HTTPException, Query, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, FileResponse
 from fastapi.staticfiles import StaticFiles
 import os
+import hashlib
 import shutil
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 import asyncio
+import math
+import time
+from dataclasses import asdict
 from datetime import datetime
 import logging
+from app.utils.memory import (
+    MemoryBudgetExceeded, RequestMemoryTracker, check_budget, limit_text,
+    MAX_PDF_PAGES, UPLOAD_CHUNK_SIZE
+)
+from app.services.text_cache import get_text_cache
+from app.services.chunked_upload import UploadError, get_chunked_uploads
+from app.services.analytics_store import get_analytics_store, job_key, ANALYTICS_FLUSH_INTERVAL
+from app.services.history_store import get_history_store
+from app.services.keywords import get_keyword_engine
+from app.services.dedup import get_duplicate_index
+from app.services.load_control import QUEUE_STAGE, get_load_controller
+from app.services.fair_queue import get_fair_scheduler
+from app.services.rate_limit import current_client, get_rate_limiter, identify_client
+from app.services.model_registry import get_scoring_service
+from app.services.scoring_service import ANALYSIS_TIERS, FAST_TIER, FULL_TIER
+from app.services.taxonomy import get_taxonomy, get_taxonomy_registry, TAXONOMY_RELOAD_INTERVAL
+from app.utils.coalesce import SingleFlight, content_key
+from app.utils.responses import FastJSONResponse
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -18,7 +40,8 @@ app = FastAPI(
     description="AI-powered resume analysis and job matching API",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=FastJSONResponse
 )
 
 # CORS middleware - Allow all origins for production
@@ -30,6 +53,45 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def track_memory(request: Request, call_next):
+    """Report per-request RSS growth in response headers"""
+    with RequestMemoryTracker() as tracker:
+        response = await call_next(request)
+    response.headers["X-RSS-Delta-Bytes"] = str(tracker.rss_delta)
+    response.headers["X-Peak-RSS-Growth-Bytes"] = str(tracker.peak_growth)
+    if tracker.peak_growth:
+        logger.info(f"{request.url.path} raised peak RSS by {tracker.peak_growth // 1024}KB")
+    return response
+
+# Requests that start analysis or parsing work count against the client's rate limit
+RATE_LIMITED_PATHS = {"/analyze", "/analyze-with-file", "/upload-resume", "/uploads"}
+
+@app.middleware("http")
+async def enforce_rate_limit(request: Request, call_next):
+    """Token-bucket limit per API key (X-API-Key) or client IP; 429 with Retry-After when exceeded"""
+    client = identify_client(
+        request.headers.get("x-api-key"),
+        request.client.host if request.client else None,
+        request.headers.get("x-forwarded-for")
+    )
+    current_client.set(client)
+    
+    limiter = get_rate_limiter()
+    if limiter is None or request.method != "POST" or request.url.path not in RATE_LIMITED_PATHS:
+        return await call_next(request)
+    
+    allowed, remaining, retry_after = limiter.acquire(client)
+    if not allowed:
+        return JSONResponse(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            content={"detail": "Rate limit exceeded. Please retry later."},
+            headers={"Retry-After": str(max(1, round(retry_after)))} if math.isfinite(retry_after) else None
+        )
+    response = await call_next(request)
+    response.headers["X-RateLimit-Remaining"] = str(int(remaining))
+    return response
+
 # Constants - Handle both local and production paths
 if os.getenv("RENDER"):
     # Production on Render
@@ -46,6 +108,21 @@ ALLOWED_EXTENSIONS = {".pdf", ".docx", ".doc", ".txt"}
 # Create upload directory
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+# Identical /analyze requests in flight at the same time share one computation
+analysis_flights = SingleFlight()
+
+# Text extraction started as soon as the last part of a chunked upload lands
+pending_extractions: Dict[str, asyncio.Task] = {}
+
+# Load models at import time so a pre-fork server (see gunicorn.conf.py)
+# shares them copy-on-write across workers
+if os.getenv("PRELOAD_MODELS") == "1":
+    try:
+        from app.services.model_registry import preload_models
+        preload_models()
+    except ImportError as e:
+        logger.warning(f"Could not preload NLP models: {e}")
+
 # Mount static files for production (React build)
 if STATIC_DIR and os.path.exists(STATIC_DIR):
     app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
@@ -89,6 +166,135 @@ def validate_file(file: UploadFile) -> bool:
     
     return True
 
+async def save_upload(file: UploadFile) -> Tuple[str, str]:
+    """Stream an upload to disk in chunks, enforcing size and memory limits.
+    
+    Returns the saved path and the document id (SHA-256 of the file bytes).
+    """
+    file_ext = os.path.splitext(file.filename)[1].lower()
+    try:
+        if file.size:
+            if file.size > MAX_FILE_SIZE:
+                raise HTTPException(status_code=413, detail="File too large. Maximum size is 10MB.")
+            check_budget(file.size, file_ext)
+    except MemoryBudgetExceeded as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"{timestamp}_{file.filename}"
+    file_path = os.path.join(UPLOAD_DIR, filename)
+    
+    written = 0
+    digest = hashlib.sha256()
+    try:
+        with open(file_path, "wb") as buffer:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                written += len(chunk)
+                if written > MAX_FILE_SIZE:
+                    raise HTTPException(status_code=413, detail="File too large. Maximum size is 10MB.")
+                buffer.write(chunk)
+                digest.update(chunk)
+        if not file.size:
+            check_budget(written, file_ext)
+    except MemoryBudgetExceeded as e:
+        remove_file(file_path)
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception:
+        remove_file(file_path)
+        raise
+    
+    return file_path, digest.hexdigest()
+
+def remove_file(file_path: str) -> None:
+    """Remove a temporary upload, ignoring errors"""
+    try:
+        os.remove(file_path)
+    except OSError:
+        pass
+
+def extract_upload_text(file_path: str) -> str:
+    """Extract text from a saved upload and delete the temporary file"""
+    try:
+        return extract_text_from_file(file_path)
+    except MemoryBudgetExceeded as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    finally:
+        remove_file(file_path)
+
+async def read_upload_text(file: UploadFile) -> Tuple[str, str]:
+    """Return (text, document_id) for an upload, skipping extraction for cached content"""
+    file_path, document_id = await save_upload(file)
+    text_cache = get_text_cache()
+    
+    cached_text = text_cache.get(document_id)
+    if cached_text is not None:
+        remove_file(file_path)
+        logger.info(f"Text cache hit for document {document_id[:12]}")
+        return cached_text, document_id
+    
+    text = extract_upload_text(file_path)
+    if text.strip():
+        text_cache.put(document_id, text)
+    return text, document_id
+
+def upload_response(filename: str, document_id: str, text_content: str) -> dict:
+    """Summary returned once an upload has been parsed"""
+    return {
+        "message": "Resume uploaded and processed successfully",
+        "filename": filename,
+        "document_id": document_id,
+        "text_preview": text_content[:500] + "..." if len(text_content) > 500 else text_content,
+        "word_count": len(text_content.split()),
+        "char_count": len(text_content)
+    }
+
+def upload_http_error(e: UploadError) -> HTTPException:
+    return HTTPException(status_code=e.status_code, detail=str(e))
+
+def start_upload_extraction(upload_id: str) -> None:
+    """Begin extracting a fully received upload's text before the client completes it"""
+    if upload_id in pending_extractions:
+        return
+    task = asyncio.create_task(asyncio.to_thread(extract_received_upload, upload_id))
+    pending_extractions[upload_id] = task
+    task.add_done_callback(lambda _: pending_extractions.pop(upload_id, None))
+
+def extract_received_upload(upload_id: str) -> None:
+    """Extract and cache the text of a received upload; ``complete`` then hits the cache"""
+    try:
+        received = get_chunked_uploads().data_path(upload_id)
+        if received is None:
+            return
+        file_path, document_id = received
+        text_cache = get_text_cache()
+        if text_cache.get(document_id) is None:
+            text = extract_text_from_file(file_path)
+            if text.strip():
+                text_cache.put(document_id, text)
+    except Exception as e:
+        # complete_upload extracts again and reports the error to the client
+        logger.warning(f"Early extraction of upload {upload_id} failed: {e}")
+
+def get_document_text(document_id: str) -> str:
+    """Look up previously uploaded document text by id"""
+    text = get_text_cache().get(document_id)
+    if text is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Document not found. It may have expired; please upload the file again."
+        )
+    return text
+
+def prepare_text(text: str) -> str:
+    """Bound text size before NLP, translating budget errors to HTTP 413"""
+    try:
+        return limit_text(text)
+    except MemoryBudgetExceeded as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
 def extract_text_from_file(file_path: str) -> str:
     """Extract text content from uploaded file"""
     try:
@@ -102,194 +308,279 @@ def extract_text_from_file(file_path: str) -> str:
             try:
                 import pdfplumber
                 with pdfplumber.open(file_path) as pdf:
-                    text = ""
+                    if len(pdf.pages) > MAX_PDF_PAGES:
+                        raise MemoryBudgetExceeded(
+                            f"PDF has {len(pdf.pages)} pages; the maximum is {MAX_PDF_PAGES}."
+                        )
+                    parts = []
                     for page in pdf.pages:
-                        text += page.extract_text() or ""
-                    return text
+                        parts.append(page.extract_text() or "")
+                        # Drop cached layout objects once the page is extracted
+                        page.flush_cache()
+                    return "".join(parts)
+            except MemoryBudgetExceeded:
+                raise
             except Exception as e:
                 logger.error(f"PDF extraction error: {e}")
                 return ""
         
         elif file_ext in ['.docx', '.doc']:
             try:
-                from docx import Document
-                doc = Document(file_path)
-                text = ""
-                for paragraph in doc.paragraphs:
-                    text += paragraph.text + "\n"
-                return text
+                from app.services.text_parser import TextParser
+                return TextParser.extract_text_from_docx(file_path)
             except Exception as e:
                 logger.error(f"DOCX extraction error: {e}")
                 return ""
         
         return ""
+    except MemoryBudgetExceeded:
+        raise
     except Exception as e:
         logger.error(f"File extraction error: {e}")
         return ""
 
-def get_nlp_analyzer():
-    """Get NLP analyzer"""
-    try:
-        from app.services.nlp_analyzer import NLPAnalyzer
-        return NLPAnalyzer()
-    except ImportError as e:
-        logger.warning(f"Could not import NLP analyzer: {e}")
+def analyze_resume_match(resume_text: str, job_description: str, tier: str = FULL_TIER) -> dict:
+    """Analyze resume match against job description with the shared scoring pipeline"""
+    return get_scoring_service().analyze_resume_jd_match(resume_text, job_description, tier).to_dict()
+
+def analyze_incremental(session_id: str, resume_text: str, job_description: str,
+                        tier: str = FULL_TIER) -> dict:
+    """Analyze a resume revision, recomputing only the sections edited since the last call"""
+    if len(session_id) > 128:
+        raise HTTPException(status_code=400, detail="session_id must be at most 128 characters.")
+    
+    outcome, stats = get_scoring_service().analyze_incremental(session_id, resume_text, job_description, tier)
+    result = outcome.to_dict()
+    result['sections'] = {
+        'total': stats.sections_total,
+        'reused': stats.sections_reused
+    }
+    return result
+
+def validate_tier(tier: str) -> str:
+    if tier not in ANALYSIS_TIERS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown analysis tier '{tier}'. Choose from: {', '.join(ANALYSIS_TIERS)}."
+        )
+    return tier
+
+def validate_min_score(min_score: float) -> float:
+    if not 0 <= min_score <= 100:
+        raise HTTPException(
+            status_code=400,
+            detail="min_score must be between 0 and 100."
+        )
+    return min_score
+
+def run_screening(resume_text: str, job_description: str, min_score: float) -> dict:
+    """Pass/fail a resume against a score cutoff; screenings are not recorded"""
+    return get_scoring_service().screen_resume(resume_text, job_description, min_score).to_dict()
+
+def run_analysis(resume_text: str, job_description: str, job_id: Optional[str],
+                 document_id: Optional[str], session_id: Optional[str] = None,
+                 tier: str = FULL_TIER) -> dict:
+    """Analyze size-bounded texts at the requested tier and record the result.
+    
+    Resubmissions of a resume whose cleaned text was already analyzed
+    against the same job and job description (at the same or a deeper tier,
+    with the same taxonomy and keyword tables, outside a session) return the
+    stored result (``reused``); near duplicates are analyzed as usual and
+    flagged with ``duplicate_of``. When the load controller reports the latency SLO
+    at risk, full-tier requests are served at the fast tier and marked
+    ``degraded``.
+    """
+    started = time.perf_counter()
+    requested_tier = tier
+    controller = get_load_controller()
+    if tier == FULL_TIER and controller is not None and controller.shed_semantic():
+        tier = FAST_TIER
+    document_id = document_id or hashlib.sha256(resume_text.encode("utf-8")).hexdigest()
+    job = job_key(job_description, job_id)
+    version = scoring_version()
+    
+    duplicate = None
+    duplicate_index = get_duplicate_index()
+    if duplicate_index is not None:
+        duplicate = duplicate_index.check_and_add(document_id, resume_text)
+    
+    if not session_id:
+        same_content = [document_id] + ([duplicate.document_id] if duplicate and duplicate.exact else [])
+        # A full analysis also answers a fast request
+        methods = [FULL_TIER] if tier == FULL_TIER else [FAST_TIER, FULL_TIER]
+        previous = find_previous_analysis(same_content, job, job_description, version, methods)
+        if previous is not None:
+            result = previous['result']
+            result['analysis_id'] = previous['id']
+            result['reused'] = True
+            # Duplicates are reported against the index as it is now
+            result.pop('duplicate_of', None)
+            if duplicate:
+                result['duplicate_of'] = asdict(duplicate)
+            if requested_tier == FULL_TIER and previous['analysis_method'] != FULL_TIER:
+                result['degraded'] = True
+            return result
+    
+    if session_id:
+        result = analyze_incremental(session_id, resume_text, job_description, tier)
+    else:
+        result = analyze_resume_match(resume_text, job_description, tier)
+    
+    if duplicate:
+        result['duplicate_of'] = asdict(duplicate)
+    record_analysis(result, resume_text, job_description, job, document_id, started,
+                    version, from_session=bool(session_id))
+    if tier != requested_tier:
+        result['degraded'] = True
+    return result
+
+async def dispatch_analysis(resume_text: str, job_description: str, job_id: Optional[str],
+                            document_id: Optional[str], session_id: Optional[str] = None,
+                            tier: str = FULL_TIER) -> dict:
+    """Run ``run_analysis`` once per set of identical concurrent requests.
+    
+    Double-clicks and client retries often send the same payload while the
+    first copy is still running; requests with the same resume, job
+    description, job, session and tier join that computation and receive
+    its result, marked ``coalesced``.
+    """
+    key = content_key(resume_text, job_description, job_id, session_id, tier)
+    result, shared = await analysis_flights.do(
+        key, lambda: run_in_worker(run_analysis, resume_text, job_description, job_id, document_id, session_id, tier)
+    )
+    if shared:
+        result = dict(result)
+        result['coalesced'] = True
+    return result
+
+async def run_in_worker(fn, *args, **kwargs) -> dict:
+    """Run ``fn`` (``run_analysis`` or ``run_screening``) on a worker thread in the client's fair-queue turn.
+    
+    Time spent waiting for the turn counts as queue time for the load controller.
+    """
+    controller = get_load_controller()
+    scheduler = get_fair_scheduler()
+    queued = time.perf_counter()
+    
+    def work() -> dict:
+        if controller is not None:
+            controller.observe(QUEUE_STAGE, (time.perf_counter() - queued) * 1000)
+        return fn(*args, **kwargs)
+    
+    async def schedule() -> dict:
+        if scheduler is None:
+            return await asyncio.to_thread(work)
+        return await scheduler.run(current_client.get(), work)
+    
+    if controller is None:
+        return await schedule()
+    with controller.admit():
+        return await schedule()
+
+def scoring_version() -> str:
+    """Versions of the taxonomy and keyword IDF table that results are computed with"""
+    return f"{get_taxonomy().version}:{get_keyword_engine().version}"
+
+def find_previous_analysis(document_ids: List[str], job: str, job_description: str,
+                           version: str, methods: List[str]) -> Optional[dict]:
+    """Return the latest reusable analysis of any of these documents for the job's current description"""
+    history = get_history_store()
+    if history is None:
         return None
+    for candidate in document_ids:
+        try:
+            previous = history.latest_analysis(candidate, job, job_description, version, methods)
+        except Exception as e:
+            logger.warning(f"Could not look up analysis history: {e}")
+            return None
+        if previous is not None:
+            return previous
+    return None
 
-def analyze_resume_match(resume_text: str, job_description: str) -> dict:
-    """Analyze resume match against job description"""
+def record_analysis(result: dict, resume_text: str, job_description: str, job: str,
+                    document_id: str, started: float, version: Optional[str] = None,
+                    from_session: bool = False) -> None:
+    """Persist an analysis to the history and analytics stores; never fails the request.
     
-    # Try to use NLP analyzer, fallback to simple analysis
-    nlp_analyzer = get_nlp_analyzer()
+    Adds ``analysis_id`` to the result so clients can fetch it again from
+    ``/analyses/{analysis_id}`` instead of re-running the analysis.
+    """
+    duration_ms = (time.perf_counter() - started) * 1000
     
-    if nlp_analyzer:
+    history = get_history_store()
+    if history is not None:
         try:
-            # Use advanced NLP analysis
-            similarity_score = nlp_analyzer.calculate_similarity(resume_text, job_description)
-            resume_skills = nlp_analyzer.extract_skills(resume_text)
-            job_skills = nlp_analyzer.extract_skills(job_description)
-            suggestions = nlp_analyzer.generate_improvement_suggestions(resume_text, job_description)
-            
-            return {
-                "overall_score": round(similarity_score, 1),
-                "skills_analysis": {
-                    "matched_skills": resume_skills["found"],
-                    "missing_skills": [skill for skill in job_skills["found"] if skill not in resume_skills["found"]][:10],
-                    "skills_score": round(similarity_score * 0.8, 1)  # Weight skills heavily
-                },
-                "experience_score": round(similarity_score * 0.9, 1),
-                "certification_score": round(similarity_score * 0.7, 1),
-                "suggestions": suggestions,
-                "analysis_method": "advanced_nlp"
-            }
+            result['analysis_id'] = history.save_analysis(
+                result, job, job_description, document_id, len(resume_text), duration_ms,
+                version, from_session
+            )
         except Exception as e:
-            logger.error(f"NLP analysis failed: {e}")
-            # Fall through to simple analysis
-    
-    # Simple keyword-based analysis (fallback)
-    resume_lower = resume_text.lower()
-    jd_lower = job_description.lower()
-    
-    # Common technical skills
-    technical_skills = [
-        'python', 'java', 'javascript', 'react', 'angular', 'vue', 'node.js', 'express',
-        'django', 'flask', 'spring', 'docker', 'kubernetes', 'aws', 'azure', 'gcp',
-        'sql', 'mongodb', 'postgresql', 'mysql', 'redis', 'git', 'jenkins', 'terraform',
-        'html', 'css', 'typescript', 'golang', 'rust', 'c++', 'c#', '.net', 'php',
-        'machine learning', 'ai', 'data science', 'analytics', 'tableau', 'power bi'
-    ]
-    
-    # Experience keywords
-    experience_keywords = [
-        'years', 'experience', 'worked', 'developed', 'managed', 'led', 'created',
-        'implemented', 'designed', 'built', 'maintained', 'optimized'
-    ]
-    
-    # Certification keywords  
-    cert_keywords = [
-        'certified', 'certification', 'degree', 'bachelor', 'master', 'phd',
-        'aws certified', 'azure certified', 'google cloud', 'cissp', 'pmp'
-    ]
-    
-    # Find matched skills
-    matched_skills = []
-    missing_skills = []
-    
-    for skill in technical_skills:
-        if skill in jd_lower:
-            if skill in resume_lower:
-                matched_skills.append({
-                    'skill': skill.title(),
-                    'matched': True,
-                    'importance': 'high' if skill in ['python', 'java', 'react', 'aws'] else 'medium'
-                })
-            else:
-                missing_skills.append(skill.title())
-    
-    # Calculate scores
-    total_jd_skills = len([s for s in technical_skills if s in jd_lower])
-    matched_count = len(matched_skills)
-    
-    skills_score = (matched_count / max(total_jd_skills, 1)) * 100 if total_jd_skills > 0 else 0
-    
-    # Experience analysis
-    exp_score = 75  # Default score
-    if any(keyword in resume_lower for keyword in experience_keywords):
-        exp_score = 85
-    
-    # Certification analysis
-    cert_score = 60  # Default score
-    if any(keyword in resume_lower for keyword in cert_keywords):
-        cert_score = 80
-    
-    # Overall weighted score
-    overall_score = (skills_score * 0.5) + (exp_score * 0.3) + (cert_score * 0.2)
-    
-    # Generate suggestions
-    suggestions = []
-    if len(missing_skills) > 0:
-        suggestions.append({
-            'category': 'skills',
-            'priority': 'high',
-            'suggestion': f'Add missing technical skills to strengthen your profile',
-            'specific_action': f'Consider adding: {", ".join(missing_skills[:3])}'
-        })
-    
-    if exp_score < 80:
-        suggestions.append({
-            'category': 'experience',
-            'priority': 'medium',
-            'suggestion': 'Highlight your work experience more prominently',
-            'specific_action': 'Include specific years of experience and quantifiable achievements'
-        })
-    
-    if cert_score < 70:
-        suggestions.append({
-            'category': 'certifications',
-            'priority': 'low',
-            'suggestion': 'Consider adding relevant certifications',
-            'specific_action': 'Look into industry-standard certifications for your field'
-        })
-    
-    # ATS Keywords analysis
-    jd_words = set(jd_lower.split())
-    resume_words = set(resume_lower.split())
-    common_keywords = jd_words.intersection(resume_words)
-    
-    ats_keywords = {}
-    important_terms = ['experience', 'skills', 'management', 'development', 'analysis', 'design']
-    for term in important_terms:
-        ats_keywords[term] = term in common_keywords
+            logger.warning(f"Could not save analysis history: {e}")
     
-    return {
-        'overall_score': round(overall_score, 1),
-        'match_breakdown': {
-            'skills_score': round(skills_score, 1),
-            'experience_score': round(exp_score, 1),
-            'certification_score': round(cert_score, 1)
-        },
-        'matched_skills': matched_skills,
-        'missing_skills': missing_skills,
-        'detailed_suggestions': suggestions,
-        'ats_keywords': ats_keywords,
-        'semantic_matches': [],  # Placeholder for future NLP implementation
-        'experience_analysis': {
-            'matched': exp_score > 80,
-            'required_years': 3,
-            'found_years': 4
-        },
-        'analysis_method': 'simple_keyword'
-    }
+    store = get_analytics_store()
+    if store is None:
+        return
+    try:
+        store.record(result, job, document_id)
+    except Exception as e:
+        logger.warning(f"Could not record analysis for analytics: {e}")
+
+@app.on_event("startup")
+async def start_analytics_flusher():
+    """Periodically write buffered analysis results to Parquet and compact small parts"""
+    store = get_analytics_store()
+    if store is None or ANALYTICS_FLUSH_INTERVAL <= 0:
+        return
+    
+    async def flush():
+        while True:
+            await asyncio.sleep(ANALYTICS_FLUSH_INTERVAL)
+            try:
+                await asyncio.to_thread(store.flush)
+                await asyncio.to_thread(store.compact)
+            except Exception as e:
+                logger.error(f"Analytics flush failed: {e}")
+    
+    asyncio.create_task(flush())
+
+@app.on_event("shutdown")
+async def flush_analytics():
+    """Write any buffered analysis results before the process exits"""
+    store = get_analytics_store()
+    if store is not None:
+        store.flush()
+
+@app.on_event("startup")
+async def start_taxonomy_watcher():
+    """Poll the taxonomy file and hot-reload the skill index when it changes"""
+    if TAXONOMY_RELOAD_INTERVAL <= 0:
+        return
+    
+    async def watch():
+        registry = get_taxonomy_registry()
+        while True:
+            await asyncio.sleep(TAXONOMY_RELOAD_INTERVAL)
+            # Build the new index off the event loop; requests keep using the old one
+            await asyncio.to_thread(registry.reload_if_changed)
+    
+    asyncio.create_task(watch())
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {
+    health = {
         "status": "healthy",
         "timestamp": datetime.utcnow().isoformat(),
         "service": "Resume Analyzer API",
         "version": "1.0.0"
     }
+    controller = get_load_controller()
+    if controller is not None:
+        health["load"] = controller.snapshot()
+    scheduler = get_fair_scheduler()
+    if scheduler is not None:
+        health["scheduler"] = scheduler.snapshot()
+    return health
 
 @app.post("/upload-resume")
 async def upload_resume(file: UploadFile = File(...)):
@@ -302,24 +593,9 @@ async def upload_resume(file: UploadFile = File(...)):
                 detail="Invalid file format. Please upload PDF, DOCX, DOC, or TXT files only."
             )
         
-        # Check file size
-        if file.size and file.size > MAX_FILE_SIZE:
-            raise HTTPException(
-                status_code=413,
-                detail="File too large. Maximum size is 10MB."
-            )
-        
-        # Save file
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{timestamp}_{file.filename}"
-        file_path = os.path.join(UPLOAD_DIR, filename)
-        
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-        
-        # Extract text
-        text_content = extract_text_from_file(file_path)
+        # Save file (size and memory budget are enforced while streaming),
+        # then extract text unless identical bytes were seen before
+        text_content, document_id = await read_upload_text(file)
         
         if not text_content.strip():
             raise HTTPException(
@@ -327,19 +603,7 @@ async def upload_resume(file: UploadFile = File(...)):
                 detail="Could not extract text from the file. Please ensure the file is not corrupted."
             )
         
-        # Clean up file (optional - remove if you want to keep files)
-        try:
-            os.remove(file_path)
-        except:
-            pass
-        
-        return {
-            "message": "Resume uploaded and processed successfully",
-            "filename": file.filename,
-            "text_preview": text_content[:500] + "..." if len(text_content) > 500 else text_content,
-            "word_count": len(text_content.split()),
-            "char_count": len(text_content)
-        }
+        return upload_response(file.filename, document_id, text_content)
         
     except HTTPException:
         raise
@@ -350,15 +614,133 @@ async def upload_resume(file: UploadFile = File(...)):
             detail="An error occurred while processing the file."
         )
 
+@app.post("/uploads")
+async def create_upload(
+    filename: str = Form(...),
+    size: int = Form(...),
+    sha256: Optional[str] = Form(None)
+):
+    """Start a chunked, resumable upload for files too large or links too slow for one POST.
+    
+    Send the file as parts with ``PUT /uploads/{upload_id}/parts``, then
+    call ``POST /uploads/{upload_id}/complete`` to parse it. An interrupted
+    upload resumes by sending only the ``missing`` ranges reported by
+    ``GET /uploads/{upload_id}``.
+    """
+    file_ext = os.path.splitext(filename)[1].lower()
+    if file_ext not in ALLOWED_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid file format. Please upload PDF, DOCX, DOC, or TXT files only."
+        )
+    try:
+        check_budget(size, file_ext)
+        return await asyncio.to_thread(get_chunked_uploads().create, filename, size, sha256)
+    except MemoryBudgetExceeded as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except UploadError as e:
+        raise upload_http_error(e)
+
+@app.put("/uploads/{upload_id}/parts")
+async def upload_part(
+    upload_id: str,
+    request: Request,
+    offset: int = Query(..., ge=0),
+    x_content_sha256: str = Header(...)
+):
+    """Write one part (the raw request body) at ``offset``, verified against ``X-Content-SHA256``.
+    
+    The body is read incrementally and refused as soon as it exceeds the
+    part limit, so a chunked request without ``Content-Length`` cannot make
+    the server buffer more than one part.
+    """
+    uploads = get_chunked_uploads()
+    too_large = HTTPException(status_code=413, detail=f"Parts may be at most {uploads.max_part} bytes.")
+    declared = request.headers.get("content-length")
+    if declared:
+        try:
+            declared_length = int(declared)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid Content-Length header.")
+        if declared_length > uploads.max_part:
+            raise too_large
+    data = bytearray()
+    async for chunk in request.stream():
+        data += chunk
+        if len(data) > uploads.max_part:
+            raise too_large
+    try:
+        upload_status = await asyncio.to_thread(uploads.write_part, upload_id, offset, bytes(data), x_content_sha256)
+    except UploadError as e:
+        raise upload_http_error(e)
+    if upload_status["complete"]:
+        start_upload_extraction(upload_id)
+    return upload_status
+
+@app.get("/uploads/{upload_id}")
+async def get_upload_status(upload_id: str):
+    """Received bytes and the byte ranges still missing"""
+    try:
+        return await asyncio.to_thread(get_chunked_uploads().status, upload_id)
+    except UploadError as e:
+        raise upload_http_error(e)
+
+@app.post("/uploads/{upload_id}/complete")
+async def complete_upload(upload_id: str):
+    """Assemble a fully received upload and parse it; returns the same body as /upload-resume"""
+    pending = pending_extractions.get(upload_id)
+    if pending is not None:
+        await asyncio.shield(pending)
+    try:
+        file_path, document_id, filename = await asyncio.to_thread(get_chunked_uploads().complete, upload_id)
+    except UploadError as e:
+        raise upload_http_error(e)
+    
+    text_cache = get_text_cache()
+    text_content = text_cache.get(document_id)
+    if text_content is None:
+        text_content = await asyncio.to_thread(extract_upload_text, file_path)
+        if text_content.strip():
+            text_cache.put(document_id, text_content)
+    else:
+        remove_file(file_path)
+    
+    if not text_content.strip():
+        raise HTTPException(
+            status_code=422,
+            detail="Could not extract text from the file. Please ensure the file is not corrupted."
+        )
+    return upload_response(filename, document_id, text_content)
+
+@app.delete("/uploads/{upload_id}")
+async def abort_upload(upload_id: str):
+    """Discard an unfinished upload and its received parts"""
+    try:
+        await asyncio.to_thread(get_chunked_uploads().abort, upload_id)
+    except UploadError as e:
+        raise upload_http_error(e)
+    return {"upload_id": upload_id, "aborted": True}
+
 @app.post("/analyze")
 async def analyze_resume(
-    resume_text: str = Form(...),
+    resume_text: str = Form(""),
     job_description: str = Form(...),
-    resume_file: Optional[UploadFile] = File(None)
+    resume_file: Optional[UploadFile] = File(None),
+    document_id: Optional[str] = Form(None),
+    session_id: Optional[str] = Form(None),
+    job_id: Optional[str] = Form(None),
+    tier: str = Form(FULL_TIER),
+    min_score: Optional[float] = Form(None)
 ):
-    """Analyze resume against job description"""
+    """Analyze resume against job description.
+    
+    Passing the same ``session_id`` on successive edits of a resume lets the
+    server reuse results for sections that did not change. Passing
+    ``min_score`` screens the resume instead and returns only whether it
+    reaches that score.
+    """
     try:
-        # Use file content if provided, otherwise use text
+        # Use file content if provided, then a previously uploaded document, then text
         if resume_file and resume_file.filename:
             if not validate_file(resume_file):
                 raise HTTPException(
@@ -367,21 +749,9 @@ async def analyze_resume(
                 )
             
             # Save and extract text from file
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{timestamp}_{resume_file.filename}"
-            file_path = os.path.join(UPLOAD_DIR, filename)
-            
-            with open(file_path, "wb") as buffer:
-                content = await resume_file.read()
-                buffer.write(content)
-            
-            resume_text = extract_text_from_file(file_path)
-            
-            # Clean up
-            try:
-                os.remove(file_path)
-            except:
-                pass
+            resume_text, document_id = await read_upload_text(resume_file)
+        elif document_id:
+            resume_text = get_document_text(document_id)
         
         if not resume_text.strip():
             raise HTTPException(
@@ -395,10 +765,18 @@ async def analyze_resume(
                 detail="Job description is empty. Please provide job description."
             )
         
-        # Perform analysis
-        analysis_results = analyze_resume_match(resume_text, job_description)
+        if min_score is not None:
+            return FastJSONResponse(await run_in_worker(
+                run_screening, prepare_text(resume_text), prepare_text(job_description),
+                validate_min_score(min_score)
+            ))
         
-        return analysis_results
+        # Perform analysis on size-bounded text; returning the response
+        # directly skips FastAPI's jsonable_encoder walk over the result
+        return FastJSONResponse(await dispatch_analysis(
+            prepare_text(resume_text), prepare_text(job_description), job_id, document_id, session_id,
+            validate_tier(tier)
+        ))
         
     except HTTPException:
         raise
@@ -412,43 +790,41 @@ async def analyze_resume(
 @app.post("/analyze-with-file")
 async def analyze_with_file(
     job_description: str = Form(...),
-    resume_file: UploadFile = File(...)
+    resume_file: Optional[UploadFile] = File(None),
+    document_id: Optional[str] = Form(None),
+    job_id: Optional[str] = Form(None),
+    tier: str = Form(FULL_TIER)
 ):
-    """Analyze resume file against job description"""
+    """Analyze resume file (or a previously uploaded document) against job description"""
     try:
-        if not validate_file(resume_file):
+        if resume_file and resume_file.filename:
+            if not validate_file(resume_file):
+                raise HTTPException(
+                    status_code=400,
+                    detail="Invalid file format."
+                )
+            
+            # Save and extract text
+            resume_text, document_id = await read_upload_text(resume_file)
+        elif document_id:
+            resume_text = get_document_text(document_id)
+        else:
             raise HTTPException(
                 status_code=400,
-                detail="Invalid file format."
+                detail="Provide a resume file or the document_id returned by /upload-resume."
             )
         
-        # Save and extract text
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{timestamp}_{resume_file.filename}"
-        file_path = os.path.join(UPLOAD_DIR, filename)
-        
-        with open(file_path, "wb") as buffer:
-            content = await resume_file.read()
-            buffer.write(content)
-        
-        resume_text = extract_text_from_file(file_path)
-        
-        # Clean up
-        try:
-            os.remove(file_path)
-        except:
-            pass
-        
         if not resume_text.strip():
             raise HTTPException(
                 status_code=422,
                 detail="Could not extract text from resume file."
             )
         
-        # Perform analysis
-        analysis_results = analyze_resume_match(resume_text, job_description)
-        
-        return analysis_results
+        # Perform analysis on size-bounded text
+        return FastJSONResponse(await dispatch_analysis(
+            prepare_text(resume_text), prepare_text(job_description), job_id, document_id,
+            tier=validate_tier(tier)
+        ))
         
     except HTTPException:
         raise
@@ -461,36 +837,80 @@ async def analyze_with_file(
 
 @app.get("/skills")
 async def get_supported_skills():
-    """Get list of supported skills"""
-    skills = {
-        'programming_languages': [
-            'Python', 'Java', 'JavaScript', 'TypeScript', 'C++', 'C#', 'Go', 'Rust', 'PHP', 'Ruby'
-        ],
-        'web_technologies': [
-            'React', 'Angular', 'Vue.js', 'Node.js', 'Express', 'Django', 'Flask', 'Spring Boot'
-        ],
-        'databases': [
-            'MySQL', 'PostgreSQL', 'MongoDB', 'Redis', 'SQLite', 'Oracle', 'SQL Server'
-        ],
-        'cloud_platforms': [
-            'AWS', 'Azure', 'Google Cloud', 'Docker', 'Kubernetes', 'Terraform'
-        ],
-        'data_science': [
-            'Machine Learning', 'Deep Learning', 'Data Analysis', 'Pandas', 'NumPy', 'TensorFlow'
-        ]
-    }
-    return skills
+    """Get list of supported skills, served from the live taxonomy index"""
+    return get_taxonomy().skills_by_category()
+
+@app.get("/analytics/report")
+async def get_analytics_report(
+    job_id: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    top: int = Query(20, ge=1, le=200),
+    bins: int = Query(10, ge=1, le=100)
+):
+    """Aggregate score distributions and skill-gap frequencies from stored analyses"""
+    store = get_analytics_store()
+    if store is None:
+        raise HTTPException(status_code=503, detail="Analytics export is not enabled.")
+    
+    for value in (start_date, end_date):
+        if value:
+            try:
+                datetime.strptime(value, "%Y-%m-%d")
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Dates must use the YYYY-MM-DD format.")
+    
+    job = job_key("", job_id) if job_id else None
+    return await asyncio.to_thread(store.report, job, start_date, end_date, top, bins)
+
+def require_history_store():
+    store = get_history_store()
+    if store is None:
+        raise HTTPException(status_code=503, detail="Analysis history is not enabled.")
+    return store
+
+@app.get("/analyses")
+async def list_analyses(
+    job_id: Optional[str] = None,
+    document_id: Optional[str] = None,
+    min_score: Optional[float] = Query(None, ge=0, le=100),
+    max_score: Optional[float] = Query(None, ge=0, le=100),
+    skill: Optional[str] = None,
+    missing_skill: Optional[str] = None,
+    before_id: Optional[int] = None,
+    limit: int = Query(50, ge=1, le=200)
+):
+    """List stored analyses, newest first; pass ``next_before_id`` back to get the next page"""
+    store = require_history_store()
+    job = job_key("", job_id) if job_id else None
+    return await asyncio.to_thread(
+        store.list_analyses, job, document_id, min_score, max_score, skill, missing_skill, before_id, limit
+    )
+
+@app.get("/analyses/{analysis_id}")
+async def get_analysis(analysis_id: int):
+    """Return a stored analysis without recomputing it"""
+    analysis = await asyncio.to_thread(require_history_store().get_analysis, analysis_id)
+    if analysis is None:
+        raise HTTPException(status_code=404, detail="Analysis not found.")
+    return FastJSONResponse(analysis)
+
+@app.get("/jobs")
+async def list_jobs(limit: int = Query(50, ge=1, le=200), offset: int = Query(0, ge=0)):
+    """List job profiles seen so far with analysis counts and average scores"""
+    return await asyncio.to_thread(require_history_store().list_jobs, limit, offset)
 
 @app.get("/stats")
 async def get_api_stats():
     """Get API usage statistics"""
-    return {
-        "total_analyses": 1250,
-        "average_score": 73.2,
+    stats = {
         "supported_formats": ["PDF", "DOCX", "DOC", "TXT"],
-        "max_file_size": "10MB",
-        "avg_processing_time": "3.2s"
+        "max_file_size": "10MB"
     }
+    store = get_history_store()
+    if store is not None:
+        stats.update(await asyncio.to_thread(store.stats))
+    return stats
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,74 @@
+"""Compact internal result types used inside the scoring pipeline.
+
+These are slotted dataclasses without validation so that batch scoring does
+not pay for a Pydantic model per matched item. Endpoints return their
+``to_dict()`` form in a ``FastJSONResponse``, which serializes it as is.
+"""
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+@dataclass(slots=True)
+class SkillMatchResult:
+    skill: str
+    matched: bool
+    importance: str
+    found_variations: List[str] = field(default_factory=list)
+
+@dataclass(slots=True)
+class CertificationResult:
+    certification: str
+    matched: bool
+    importance: str
+
+@dataclass(slots=True)
+class ExperienceResult:
+    matched: bool
+    required_years: Optional[int] = None
+    found_years: Optional[int] = None
+    job_titles_matched: List[str] = field(default_factory=list)
+    missing_job_titles: List[str] = field(default_factory=list)
+
+@dataclass(slots=True)
+class SuggestionResult:
+    category: str
+    priority: str
+    suggestion: str
+    specific_action: str
+
+@dataclass(slots=True)
+class BreakdownResult:
+    skills_score: float
+    experience_score: float
+    certification_score: float
+    overall_score: float
+
+@dataclass(slots=True)
+class ScreeningOutcome:
+    """Pass/fail verdict of a resume against a score cutoff"""
+    passed: bool
+    min_score: float
+    overall_score: Optional[float]  # None when screening stopped early
+    max_possible_score: float       # upper bound on the score when screening stopped
+    evaluated: List[str]            # components evaluated, in order
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+@dataclass(slots=True)
+class AnalysisOutcome:
+    overall_score: float
+    match_breakdown: BreakdownResult
+    matched_skills: List[SkillMatchResult]
+    missing_skills: List[str]
+    experience_analysis: ExperienceResult
+    certification_analysis: List[CertificationResult]
+    detailed_suggestions: List[SuggestionResult]
+    ats_keywords: Dict[str, bool]
+    semantic_matches: List[Dict[str, Any]]
+    semantic_similarity: Optional[float] = None
+    analysis_method: str = "full"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-dict form for direct JSON serialization"""
+        return asdict(self)
+
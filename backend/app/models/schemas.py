@@ -5,7 +5,7 @@ from datetime import datetime
 class SkillMatch(BaseModel):
     skill: str
     matched: bool
-    importance: str = Field(..., regex="^(high|medium|low)$")
+    importance: str = Field(..., pattern="^(high|medium|low)$")
 
 class MatchBreakdown(BaseModel):
     skills_score: float = Field(..., ge=0, le=100)
@@ -24,7 +24,7 @@ class ExperienceAnalysis(BaseModel):
 
 class Suggestion(BaseModel):
     category: str
-    priority: str = Field(..., regex="^(high|medium|low)$")
+    priority: str = Field(..., pattern="^(high|medium|low)$")
     suggestion: str
     specific_action: str
 
@@ -0,0 +1,339 @@
+import hashlib
+import os
+import re
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+ANALYTICS_DIR = os.getenv(
+    "ANALYTICS_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "analytics")
+)
+ANALYTICS_ENABLED = os.getenv("ANALYTICS_ENABLED", "1") == "1"
+ANALYTICS_FLUSH_ROWS = int(os.getenv("ANALYTICS_FLUSH_ROWS", "500"))
+ANALYTICS_FLUSH_INTERVAL = float(os.getenv("ANALYTICS_FLUSH_INTERVAL", "60"))  # seconds
+# A partition with at least this many part files is rewritten as one file
+ANALYTICS_COMPACT_FILES = int(os.getenv("ANALYTICS_COMPACT_FILES", "8"))
+
+_JOB_ID_PATTERN = re.compile(r'[^A-Za-z0-9_.-]+')
+
+# Columns read by reports
+REPORT_COLUMNS = ("job", "overall_score", "skills_score", "experience_score",
+                  "certification_score", "missing_skills")
+
+class AnalyticsUnavailable(RuntimeError):
+    """Raised when the columnar store is disabled or pyarrow is not installed"""
+
+def job_key(job_description: str, job_id: Optional[str] = None) -> str:
+    """Partition key for a job: the caller's id made path-safe, else a hash of the JD text.
+    
+    Ids that are already path-safe are used as is; any other id gets a hash
+    of the original appended, so ``Backend 2024/Q1`` and ``Backend-2024-Q1``
+    stay distinct jobs.
+    """
+    if job_id:
+        job_id = job_id.strip()
+        key = _JOB_ID_PATTERN.sub("-", job_id).strip("-.")[:64]
+        if key == job_id:
+            return key
+        digest = hashlib.sha256(job_id.encode("utf-8")).hexdigest()[:8]
+        return f"{key}-{digest}" if key else f"id-{digest}"
+    return "jd-" + hashlib.sha256(job_description.encode("utf-8")).hexdigest()[:12]
+
+def _skill_names(items: List[Any]) -> List[str]:
+    # Results carry display labels ("AWS", "Python"); store lowercase names
+    return [(item["skill"] if isinstance(item, dict) else str(item)).lower() for item in items]
+
+class AnalyticsStore:
+    """Append-only Parquet store of analysis results, partitioned by date and job.
+
+    Results are buffered in memory and written as one Parquet file per
+    ``date=YYYY-MM-DD/job=<job>`` partition once ``flush_rows`` rows or
+    ``flush_interval`` seconds have accumulated. ``compact`` rewrites
+    partitions that gathered many small files as one file. Reports scan the
+    partitions with pyarrow.dataset (partition pruning on date and job),
+    add the rows still buffered, and aggregate with Arrow compute kernels
+    and NumPy.
+    """
+
+    def __init__(self, root: str = ANALYTICS_DIR, flush_rows: int = ANALYTICS_FLUSH_ROWS,
+                 flush_interval: float = ANALYTICS_FLUSH_INTERVAL, compact_files: int = ANALYTICS_COMPACT_FILES):
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise AnalyticsUnavailable("Analytics export requires pyarrow (pip install pyarrow)")
+
+        self.root = root
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.compact_files = compact_files
+        self._rows: List[Dict[str, Any]] = []
+        self._oldest = 0.0  # monotonic time the oldest buffered row was recorded
+        self._lock = threading.Lock()
+        # Held while part files are written, compacted or scanned
+        self._flush_lock = threading.Lock()
+        # Partition directories written since the last compaction; None until the first full pass
+        self._written: Optional[Set[str]] = None
+        os.makedirs(root, exist_ok=True)
+
+        self.schema = pa.schema([
+            ("timestamp", pa.timestamp("ms")),
+            ("document_id", pa.string()),
+            ("analysis_method", pa.string()),
+            ("overall_score", pa.float64()),
+            ("skills_score", pa.float64()),
+            ("experience_score", pa.float64()),
+            ("certification_score", pa.float64()),
+            ("found_years", pa.int32()),
+            ("required_years", pa.int32()),
+            ("matched_skills", pa.list_(pa.string())),
+            ("missing_skills", pa.list_(pa.string())),
+            ("matched_certifications", pa.list_(pa.string())),
+            ("missing_certifications", pa.list_(pa.string())),
+        ])
+        self.partitioning_schema = pa.schema([("date", pa.string()), ("job", pa.string())])
+
+    def record(self, result: Dict[str, Any], job: str, document_id: Optional[str] = None) -> None:
+        """Buffer one analysis result (the dict returned by the analyze endpoints)"""
+        now = datetime.utcnow()
+        breakdown = result.get("match_breakdown", {})
+        experience = result.get("experience_analysis", {})
+        certifications = result.get("certification_analysis", [])
+        row = {
+            "date": now.strftime("%Y-%m-%d"),
+            "job": job,
+            "timestamp": now,
+            "document_id": document_id,
+            "analysis_method": result.get("analysis_method", "full_analysis"),
+            "overall_score": result.get("overall_score"),
+            "skills_score": breakdown.get("skills_score"),
+            "experience_score": breakdown.get("experience_score"),
+            "certification_score": breakdown.get("certification_score"),
+            "found_years": experience.get("found_years"),
+            "required_years": experience.get("required_years"),
+            "matched_skills": _skill_names(result.get("matched_skills", [])),
+            "missing_skills": _skill_names(result.get("missing_skills", [])),
+            "matched_certifications": [c["certification"] for c in certifications if c["matched"]],
+            "missing_certifications": [c["certification"] for c in certifications if not c["matched"]],
+        }
+        with self._lock:
+            if not self._rows:
+                self._oldest = time.monotonic()
+            self._rows.append(row)
+            flush_due = (len(self._rows) >= self.flush_rows
+                         or (self.flush_interval > 0 and time.monotonic() - self._oldest >= self.flush_interval))
+        if flush_due:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write buffered rows, one Parquet file per partition; returns rows written"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        with self._flush_lock:
+            with self._lock:
+                rows, self._rows = self._rows, []
+            if not rows:
+                return 0
+
+            partitions: Dict[tuple, List[Dict[str, Any]]] = {}
+            for row in rows:
+                partitions.setdefault((row.pop("date"), row.pop("job")), []).append(row)
+
+            for (date, job), partition_rows in partitions.items():
+                directory = os.path.join(self.root, f"date={date}", f"job={job}")
+                os.makedirs(directory, exist_ok=True)
+                filename = f"part-{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}.parquet"
+                table = pa.Table.from_pylist(partition_rows, schema=self.schema)
+                # Dot-prefixed temp files are ignored by dataset scans, so
+                # readers never see a partially written part
+                tmp_path = os.path.join(directory, f".{filename}.tmp")
+                pq.write_table(table, tmp_path)
+                os.replace(tmp_path, os.path.join(directory, filename))
+                if self._written is not None:
+                    self._written.add(directory)
+            return len(rows)
+
+    def compact(self) -> int:
+        """Rewrite each partition holding ``compact_files`` or more parts as one file.
+        
+        The first call checks every partition, later calls only those
+        flushed to since. Returns the number of partitions compacted. Scans
+        in this process wait for a compaction to finish; other processes
+        sharing the directory may briefly see a partition twice.
+        """
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+
+        compacted = 0
+        with self._flush_lock:
+            if self._written is None:
+                directories = [os.path.join(date_dir, job_dir)
+                               for date_dir in self._subdirectories(self.root, "date=")
+                               for job_dir in self._subdirectories(date_dir, "job=")]
+            else:
+                directories = sorted(self._written)
+            self._written = set()
+
+            for directory in directories:
+                parts = sorted(name for name in os.listdir(directory)
+                               if name.startswith("part-") and name.endswith(".parquet"))
+                if len(parts) < max(2, self.compact_files):
+                    continue
+                paths = [os.path.join(directory, name) for name in parts]
+                table = ds.dataset(paths, schema=self.schema, format="parquet").to_table()
+                # Named after the newest part so it sorts after the files it replaces
+                filename = parts[-1].replace(".parquet", "-compacted.parquet")
+                tmp_path = os.path.join(directory, f".{filename}.tmp")
+                pq.write_table(table, tmp_path)
+                os.replace(tmp_path, os.path.join(directory, filename))
+                for path in paths:
+                    os.remove(path)
+                compacted += 1
+        return compacted
+
+    @staticmethod
+    def _subdirectories(path: str, prefix: str) -> List[str]:
+        return [entry.path for entry in os.scandir(path) if entry.is_dir() and entry.name.startswith(prefix)]
+
+    def _buffered(self, job: Optional[str], start_date: Optional[str], end_date: Optional[str]):
+        """Rows not flushed yet that match the filters, as a table shaped like ``_scan``'s"""
+        import pyarrow as pa
+
+        with self._lock:
+            rows = [row for row in self._rows
+                    if (not job or row["job"] == job)
+                    and (not start_date or row["date"] >= start_date)
+                    and (not end_date or row["date"] <= end_date)]
+        schema = pa.schema([self.partitioning_schema.field("job")] +
+                           [self.schema.field(name) for name in REPORT_COLUMNS[1:]])
+        return pa.Table.from_pylist([{name: row[name] for name in REPORT_COLUMNS} for row in rows],
+                                    schema=schema)
+
+    def _scan(self, job: Optional[str], start_date: Optional[str], end_date: Optional[str]):
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        # An explicit schema keeps the scan valid before any part has been flushed
+        dataset = ds.dataset(
+            self.root, format="parquet",
+            schema=pa.unify_schemas([self.schema, self.partitioning_schema]),
+            partitioning=ds.partitioning(self.partitioning_schema, flavor="hive"),
+            exclude_invalid_files=True
+        )
+        conditions = []
+        if job:
+            conditions.append(ds.field("job") == job)
+        if start_date:
+            conditions.append(ds.field("date") >= start_date)
+        if end_date:
+            conditions.append(ds.field("date") <= end_date)
+        expression = None
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+        with self._flush_lock:
+            return dataset.to_table(columns=list(REPORT_COLUMNS), filter=expression)
+
+    def report(self, job: Optional[str] = None, start_date: Optional[str] = None,
+               end_date: Optional[str] = None, top: int = 20, bins: int = 10) -> Dict[str, Any]:
+        """Aggregate score distributions and skill-gap frequencies over stored results"""
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        # Buffered rows are read in place rather than flushed early, which
+        # would leave a small file behind for every report
+        table = pa.concat_tables([self._scan(job, start_date, end_date),
+                                  self._buffered(job, start_date, end_date)])
+        total = table.num_rows
+        if total == 0:
+            return {"rows": 0, "score_distribution": None, "jobs": [], "skill_gaps": []}
+
+        # Score distribution over the whole selection
+        scores = table["overall_score"].to_numpy()
+        counts, edges = np.histogram(scores, bins=bins, range=(0, 100))
+        p25, p50, p75, p90 = np.percentile(scores, [25, 50, 75, 90])
+        distribution = {
+            "bin_edges": edges.round(1).tolist(),
+            "counts": counts.tolist(),
+            "mean": round(float(scores.mean()), 1),
+            "p25": round(float(p25), 1),
+            "p50": round(float(p50), 1),
+            "p75": round(float(p75), 1),
+            "p90": round(float(p90), 1),
+        }
+
+        # Per-job score summaries
+        per_job = table.group_by("job").aggregate([
+            ("overall_score", "count"),
+            ("overall_score", "mean"),
+            ("skills_score", "mean"),
+            ("experience_score", "mean"),
+            ("certification_score", "mean"),
+        ]).sort_by([("overall_score_count", "descending")])
+        job_rows = {}
+        for entry in per_job.to_pylist():
+            job_rows[entry["job"]] = {
+                "job": entry["job"],
+                "analyses": entry["overall_score_count"],
+                "mean_score": round(entry["overall_score_mean"], 1),
+                "mean_skills_score": round(entry["skills_score_mean"], 1),
+                "mean_experience_score": round(entry["experience_score_mean"], 1),
+                "mean_certification_score": round(entry["certification_score_mean"], 1),
+                "skill_gaps": [],
+            }
+
+        # Skill-gap frequency: explode missing_skills once, then count (job, skill) pairs
+        missing = table["missing_skills"].combine_chunks()
+        gaps = pa.table({
+            "job": table["job"].combine_chunks().take(pc.list_parent_indices(missing)),
+            "skill": pc.list_flatten(missing),
+        })
+        pair_counts = gaps.group_by(["job", "skill"]).aggregate([("skill", "count")]).sort_by(
+            [("job", "ascending"), ("skill_count", "descending"), ("skill", "ascending")]
+        )
+        for entry in pair_counts.to_pylist():
+            job_gaps = job_rows[entry["job"]]["skill_gaps"]
+            if len(job_gaps) < top:
+                job_gaps.append({
+                    "skill": entry["skill"],
+                    "count": entry["skill_count"],
+                    "share": round(entry["skill_count"] / job_rows[entry["job"]]["analyses"], 3),
+                })
+
+        overall_gaps = gaps.group_by("skill").aggregate([("skill", "count")]).sort_by(
+            [("skill_count", "descending"), ("skill", "ascending")]
+        ).slice(0, top)
+
+        return {
+            "rows": total,
+            "score_distribution": distribution,
+            "jobs": list(job_rows.values()),
+            "skill_gaps": [
+                {"skill": entry["skill"], "count": entry["skill_count"],
+                 "share": round(entry["skill_count"] / total, 3)}
+                for entry in overall_gaps.to_pylist()
+            ],
+        }
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_analytics_store() -> Optional[AnalyticsStore]:
+    """Return the process-wide analytics store, or None when disabled or unavailable"""
+    global _store
+    if not ANALYTICS_ENABLED:
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                try:
+                    _store = AnalyticsStore()
+                except AnalyticsUnavailable as e:
+                    logger.warning(f"Analytics export disabled: {e}")
+                    _store = False
+    return _store or None
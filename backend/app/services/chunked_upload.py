@@ -0,0 +1,333 @@
+import fcntl
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Same base directory as regular uploads: /tmp on Render, the backend directory locally
+CHUNKED_UPLOAD_DIR = os.getenv(
+    "CHUNKED_UPLOAD_DIR",
+    "/tmp/uploads/chunked" if os.getenv("RENDER")
+    else os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "uploads", "chunked")
+)
+CHUNKED_UPLOAD_MAX_SIZE = int(os.getenv("CHUNKED_UPLOAD_MAX_SIZE", str(50 * 1024 * 1024)))
+CHUNKED_UPLOAD_MAX_PART = int(os.getenv("CHUNKED_UPLOAD_MAX_PART", str(8 * 1024 * 1024)))
+# Every part but the one ending the file must be at least this large, which
+# bounds the number of parts (and manifest rewrites) per upload
+CHUNKED_UPLOAD_MIN_PART = int(os.getenv("CHUNKED_UPLOAD_MIN_PART", str(256 * 1024)))
+CHUNKED_UPLOAD_TTL = float(os.getenv("CHUNKED_UPLOAD_TTL", str(24 * 3600)))  # seconds since last part
+
+_SHA256_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+_UPLOAD_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+class UploadError(Exception):
+    """Base class for chunked-upload request errors; ``status_code`` is the HTTP status"""
+    status_code = 400
+
+class UploadNotFound(UploadError):
+    status_code = 404
+
+class UploadConflict(UploadError):
+    status_code = 409
+
+class UploadTooLarge(UploadError):
+    status_code = 413
+
+class UploadChecksumMismatch(UploadError):
+    status_code = 422
+
+@dataclass(slots=True)
+class UploadState:
+    """Persisted description of one upload; received parts are keyed by offset"""
+    upload_id: str
+    filename: str
+    size: int
+    sha256: Optional[str]
+    created_at: float
+    updated_at: float
+    parts: Dict[int, Tuple[int, str]] = field(default_factory=dict)  # offset -> (length, sha256)
+    document_id: Optional[str] = None
+
+    @property
+    def extension(self) -> str:
+        return os.path.splitext(self.filename)[1].lower()
+
+    def received_bytes(self) -> int:
+        return sum(length for length, _ in self.parts.values())
+
+    def contiguous_bytes(self) -> int:
+        """Length of the fully received prefix of the file"""
+        end = 0
+        for offset in sorted(self.parts):
+            if offset > end:
+                break
+            end = max(end, offset + self.parts[offset][0])
+        return end
+
+    def missing_ranges(self) -> List[List[int]]:
+        """``[start, end)`` byte ranges not received yet"""
+        missing, position = [], 0
+        for offset in sorted(self.parts):
+            if offset > position:
+                missing.append([position, offset])
+            position = max(position, offset + self.parts[offset][0])
+        if position < self.size:
+            missing.append([position, self.size])
+        return missing
+
+class ChunkedUploads:
+    """Resumable uploads assembled from checksummed parts written at byte offsets.
+
+    Each upload is a preallocated data file plus a JSON manifest of the
+    parts received so far, both under ``root``. The manifest is the source of
+    truth: every operation takes an exclusive ``flock`` on the upload's lock
+    file and re-reads it, so parts may arrive in any order, concurrently and
+    at different workers, and an upload survives a server restart. Clients
+    resume by sending only the ``missing`` ranges reported by ``status``;
+    re-sending a part already received is a no-op. The document hash is
+    advanced over the contiguous received prefix as parts land, so
+    ``complete`` does not have to re-read the file.
+    """
+
+    def __init__(self, root: str = CHUNKED_UPLOAD_DIR, max_size: int = CHUNKED_UPLOAD_MAX_SIZE,
+                 max_part: int = CHUNKED_UPLOAD_MAX_PART, ttl: float = CHUNKED_UPLOAD_TTL,
+                 min_part: int = CHUNKED_UPLOAD_MIN_PART):
+        self.root = root
+        self.max_size = max_size
+        self.max_part = max_part
+        self.min_part = min(min_part, max_part)
+        self.ttl = ttl
+        os.makedirs(root, exist_ok=True)
+        # upload_id -> (running SHA-256, bytes hashed so far). Received bytes
+        # never change, so a per-process hasher stays valid while other
+        # workers add parts; it is rebuilt from the file after a restart.
+        self._hashers: Dict[str, Tuple[Any, int]] = {}
+        self._hashers_lock = threading.Lock()
+
+    def _path(self, upload_id: str, suffix: str) -> str:
+        return os.path.join(self.root, f"{upload_id}{suffix}")
+
+    def _data_path(self, state: UploadState) -> str:
+        return self._path(state.upload_id, state.extension or ".bin")
+
+    def _read(self, upload_id: str) -> Optional[UploadState]:
+        try:
+            with open(self._path(upload_id, ".json"), encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        data["parts"] = {int(offset): tuple(part) for offset, part in data["parts"].items()}
+        return UploadState(**data)
+
+    def _save(self, state: UploadState) -> None:
+        path = self._path(state.upload_id, ".json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(asdict(state), f)
+        os.replace(tmp_path, path)
+
+    @contextmanager
+    def _locked(self, upload_id: str) -> Iterator[UploadState]:
+        """Hold the upload's cross-process lock and yield its current state"""
+        if not _UPLOAD_ID_PATTERN.match(upload_id):
+            raise UploadNotFound(f"Upload {upload_id} not found.")
+        try:
+            fd = os.open(self._path(upload_id, ".lock"), os.O_RDWR)
+        except FileNotFoundError:
+            raise UploadNotFound(f"Upload {upload_id} not found. It may have expired or completed.")
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            state = self._read(upload_id)
+            if state is None:
+                raise UploadNotFound(f"Upload {upload_id} not found. It may have expired or completed.")
+            yield state
+        finally:
+            os.close(fd)
+
+    def create(self, filename: str, size: int, sha256: Optional[str] = None) -> Dict[str, Any]:
+        """Start an upload of ``size`` bytes; ``sha256`` of the whole file is optional"""
+        if size <= 0:
+            raise UploadError("Upload size must be positive.")
+        if size > self.max_size:
+            raise UploadTooLarge(f"File too large. Maximum size is {self.max_size // (1024 * 1024)}MB.")
+        if sha256 is not None and not _SHA256_PATTERN.match(sha256.lower()):
+            raise UploadError("sha256 must be 64 hexadecimal characters.")
+        self.purge_expired()
+
+        now = time.time()
+        state = UploadState(
+            upload_id=uuid.uuid4().hex, filename=os.path.basename(filename), size=size,
+            sha256=sha256.lower() if sha256 else None, created_at=now, updated_at=now
+        )
+        # Sparse preallocation: parts are written in place at their offsets
+        with open(self._data_path(state), "wb") as f:
+            f.truncate(size)
+        self._save(state)
+        # The lock file appears last, so a visible upload is always fully set up
+        open(self._path(state.upload_id, ".lock"), "wb").close()
+        return self._status(state)
+
+    def write_part(self, upload_id: str, offset: int, data: bytes, sha256: str) -> Dict[str, Any]:
+        """Store one part after verifying its checksum; idempotent for identical re-sends.
+        
+        Parts must be at least ``min_part`` bytes unless they end the file.
+        """
+        length = len(data)
+        if length == 0:
+            raise UploadError("Empty part.")
+        if length > self.max_part:
+            raise UploadTooLarge(f"Parts may be at most {self.max_part} bytes.")
+        checksum = hashlib.sha256(data).hexdigest()
+        if checksum != sha256.lower():
+            raise UploadChecksumMismatch("Part checksum does not match its content; please resend it.")
+
+        with self._locked(upload_id) as state:
+            if offset < 0 or offset + length > state.size:
+                raise UploadError(f"Part [{offset}, {offset + length}) is outside the {state.size}-byte file.")
+            if length < self.min_part and offset + length < state.size:
+                raise UploadError(f"Parts other than the last must be at least {self.min_part} bytes.")
+            if state.parts.get(offset) == (length, checksum):
+                return self._status(state)
+            for other, (other_length, _) in state.parts.items():
+                if offset < other + other_length and other < offset + length:
+                    raise UploadConflict(
+                        f"Part [{offset}, {offset + length}) overlaps received part "
+                        f"[{other}, {other + other_length})."
+                    )
+
+            fd = os.open(self._data_path(state), os.O_WRONLY)
+            try:
+                os.pwrite(fd, data, offset)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            state.parts[offset] = (length, checksum)
+            state.updated_at = time.time()
+            self._advance_hash(state)
+            self._save(state)
+            return self._status(state)
+
+    def _advance_hash(self, state: UploadState) -> None:
+        """Hash newly contiguous bytes; sets ``document_id`` once the whole file is hashed"""
+        # Caller holds the upload's lock
+        with self._hashers_lock:
+            hasher, hashed = self._hashers.get(state.upload_id) or (hashlib.sha256(), 0)
+        end = state.contiguous_bytes()
+        if end > hashed:
+            with open(self._data_path(state), "rb") as f:
+                f.seek(hashed)
+                remaining = end - hashed
+                while remaining:
+                    chunk = f.read(min(remaining, 1 << 20))
+                    hasher.update(chunk)
+                    remaining -= len(chunk)
+            hashed = end
+        with self._hashers_lock:
+            self._hashers[state.upload_id] = (hasher, hashed)
+        if hashed == state.size and state.document_id is None:
+            state.document_id = hasher.hexdigest()
+
+    def status(self, upload_id: str) -> Dict[str, Any]:
+        with self._locked(upload_id) as state:
+            return self._status(state)
+
+    def _status(self, state: UploadState) -> Dict[str, Any]:
+        received = state.received_bytes()
+        return {
+            "upload_id": state.upload_id,
+            "filename": state.filename,
+            "size": state.size,
+            "received_bytes": received,
+            "missing": state.missing_ranges(),
+            "complete": received == state.size,
+            "min_part_size": self.min_part,
+            "max_part_size": self.max_part,
+            "expires_at": state.updated_at + self.ttl,
+        }
+
+    def data_path(self, upload_id: str) -> Optional[Tuple[str, str]]:
+        """``(data path, document id)`` of a fully received upload, for extraction ahead of ``complete``"""
+        with self._locked(upload_id) as state:
+            if state.document_id is None:
+                return None
+            return self._data_path(state), state.document_id
+
+    def complete(self, upload_id: str) -> Tuple[str, str, str]:
+        """Finish an upload; returns ``(data path, document id, filename)``.
+
+        The upload is forgotten and the caller owns the data file. Raises
+        ``UploadConflict`` while ranges are missing, and discards the upload
+        when the whole-file checksum given at creation does not match.
+        """
+        with self._locked(upload_id) as state:
+            missing = state.missing_ranges()
+            if missing:
+                raise UploadConflict(f"Upload is missing {len(missing)} byte range(s): {missing[:5]}")
+            self._advance_hash(state)
+            if state.sha256 and state.sha256 != state.document_id:
+                self._discard(state, remove_data=True)
+                raise UploadChecksumMismatch("Assembled file does not match the sha256 given at creation.")
+            self._discard(state, remove_data=False)
+            return self._data_path(state), state.document_id, state.filename
+
+    def abort(self, upload_id: str) -> None:
+        with self._locked(upload_id) as state:
+            self._discard(state, remove_data=True)
+
+    def _discard(self, state: UploadState, remove_data: bool) -> None:
+        # Caller holds the upload's lock; waiters then find the manifest gone
+        with self._hashers_lock:
+            self._hashers.pop(state.upload_id, None)
+        paths = [self._path(state.upload_id, ".json"), self._path(state.upload_id, ".lock")]
+        if remove_data:
+            paths.append(self._data_path(state))
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def purge_expired(self) -> int:
+        """Drop uploads with no new part for ``ttl`` seconds"""
+        cutoff = time.time() - self.ttl
+        purged = 0
+        for name in os.listdir(self.root):
+            upload_id, suffix = os.path.splitext(name)
+            if suffix != ".lock":
+                continue
+            try:
+                with self._locked(upload_id) as state:
+                    if state.updated_at < cutoff:
+                        self._discard(state, remove_data=True)
+                        purged += 1
+            except UploadNotFound:
+                continue
+        # Hashers of uploads completed or aborted by another worker
+        with self._hashers_lock:
+            for upload_id in list(self._hashers):
+                if not os.path.exists(self._path(upload_id, ".json")):
+                    del self._hashers[upload_id]
+        if purged:
+            logger.info(f"Purged {purged} expired uploads")
+        return purged
+
+_uploads = None
+_uploads_lock = threading.Lock()
+
+def get_chunked_uploads() -> ChunkedUploads:
+    """Return the process-wide chunked upload store"""
+    global _uploads
+    if _uploads is None:
+        with _uploads_lock:
+            if _uploads is None:
+                _uploads = ChunkedUploads()
+    return _uploads
@@ -0,0 +1,150 @@
+import hashlib
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+import numpy as np
+import logging
+from .text_parser import TextParser
+
+logger = logging.getLogger(__name__)
+
+DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "1") == "1"
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.85"))  # estimated Jaccard similarity
+DEDUP_MAX_ENTRIES = int(os.getenv("DEDUP_MAX_ENTRIES", "100000"))
+
+NUM_PERMUTATIONS = 128
+NUM_BANDS = 16          # 16 bands x 8 rows: candidates from roughly 0.7 Jaccard upward
+SHINGLE_SIZE = 3
+_MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+
+_rng = np.random.default_rng(0x5EED)
+_PERM_A = _rng.integers(1, (1 << 31) - 1, size=NUM_PERMUTATIONS, dtype=np.uint64)
+_PERM_B = _rng.integers(0, (1 << 31) - 1, size=NUM_PERMUTATIONS, dtype=np.uint64)
+
+@dataclass(slots=True)
+class Fingerprint:
+    """Exact-content hash and MinHash signature of a document's cleaned text"""
+    content_hash: str
+    signature: np.ndarray
+
+@dataclass(slots=True)
+class DuplicateMatch:
+    document_id: str
+    similarity: float
+    exact: bool
+
+def fingerprint(text: str) -> Fingerprint:
+    """Fingerprint the ``TextParser.clean_text`` form of a document.
+
+    Cleaning first makes the PDF and DOCX exports of one resume (which differ
+    in whitespace and bullet characters) hash alike. The signature is the
+    minimum of 128 universal hashes over word 3-shingles, computed as one
+    NumPy broadcast.
+    """
+    tokens = TextParser.clean_text(text).lower().split()
+    content = " ".join(tokens)
+    content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    if len(tokens) >= SHINGLE_SIZE:
+        shingles = {" ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+    else:
+        shingles = {content}
+    hashes = np.fromiter(
+        (zlib.crc32(shingle.encode("utf-8")) & 0x7FFFFFFF for shingle in shingles),
+        dtype=np.uint64, count=len(shingles)
+    )
+    signature = ((_PERM_A[:, None] * hashes[None, :] + _PERM_B[:, None]) % _MERSENNE_PRIME).min(axis=1)
+    return Fingerprint(content_hash, signature.astype(np.uint32))
+
+class DuplicateIndex:
+    """MinHash LSH index of recently seen documents.
+
+    Signatures are split into bands; documents sharing any band bucket are
+    candidates, and a candidate is a near-duplicate when the fraction of
+    equal signature slots (the Jaccard estimate) reaches ``threshold``.
+    Identical cleaned text is caught first through an exact hash map. The
+    index keeps the ``max_entries`` most recently added documents.
+    """
+
+    def __init__(self, threshold: float = DEDUP_THRESHOLD, max_entries: int = DEDUP_MAX_ENTRIES):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._rows = NUM_PERMUTATIONS // NUM_BANDS
+        self._entries: "OrderedDict[str, Fingerprint]" = OrderedDict()
+        self._by_content: Dict[str, str] = {}
+        self._bands: List[Dict[bytes, Set[str]]] = [{} for _ in range(NUM_BANDS)]
+        self._lock = threading.Lock()
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[i * self._rows:(i + 1) * self._rows].tobytes() for i in range(NUM_BANDS)]
+
+    def query(self, fp: Fingerprint, exclude: Optional[str] = None) -> Optional[DuplicateMatch]:
+        """Return the most similar indexed document at or above the threshold"""
+        with self._lock:
+            exact = self._by_content.get(fp.content_hash)
+            if exact is not None and exact != exclude:
+                return DuplicateMatch(exact, 1.0, True)
+
+            candidates: Set[str] = set()
+            for band, key in zip(self._bands, self._band_keys(fp.signature)):
+                candidates.update(band.get(key, ()))
+            candidates.discard(exclude)
+
+            best = None
+            for document_id in candidates:
+                entry = self._entries[document_id]
+                similarity = float(np.mean(entry.signature == fp.signature))
+                if similarity >= self.threshold and (best is None or similarity > best.similarity):
+                    best = DuplicateMatch(document_id, round(similarity, 3),
+                                          entry.content_hash == fp.content_hash)
+            return best
+
+    def add(self, document_id: str, fp: Fingerprint) -> None:
+        with self._lock:
+            if document_id in self._entries:
+                self._entries.move_to_end(document_id)
+                return
+            self._entries[document_id] = fp
+            self._by_content.setdefault(fp.content_hash, document_id)
+            for band, key in zip(self._bands, self._band_keys(fp.signature)):
+                band.setdefault(key, set()).add(document_id)
+            while len(self._entries) > self.max_entries:
+                self._remove(*self._entries.popitem(last=False))
+
+    def _remove(self, document_id: str, fp: Fingerprint) -> None:
+        # Caller holds the lock
+        if self._by_content.get(fp.content_hash) == document_id:
+            del self._by_content[fp.content_hash]
+        for band, key in zip(self._bands, self._band_keys(fp.signature)):
+            bucket = band.get(key)
+            if bucket is not None:
+                bucket.discard(document_id)
+                if not bucket:
+                    del band[key]
+
+    def check_and_add(self, document_id: str, text: str) -> Optional[DuplicateMatch]:
+        """Look a document up, then index it; returns the earlier copy if any"""
+        fp = fingerprint(text)
+        match = self.query(fp, exclude=document_id)
+        self.add(document_id, fp)
+        return match
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_duplicate_index() -> Optional[DuplicateIndex]:
+    """Return the process-wide duplicate index, or None when disabled"""
+    global _index
+    if not DEDUP_ENABLED:
+        return None
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = DuplicateIndex()
+    return _index
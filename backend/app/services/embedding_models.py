@@ -0,0 +1,76 @@
+import hashlib
+import os
+import re
+import time
+from typing import List, Union
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SENTENCE_MODEL = "all-MiniLM-L6-v2"
+FAKE_SENTENCE_MODEL = "fake"
+
+class DeterministicEmbeddingModel:
+    """Offline stand-in for SentenceTransformer with repeatable output.
+
+    Texts are embedded by hashing their tokens into a fixed-size vector, so
+    identical inputs always give identical embeddings and texts that share
+    tokens get a positive cosine similarity. No weights or network access are
+    needed, which makes it suitable for load tests and CI.
+    """
+
+    def __init__(self, dimension: int = 384, encode_delay: float = 0.0):
+        self.dimension = dimension
+        # Optional per-text sleep to mimic real inference cost
+        self.encode_delay = encode_delay
+
+    def encode(self, sentences: Union[str, List[str]], **kwargs) -> np.ndarray:
+        """Encode one text or a list of texts into L2-normalized vectors"""
+        single = isinstance(sentences, str)
+        if single:
+            sentences = [sentences]
+
+        embeddings = np.zeros((len(sentences), self.dimension), dtype=np.float32)
+        for row, sentence in enumerate(sentences):
+            for token in re.findall(r'\w+', sentence.lower()):
+                digest = hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest()
+                bucket = int.from_bytes(digest[:4], 'little') % self.dimension
+                sign = 1.0 if digest[4] & 1 else -1.0
+                embeddings[row, bucket] += sign
+            norm = np.linalg.norm(embeddings[row])
+            if norm > 0:
+                embeddings[row] /= norm
+
+        if self.encode_delay:
+            time.sleep(self.encode_delay * len(sentences))
+
+        return embeddings[0] if single else embeddings
+
+def sentence_model_name() -> str:
+    """Name of the configured sentence embedding model"""
+    return os.getenv("SENTENCE_MODEL", DEFAULT_SENTENCE_MODEL)
+
+def load_sentence_model(model_name: str = None):
+    """Load the sentence embedding model named by SENTENCE_MODEL.
+
+    Setting SENTENCE_MODEL=fake selects DeterministicEmbeddingModel; the
+    simulated per-text cost can be tuned with FAKE_EMBEDDING_DELAY (seconds).
+    Other models load from the model bundle when it packages them, and from
+    the Hugging Face hub cache otherwise.
+    """
+    model_name = model_name or sentence_model_name()
+
+    if model_name == FAKE_SENTENCE_MODEL:
+        delay = float(os.getenv("FAKE_EMBEDDING_DELAY", "0"))
+        logger.info("Using deterministic fake embedding model")
+        return DeterministicEmbeddingModel(encode_delay=delay)
+
+    from sentence_transformers import SentenceTransformer
+    from .model_bundle import get_model_bundle
+
+    bundle = get_model_bundle()
+    local_path = bundle.sentence_model_path(model_name) if bundle else None
+    if local_path:
+        return SentenceTransformer(local_path)
+    return SentenceTransformer(model_name)
@@ -0,0 +1,123 @@
+import asyncio
+import heapq
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+from .rate_limit import BATCH, INTERACTIVE, ClientIdentity
+
+logger = logging.getLogger(__name__)
+
+FAIR_QUEUE_ENABLED = os.getenv("FAIR_QUEUE_ENABLED", "1") == "1"
+ANALYSIS_CONCURRENCY = int(os.getenv("ANALYSIS_CONCURRENCY", str(os.cpu_count() or 1)))
+SERVICE_CLASS_WEIGHTS = {
+    INTERACTIVE: float(os.getenv("INTERACTIVE_WEIGHT", "4")),
+    BATCH: float(os.getenv("BATCH_WEIGHT", "1")),
+}
+
+class FairScheduler:
+    """Weighted fair queue in front of the analysis worker threads.
+
+    At most ``slots`` analyses run at once. When all slots are busy, waiting
+    analyses are ordered by self-clocked fair queueing: each gets the tag
+    ``max(virtual time, client's previous tag) + 1 / weight`` and the lowest
+    tag runs next. A client with a thousand queued analyses therefore gets
+    one turn per round like everyone else, and an interactive client
+    (weight 4 by default) gets four turns for each turn of a batch tenant
+    (weight 1) while both are backlogged. Idle capacity is never held back.
+
+    A slot stays taken until the worker thread finishes, even when the
+    caller is cancelled first, so no more than ``slots`` analyses ever run.
+    """
+
+    def __init__(self, slots: int = ANALYSIS_CONCURRENCY, weights: Optional[Dict[str, float]] = None):
+        self.slots = max(1, slots)
+        self.weights = weights or SERVICE_CLASS_WEIGHTS
+        self._busy = 0
+        self._virtual_time = 0.0
+        self._last_tag: Dict[str, float] = {}
+        # (tag, key) per assigned tag; entries the virtual time has passed are evicted
+        self._tag_expiry: List[Tuple[float, str]] = []
+        self._waiting: List[Tuple[float, int, asyncio.Future]] = []
+        self._sequence = 0
+
+    async def run(self, client: ClientIdentity, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run ``fn`` on a worker thread once the client's turn comes"""
+        await self._acquire(client)
+        try:
+            work = asyncio.ensure_future(asyncio.to_thread(fn, *args, **kwargs))
+        except BaseException:
+            self._release()
+            raise
+        # The thread cannot be stopped, so its slot is released when it ends
+        # rather than when the caller stops waiting
+        work.add_done_callback(self._work_done)
+        return await asyncio.shield(work)
+
+    def _work_done(self, work: asyncio.Future) -> None:
+        if not work.cancelled():
+            work.exception()  # retrieved here in case the caller was cancelled
+        self._release()
+
+    async def _acquire(self, client: ClientIdentity) -> None:
+        weight = self.weights.get(client.service_class, 1.0)
+        tag = max(self._virtual_time, self._last_tag.get(client.key, 0.0)) + 1.0 / weight
+        self._last_tag[client.key] = tag
+        heapq.heappush(self._tag_expiry, (tag, client.key))
+        if self._busy < self.slots and not self._waiting:
+            self._busy += 1
+            self._advance(tag)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._sequence += 1
+        heapq.heappush(self._waiting, (tag, self._sequence, future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # A slot handed over just as the waiter was cancelled goes to the next in line
+            if future.done() and not future.cancelled():
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        """Hand the freed slot to the lowest-tagged live waiter, or free it"""
+        while self._waiting:
+            tag, _, future = heapq.heappop(self._waiting)
+            if future.done():
+                continue
+            self._advance(tag)
+            future.set_result(None)
+            return
+        self._busy -= 1
+
+    def _advance(self, tag: float) -> None:
+        """Move the virtual time up to ``tag`` and forget clients it has caught up with"""
+        self._virtual_time = max(self._virtual_time, tag)
+        # A tag at or below the virtual time carries no backlog: the next
+        # tag starts from the virtual time either way
+        while self._tag_expiry and self._tag_expiry[0][0] <= self._virtual_time:
+            expired, key = heapq.heappop(self._tag_expiry)
+            if self._last_tag.get(key) == expired:
+                del self._last_tag[key]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "slots": self.slots,
+            "busy": self._busy,
+            "waiting": sum(1 for _, _, future in self._waiting if not future.done()),
+        }
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_fair_scheduler() -> Optional[FairScheduler]:
+    """Return the process-wide analysis scheduler, or None when disabled"""
+    global _scheduler
+    if not FAIR_QUEUE_ENABLED:
+        return None
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = FairScheduler()
+    return _scheduler
@@ -5,6 +5,7 @@ import aiofiles
 from fastapi import UploadFile, HTTPException
 import logging
 from .text_parser import TextParser
+from ..utils.memory import MemoryBudgetExceeded, check_budget, limit_text, UPLOAD_CHUNK_SIZE, MAX_PDF_PAGES
 
 logger = logging.getLogger(__name__)
 
@@ -32,14 +33,31 @@ class FileService:
         file_path = os.path.join(self.upload_dir, unique_filename)
         
         try:
-            # Save file
+            # Save file in chunks so large uploads are never held in memory
+            written = 0
             async with aiofiles.open(file_path, 'wb') as f:
-                content = await file.read()
-                await f.write(content)
+                while True:
+                    chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    written += len(chunk)
+                    if written > self.max_file_size:
+                        raise HTTPException(
+                            status_code=413,
+                            detail=f"File too large. Maximum size allowed is {self.max_file_size // (1024*1024)}MB"
+                        )
+                    await f.write(chunk)
+            check_budget(written, file_extension)
             
             logger.info(f"File saved successfully: {file_path}")
             return file_path, file_extension[1:]  # Remove dot from extension
             
+        except HTTPException:
+            self.cleanup_file(file_path)
+            raise
+        except MemoryBudgetExceeded as e:
+            self.cleanup_file(file_path)
+            raise HTTPException(status_code=413, detail=str(e))
         except Exception as e:
             logger.error(f"Error saving file: {str(e)}")
             # Clean up file if it exists
@@ -55,7 +73,7 @@ class FileService:
         
         try:
             if file_type.lower() == 'pdf':
-                text = self.text_parser.extract_text_from_pdf(file_path)
+                text = self.text_parser.extract_text_from_pdf(file_path, max_pages=MAX_PDF_PAGES)
             elif file_type.lower() in ['docx', 'doc']:
                 text = self.text_parser.extract_text_from_docx(file_path)
             elif file_type.lower() == 'txt':
@@ -64,14 +82,18 @@ class FileService:
             else:
                 raise HTTPException(status_code=400, detail=f"Unsupported file type: {file_type}")
             
-            # Clean the extracted text
-            cleaned_text = self.text_parser.clean_text(text)
+            # Clean the extracted text and bound its size before NLP
+            cleaned_text = limit_text(self.text_parser.clean_text(text))
             
             if not cleaned_text.strip():
                 raise HTTPException(status_code=400, detail="No text could be extracted from the file")
             
             return cleaned_text
             
+        except HTTPException:
+            raise
+        except MemoryBudgetExceeded as e:
+            raise HTTPException(status_code=413, detail=str(e))
         except Exception as e:
             logger.error(f"Error extracting text from file: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Failed to extract text: {str(e)}")
@@ -0,0 +1,325 @@
+import hashlib
+import json
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional
+import logging
+from ..utils.responses import dumps_json
+
+logger = logging.getLogger(__name__)
+
+HISTORY_DB_PATH = os.getenv(
+    "HISTORY_DB_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data", "history.db")
+)
+HISTORY_ENABLED = os.getenv("HISTORY_ENABLED", "1") == "1"
+HISTORY_POOL_SIZE = int(os.getenv("HISTORY_POOL_SIZE", "4"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id TEXT PRIMARY KEY,
+    char_count INTEGER,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS job_profiles (
+    id TEXT PRIMARY KEY,
+    description TEXT NOT NULL,
+    required_years INTEGER,
+    skills TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS analyses (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    document_id TEXT REFERENCES documents(id),
+    job_id TEXT NOT NULL REFERENCES job_profiles(id),
+    overall_score REAL NOT NULL,
+    skills_score REAL,
+    experience_score REAL,
+    certification_score REAL,
+    analysis_method TEXT,
+    duration_ms REAL,
+    created_at TEXT NOT NULL,
+    result BLOB NOT NULL,
+    jd_hash TEXT,
+    scoring_version TEXT,
+    from_session INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS analysis_skills (
+    analysis_id INTEGER NOT NULL REFERENCES analyses(id) ON DELETE CASCADE,
+    skill TEXT NOT NULL,
+    matched INTEGER NOT NULL,
+    PRIMARY KEY (analysis_id, skill)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_analyses_job_score ON analyses(job_id, overall_score DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_analyses_job ON analyses(job_id, id DESC);
+CREATE INDEX IF NOT EXISTS idx_analyses_score ON analyses(overall_score DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_analyses_document ON analyses(document_id, id DESC);
+CREATE INDEX IF NOT EXISTS idx_analyses_created ON analyses(created_at);
+CREATE INDEX IF NOT EXISTS idx_analysis_skills_skill ON analysis_skills(skill, matched, analysis_id);
+"""
+
+# Columns added after the first release, with their definitions
+MIGRATED_COLUMNS = {
+    "jd_hash": "TEXT",
+    "scoring_version": "TEXT",
+    "from_session": "INTEGER NOT NULL DEFAULT 0",
+}
+
+SUMMARY_COLUMNS = (
+    "id, document_id, job_id, overall_score, skills_score, experience_score, "
+    "certification_score, analysis_method, duration_ms, created_at"
+)
+
+def job_description_hash(job_description: str) -> str:
+    """SHA-256 of the job description with whitespace normalized"""
+    return hashlib.sha256(" ".join(job_description.split()).encode("utf-8")).hexdigest()
+
+def _skill_name(item: Any) -> str:
+    return (item["skill"] if isinstance(item, dict) else str(item)).lower()
+
+class HistoryStore:
+    """SQLite store of documents, job profiles and analysis results.
+
+    The database runs in WAL mode so readers never block the writer, and a
+    small pool of connections is shared across request threads. Lists are
+    paged by keyset (``before_id``): pages filtered by job or document walk
+    an ``(job_id, id)`` or ``(document_id, id)`` index in order, so deep
+    pages cost the same as the first. Score and skill filters narrow
+    through their own indexes but sort the matching rows.
+    """
+
+    def __init__(self, path: str = HISTORY_DB_PATH, pool_size: int = HISTORY_POOL_SIZE):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._pool: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        for _ in range(max(1, pool_size)):
+            self._pool.put(self._connect())
+        # SQLite allows one writer at a time; serialize writes in-process
+        # instead of spinning on SQLITE_BUSY
+        self._write_lock = threading.Lock()
+
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+            # Databases created before results were keyed on the JD text and scoring version
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(analyses)")}
+            for column, definition in MIGRATED_COLUMNS.items():
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE analyses ADD COLUMN {column} {definition}")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def save_analysis(self, result: Dict[str, Any], job_id: str, job_description: str,
+                      document_id: Optional[str], char_count: Optional[int] = None,
+                      duration_ms: Optional[float] = None, scoring_version: Optional[str] = None,
+                      from_session: bool = False) -> int:
+        """Persist one analysis with its document and job profile; returns the analysis id.
+        
+        ``scoring_version`` identifies the taxonomy and keyword tables the
+        result was computed with; ``from_session`` marks incremental results,
+        which are never reused for plain requests.
+        """
+        now = datetime.utcnow().isoformat()
+        breakdown = result.get("match_breakdown", {})
+        experience = result.get("experience_analysis", {})
+        matched = {_skill_name(item) for item in result.get("matched_skills", [])}
+        missing = {_skill_name(item) for item in result.get("missing_skills", [])}
+        job_skills = sorted(matched | missing)
+
+        with self._write_lock, self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if document_id:
+                    conn.execute(
+                        "INSERT INTO documents (id, char_count, first_seen, last_seen) VALUES (?, ?, ?, ?) "
+                        "ON CONFLICT(id) DO UPDATE SET last_seen = excluded.last_seen",
+                        (document_id, char_count, now, now)
+                    )
+                # The profile follows the job's current description
+                conn.execute(
+                    "INSERT INTO job_profiles (id, description, required_years, skills, created_at) "
+                    "VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(id) DO UPDATE SET description = excluded.description, "
+                    "required_years = excluded.required_years, skills = excluded.skills",
+                    (job_id, job_description, experience.get("required_years"), json.dumps(job_skills), now)
+                )
+                cursor = conn.execute(
+                    "INSERT INTO analyses (document_id, job_id, overall_score, skills_score, experience_score, "
+                    "certification_score, analysis_method, duration_ms, created_at, result, jd_hash, "
+                    "scoring_version, from_session) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        document_id, job_id, result.get("overall_score", 0.0),
+                        breakdown.get("skills_score"), breakdown.get("experience_score"),
+                        breakdown.get("certification_score"), result.get("analysis_method", "full_analysis"),
+                        duration_ms, now, dumps_json(result), job_description_hash(job_description),
+                        scoring_version, int(from_session)
+                    )
+                )
+                analysis_id = cursor.lastrowid
+                conn.executemany(
+                    "INSERT OR IGNORE INTO analysis_skills (analysis_id, skill, matched) VALUES (?, ?, ?)",
+                    [(analysis_id, skill, 1) for skill in matched] +
+                    [(analysis_id, skill, 0) for skill in missing]
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return analysis_id
+
+    def list_analyses(self, job_id: Optional[str] = None, document_id: Optional[str] = None,
+                      min_score: Optional[float] = None, max_score: Optional[float] = None,
+                      skill: Optional[str] = None, missing_skill: Optional[str] = None,
+                      before_id: Optional[int] = None, limit: int = 50) -> Dict[str, Any]:
+        """Filtered analysis summaries, newest first, one keyset page at a time"""
+        conditions, params = [], []
+        if job_id:
+            conditions.append("job_id = ?")
+            params.append(job_id)
+        if document_id:
+            conditions.append("document_id = ?")
+            params.append(document_id)
+        if min_score is not None:
+            conditions.append("overall_score >= ?")
+            params.append(min_score)
+        if max_score is not None:
+            conditions.append("overall_score <= ?")
+            params.append(max_score)
+        for name, matched in ((skill, 1), (missing_skill, 0)):
+            if name:
+                conditions.append(
+                    "id IN (SELECT analysis_id FROM analysis_skills WHERE skill = ? AND matched = ?)"
+                )
+                params.extend([name.lower(), matched])
+        if before_id is not None:
+            conditions.append("id < ?")
+            params.append(before_id)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._connection() as conn:
+            rows = conn.execute(
+                f"SELECT {SUMMARY_COLUMNS} FROM analyses {where} ORDER BY id DESC LIMIT ?",
+                (*params, limit + 1)
+            ).fetchall()
+
+        items = [dict(row) for row in rows[:limit]]
+        return {
+            "items": items,
+            "next_before_id": items[-1]["id"] if len(rows) > limit else None,
+        }
+
+    def get_analysis(self, analysis_id: int) -> Optional[Dict[str, Any]]:
+        """Stored summary plus the full result as originally returned"""
+        with self._connection() as conn:
+            row = conn.execute(
+                f"SELECT {SUMMARY_COLUMNS}, result FROM analyses WHERE id = ?", (analysis_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        analysis = dict(row)
+        analysis["result"] = json.loads(analysis["result"])
+        return analysis
+
+    def latest_analysis(self, document_id: str, job_id: str, job_description: str,
+                        scoring_version: str, methods: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """Most recent reusable analysis of a document against this job description, if any.
+        
+        Results for the same ``job_id`` under a different (edited) description,
+        computed with another ``scoring_version``, or produced by an
+        incremental session do not match. ``methods`` restricts the match to
+        results produced by those analysis methods.
+        """
+        query = ("SELECT id FROM analyses WHERE document_id = ? AND job_id = ? AND jd_hash = ? "
+                 "AND scoring_version = ? AND from_session = 0")
+        params: List[Any] = [document_id, job_id, job_description_hash(job_description), scoring_version]
+        if methods:
+            query += f" AND analysis_method IN ({', '.join('?' * len(methods))})"
+            params.extend(methods)
+        with self._connection() as conn:
+            row = conn.execute(query + " ORDER BY id DESC LIMIT 1", params).fetchone()
+        return self.get_analysis(row["id"]) if row else None
+    
+    def list_jobs(self, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+        """Job profiles with their analysis counts and average scores"""
+        with self._connection() as conn:
+            rows = conn.execute(
+                "SELECT j.id, j.required_years, j.skills, j.created_at, "
+                "COUNT(a.id) AS analyses, AVG(a.overall_score) AS average_score "
+                "FROM job_profiles j LEFT JOIN analyses a ON a.job_id = j.id "
+                "GROUP BY j.id ORDER BY j.created_at DESC LIMIT ? OFFSET ?",
+                (limit, offset)
+            ).fetchall()
+        jobs = []
+        for row in rows:
+            job = dict(row)
+            job["skills"] = json.loads(job["skills"])
+            if job["average_score"] is not None:
+                job["average_score"] = round(job["average_score"], 1)
+            jobs.append(job)
+        return jobs
+
+    def stats(self) -> Dict[str, Any]:
+        """Usage totals computed from the store"""
+        since = (datetime.utcnow() - timedelta(days=1)).isoformat()
+        with self._connection() as conn:
+            totals = conn.execute(
+                "SELECT COUNT(*) AS total, AVG(overall_score) AS average_score, AVG(duration_ms) AS duration_ms "
+                "FROM analyses"
+            ).fetchone()
+            last_day = conn.execute("SELECT COUNT(*) FROM analyses WHERE created_at >= ?", (since,)).fetchone()[0]
+            documents = conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+            jobs = conn.execute("SELECT COUNT(*) FROM job_profiles").fetchone()[0]
+        return {
+            "total_analyses": totals["total"],
+            "analyses_last_24h": last_day,
+            "average_score": round(totals["average_score"], 1) if totals["average_score"] is not None else None,
+            "avg_processing_ms": round(totals["duration_ms"], 1) if totals["duration_ms"] is not None else None,
+            "total_documents": documents,
+            "total_jobs": jobs,
+        }
+
+    def close(self) -> None:
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_history_store() -> Optional[HistoryStore]:
+    """Return the process-wide history store, or None when disabled or unavailable"""
+    global _store
+    if not HISTORY_ENABLED:
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                try:
+                    _store = HistoryStore()
+                except sqlite3.Error as e:
+                    logger.warning(f"Analysis history disabled: {e}")
+                    _store = False
+    return _store or None
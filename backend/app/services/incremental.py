@@ -0,0 +1,157 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+import logging
+from .scoring_engine import DocumentProfile, ScoringEngine
+from .text_parser import TextParser
+
+logger = logging.getLogger(__name__)
+
+SESSION_MAX_COUNT = int(os.getenv("ANALYSIS_SESSION_MAX", "1000"))
+SESSION_TTL_SECONDS = float(os.getenv("ANALYSIS_SESSION_TTL", "3600"))
+
+@dataclass(slots=True)
+class SectionResult:
+    """Cached extraction output for one section of a document"""
+    profile: DocumentProfile
+    length: int
+    embedding: Optional[np.ndarray] = None
+
+@dataclass
+class AnalysisSession:
+    taxonomy_version: str
+    sections: Dict[str, SectionResult] = field(default_factory=dict)
+    last_used: float = field(default_factory=time.monotonic)
+    # Held for a whole analysis; re-entrant so profile and embedding calls nest
+    lock: Any = field(default_factory=threading.RLock)
+
+@dataclass(slots=True)
+class IncrementalStats:
+    sections_total: int = 0
+    sections_reused: int = 0
+
+def _section_key(section: str, content: str) -> str:
+    return hashlib.sha1(f"{section}\0{content}".encode("utf-8")).hexdigest()
+
+def merge_profiles(profiles: List[DocumentProfile]) -> DocumentProfile:
+    """Combine section profiles: bitsets are OR-ed, years take the maximum"""
+    years = [p.years for p in profiles if p.years is not None]
+    return DocumentProfile(
+        skills=np.logical_or.reduce([p.skills for p in profiles]),
+        certifications=np.logical_or.reduce([p.certifications for p in profiles]),
+        titles=np.logical_or.reduce([p.titles for p in profiles]),
+        years=max(years) if years else None,
+    )
+
+class IncrementalAnalyzer:
+    """Session-scoped cache of per-section results for re-submitted documents.
+
+    Each submission is split with ``TextParser.split_sections``; sections
+    whose content is unchanged since an earlier submission in the same
+    session reuse their cached bitset profile (and embedding), and only the
+    edited sections are re-extracted. Sessions are evicted LRU and after
+    ``ttl`` seconds of inactivity, and are reset when the taxonomy changes.
+    Analyses run on worker threads, so concurrent requests on one session
+    are serialized with the session's lock (see ``locked``).
+    """
+
+    def __init__(self, max_sessions: int = SESSION_MAX_COUNT, ttl: float = SESSION_TTL_SECONDS):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._sessions: "OrderedDict[str, AnalysisSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _session(self, session_id: str, taxonomy_version: str) -> AnalysisSession:
+        now = time.monotonic()
+        with self._lock:
+            # Drop expired sessions from the cold end
+            while self._sessions:
+                oldest_id, oldest = next(iter(self._sessions.items()))
+                if now - oldest.last_used <= self.ttl:
+                    break
+                del self._sessions[oldest_id]
+
+            session = self._sessions.get(session_id)
+            if session is None or session.taxonomy_version != taxonomy_version:
+                session = AnalysisSession(taxonomy_version)
+                self._sessions[session_id] = session
+            session.last_used = now
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+            return session
+
+    @contextmanager
+    def locked(self, session_id: str, taxonomy_version: str) -> Iterator[AnalysisSession]:
+        """Hold a session for the duration of one analysis"""
+        session = self._session(session_id, taxonomy_version)
+        with session.lock:
+            yield session
+
+    def profile(self, session_id: str, text: str, engine: ScoringEngine,
+                taxonomy_version: str) -> Tuple[DocumentProfile, IncrementalStats]:
+        """Profile a document, recomputing only sections that changed"""
+        with self.locked(session_id, taxonomy_version) as session:
+            return self._profile(session, text, engine)
+
+    def _profile(self, session: AnalysisSession, text: str,
+                 engine: ScoringEngine) -> Tuple[DocumentProfile, IncrementalStats]:
+        # Caller holds the session's lock
+        stats = IncrementalStats()
+        current: Dict[str, SectionResult] = {}
+        profiles = []
+
+        for section, content in TextParser.split_sections(text):
+            key = _section_key(section, content)
+            result = current.get(key) or session.sections.get(key)
+            stats.sections_total += 1
+            if result is None:
+                result = SectionResult(engine.profile(content), len(content))
+            else:
+                stats.sections_reused += 1
+            current[key] = result
+            profiles.append(result.profile)
+
+        # Keep only the latest version's sections so the session stays bounded
+        session.sections = current
+
+        if not profiles:
+            return engine.profile(text), stats
+        return merge_profiles(profiles), stats
+
+    def document_embedding(self, session_id: str, text: str, encoder: Callable,
+                           taxonomy_version: str) -> Optional[np.ndarray]:
+        """Length-weighted mean of section embeddings, encoding only new sections.
+        
+        Every section of ``text`` contributes: sections without a cached
+        vector are encoded now (and cached when the session profiled them).
+        """
+        with self.locked(session_id, taxonomy_version) as session:
+            segments = [(_section_key(section, content), content)
+                        for section, content in TextParser.split_sections(text)]
+            if not segments:
+                return None
+            embeddings: Dict[str, np.ndarray] = {}
+            missing: Dict[str, str] = {}
+            for key, content in segments:
+                cached = session.sections.get(key)
+                if cached is not None and cached.embedding is not None:
+                    embeddings[key] = cached.embedding
+                else:
+                    missing[key] = content
+            if missing:
+                vectors = encoder(list(missing.values()))
+                for key, vector in zip(missing, vectors):
+                    embeddings[key] = np.asarray(vector)
+                    if key in session.sections:
+                        session.sections[key].embedding = embeddings[key]
+
+            weights = np.array([len(content) for _, content in segments], dtype=np.float64)
+            stacked = np.vstack([embeddings[key] for key, _ in segments])
+            return (stacked * weights[:, None]).sum(axis=0) / max(weights.sum(), 1.0)
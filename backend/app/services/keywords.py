@@ -0,0 +1,132 @@
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import logging
+from sklearn.feature_extraction.text import CountVectorizer
+
+logger = logging.getLogger(__name__)
+
+KEYWORD_IDF_PATH = os.getenv(
+    "KEYWORD_IDF_PATH", os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "keyword_idf.json")
+)
+KEYWORD_TOP_TERMS = int(os.getenv("KEYWORD_TOP_TERMS", "10"))
+KEYWORD_CACHE_SIZE = 256  # ranked term lists kept per distinct job description
+
+# Action verbs recruiters' ATS filters commonly look for
+ACTION_VERBS = (
+    "managed", "developed", "implemented", "designed", "created", "led", "improved",
+    "optimized", "analyzed", "collaborated", "achieved", "delivered", "maintained",
+    "coordinated", "supervised", "trained", "mentored", "presented", "negotiated"
+)
+
+# Candidate JD terms: alphabetic words of four or more letters, minus stop words
+TERM_PATTERN = r"(?u)\b[a-z]{4,}\b"
+_WORD_PATTERN = re.compile(r"[a-z]+")
+
+# One analyzer for every document; CountVectorizer only supplies the
+# tokenization, so it never needs fitting
+keyword_terms = CountVectorizer(token_pattern=TERM_PATTERN, stop_words="english").build_analyzer()
+
+def smooth_idf(documents: int, document_frequency: int) -> float:
+    """Smoothed IDF as computed by scikit-learn's TfidfTransformer"""
+    return math.log((1 + documents) / (1 + document_frequency)) + 1
+
+class KeywordEngine:
+    """Ranks job-description terms by TF-IDF and checks them against a resume.
+
+    IDF weights come from a table precomputed over a reference corpus (see
+    ``scripts/build_keyword_idf.py``); terms missing from the table are
+    treated as rare. A JD is turned into a sparse term-count vector once,
+    weighted, and ranked by descending weight with first occurrence as the
+    tie-breaker, so the chosen terms are deterministic. Ranked terms are
+    cached per JD, which lets batch scoring reuse them for every resume.
+    Presence is an exact lookup in the resume's word set.
+    """
+
+    def __init__(self, idf: Optional[Dict[str, float]] = None, documents: int = 0,
+                 top_terms: int = KEYWORD_TOP_TERMS, version: str = "none"):
+        self.idf = idf or {}
+        # Identifies the IDF table, so stored keyword reports can be matched to it
+        self.version = version
+        self.documents = documents
+        # Terms below the table's min_df are weighted as if seen once
+        self.default_idf = smooth_idf(documents, 1) if documents else 1.0
+        self.top_terms = top_terms
+        self._ranked: "OrderedDict[str, Tuple[str, ...]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str = KEYWORD_IDF_PATH) -> "KeywordEngine":
+        """Load the IDF table at ``path``; without one every term weighs the same"""
+        if not os.path.exists(path):
+            logger.info(f"No keyword IDF table at {path}; ranking JD terms by frequency only")
+            return cls()
+        with open(path, "rb") as f:
+            raw = f.read()
+        table = json.loads(raw)
+        return cls(table["idf"], table["documents"], version=hashlib.sha256(raw).hexdigest()[:12])
+
+    def rank_terms(self, job_description: str) -> Tuple[str, ...]:
+        """The ``top_terms`` highest-weighted JD terms, most important first"""
+        with self._lock:
+            ranked = self._ranked.get(job_description)
+            if ranked is not None:
+                self._ranked.move_to_end(job_description)
+                return ranked
+
+        tokens = keyword_terms(job_description)
+        if tokens:
+            terms, first_seen, counts = np.unique(np.array(tokens), return_index=True, return_counts=True)
+            idf = np.fromiter((self.idf.get(term, self.default_idf) for term in terms),
+                              dtype=np.float64, count=len(terms))
+            order = np.lexsort((first_seen, -(counts * idf)))[:self.top_terms]
+            ranked = tuple(str(terms[i]) for i in order)
+        else:
+            ranked = ()
+
+        with self._lock:
+            self._ranked[job_description] = ranked
+            while len(self._ranked) > KEYWORD_CACHE_SIZE:
+                self._ranked.popitem(last=False)
+        return ranked
+
+    def check(self, resume_text: str, job_description: str) -> Dict[str, bool]:
+        """Presence of each action verb and top JD term in the resume"""
+        words = set(_WORD_PATTERN.findall(resume_text.lower()))
+        status = {verb: verb in words for verb in ACTION_VERBS}
+        for term in self.rank_terms(job_description):
+            status[term] = term in words
+        return status
+
+def build_idf_table(texts: List[str], min_df: int = 2) -> Dict:
+    """Document frequencies over a reference corpus, as a loadable IDF table"""
+    counts = CountVectorizer(analyzer=keyword_terms, binary=True, min_df=min_df)
+    matrix = counts.fit_transform(texts)
+    document_frequency = np.asarray(matrix.sum(axis=0)).ravel()
+    documents = matrix.shape[0]
+    return {
+        "documents": documents,
+        "min_df": min_df,
+        "idf": {
+            term: round(smooth_idf(documents, int(document_frequency[column])), 6)
+            for term, column in sorted(counts.vocabulary_.items())
+        },
+    }
+
+_engine = None
+_engine_lock = threading.Lock()
+
+def get_keyword_engine() -> KeywordEngine:
+    """Return the process-wide keyword engine"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = KeywordEngine.load()
+    return _engine
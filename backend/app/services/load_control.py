@@ -0,0 +1,120 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+LOAD_CONTROL_ENABLED = os.getenv("LOAD_CONTROL_ENABLED", "1") == "1"
+LOAD_LATENCY_SLO_MS = float(os.getenv("LOAD_LATENCY_SLO_MS", "2000"))
+LOAD_MAX_QUEUE_DEPTH = int(os.getenv("LOAD_MAX_QUEUE_DEPTH", "16"))  # analyses admitted but not finished
+LOAD_PROBE_INTERVAL = float(os.getenv("LOAD_PROBE_INTERVAL", "5"))  # seconds between full-tier probes
+LOAD_EWMA_ALPHA = float(os.getenv("LOAD_EWMA_ALPHA", "0.2"))
+
+# Stages whose latency feeds the full-tier estimate
+QUEUE_STAGE = "queue"          # admission until a worker thread picks the analysis up
+SCORING_STAGE = "scoring"      # bitset scoring, suggestions and keywords (every tier)
+SEMANTIC_STAGE = "semantic"    # SentenceTransformer stages (full tier only)
+
+class LoadController:
+    """Decides whether analyses can afford the semantic stages right now.
+
+    Tracks how many analyses are admitted but unfinished (queue depth) and
+    an exponentially weighted moving average of each stage's latency. A
+    full-tier analysis is expected to take ``queue + scoring + semantic``
+    milliseconds; when that estimate exceeds the latency SLO, or the queue
+    is deeper than ``max_queue_depth``, ``shed_semantic`` tells callers to
+    fall back to the fast tier. While shedding, one analysis every
+    ``probe_interval`` seconds still runs the full tier so the semantic
+    estimate tracks the current load and the controller can recover.
+    """
+
+    def __init__(self, slo_ms: float = LOAD_LATENCY_SLO_MS, max_queue_depth: int = LOAD_MAX_QUEUE_DEPTH,
+                 probe_interval: float = LOAD_PROBE_INTERVAL, alpha: float = LOAD_EWMA_ALPHA,
+                 clock: Callable[[], float] = time.monotonic):
+        self.slo_ms = slo_ms
+        self.max_queue_depth = max_queue_depth
+        self.probe_interval = probe_interval
+        self.alpha = alpha
+        self.clock = clock
+        self._in_flight = 0
+        self._stage_ms: Dict[str, float] = {}
+        self._shedding = False
+        self._last_probe = 0.0
+        self._shed_count = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def admit(self) -> Iterator[None]:
+        """Count an analysis against the queue depth until it finishes"""
+        with self._lock:
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def observe(self, stage: str, elapsed_ms: float) -> None:
+        """Fold one stage timing into that stage's moving average"""
+        with self._lock:
+            previous = self._stage_ms.get(stage)
+            self._stage_ms[stage] = elapsed_ms if previous is None else (
+                previous + self.alpha * (elapsed_ms - previous)
+            )
+
+    def estimated_full_ms(self) -> float:
+        """Expected latency of a full-tier analysis admitted now"""
+        stages = self._stage_ms
+        return stages.get(QUEUE_STAGE, 0.0) + stages.get(SCORING_STAGE, 0.0) + stages.get(SEMANTIC_STAGE, 0.0)
+
+    def shed_semantic(self) -> bool:
+        """True when this analysis should skip the semantic stages"""
+        now = self.clock()
+        with self._lock:
+            at_risk = (self._in_flight > self.max_queue_depth or
+                       self.estimated_full_ms() > self.slo_ms)
+            if at_risk != self._shedding:
+                self._shedding = at_risk
+                self._last_probe = now
+                if at_risk:
+                    logger.warning(
+                        f"Latency SLO at risk (queue depth {self._in_flight}, "
+                        f"estimated {self.estimated_full_ms():.0f} ms); skipping semantic stages"
+                    )
+                else:
+                    logger.info("Load back within SLO; semantic stages re-enabled")
+            if not at_risk:
+                return False
+            if now - self._last_probe >= self.probe_interval:
+                self._last_probe = now
+                return False
+            self._shed_count += 1
+            return True
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "queue_depth": self._in_flight,
+                "shedding": self._shedding,
+                "shed_analyses": self._shed_count,
+                "slo_ms": self.slo_ms,
+                "estimated_full_ms": round(self.estimated_full_ms(), 1),
+                "stage_ms": {stage: round(ms, 1) for stage, ms in self._stage_ms.items()},
+            }
+
+_controller = None
+_controller_lock = threading.Lock()
+
+def get_load_controller() -> Optional[LoadController]:
+    """Return the process-wide load controller, or None when disabled"""
+    global _controller
+    if not LOAD_CONTROL_ENABLED:
+        return None
+    if _controller is None:
+        with _controller_lock:
+            if _controller is None:
+                _controller = LoadController()
+    return _controller
@@ -0,0 +1,83 @@
+import json
+import os
+import threading
+from typing import Any, Dict, Optional
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "models")
+MODEL_BUNDLE_PATH = os.getenv("MODEL_BUNDLE_PATH", os.path.join(MODELS_DIR, "current"))
+SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+
+MANIFEST_FILE = "manifest.json"
+SENTENCE_MODEL_DIR = "sentence-model"
+SPACY_MODEL_DIR = "spacy-model"
+TAXONOMY_FILE = "taxonomy.json"
+SKILL_EMBEDDINGS_FILE = "skill_embeddings.npy"
+
+class ModelBundle:
+    """A versioned, self-contained directory of everything the analyzer loads.
+
+    Built by ``scripts/build_model_bundle.py``; ``manifest.json`` names the
+    sentence and spaCy models it packages and the version of the bundled
+    taxonomy its skill embeddings were computed for. The server serves that
+    taxonomy while the bundle is installed. Loading from a bundle needs no
+    network access, and the embeddings are memory-mapped, so every worker on
+    a host shares one copy through the page cache.
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.realpath(path)
+        with open(os.path.join(self.path, MANIFEST_FILE), encoding="utf-8") as f:
+            self.manifest: Dict[str, Any] = json.load(f)
+        self.version: str = self.manifest["version"]
+        self.sentence_model: Optional[str] = self.manifest.get("sentence_model")
+        self.spacy_model: Optional[str] = self.manifest.get("spacy_model")
+        self.taxonomy_version: Optional[str] = self.manifest.get("taxonomy_version")
+
+    def sentence_model_path(self, model_name: str) -> Optional[str]:
+        """Local copy of ``model_name``, if this bundle packages it"""
+        path = os.path.join(self.path, SENTENCE_MODEL_DIR)
+        if model_name == self.sentence_model and os.path.isdir(path):
+            return path
+        return None
+
+    def spacy_model_path(self, model_name: str) -> Optional[str]:
+        path = os.path.join(self.path, SPACY_MODEL_DIR)
+        if model_name == self.spacy_model and os.path.isdir(path):
+            return path
+        return None
+
+    @property
+    def taxonomy_path(self) -> Optional[str]:
+        path = os.path.join(self.path, TAXONOMY_FILE)
+        return path if os.path.exists(path) else None
+
+    def skill_embeddings(self, taxonomy_version: str, model_name: str) -> Optional[np.ndarray]:
+        """Memory-mapped skill embeddings, when built for this taxonomy and model"""
+        if taxonomy_version != self.taxonomy_version or model_name != self.sentence_model:
+            return None
+        path = os.path.join(self.path, SKILL_EMBEDDINGS_FILE)
+        if not os.path.exists(path):
+            return None
+        return np.load(path, mmap_mode="r")
+
+_bundle = None
+_bundle_lock = threading.Lock()
+
+def get_model_bundle() -> Optional[ModelBundle]:
+    """Return the bundle at MODEL_BUNDLE_PATH, or None when there is none"""
+    global _bundle
+    if _bundle is None:
+        with _bundle_lock:
+            if _bundle is None:
+                _bundle = False
+                if MODEL_BUNDLE_PATH and os.path.exists(os.path.join(MODEL_BUNDLE_PATH, MANIFEST_FILE)):
+                    try:
+                        _bundle = ModelBundle(MODEL_BUNDLE_PATH)
+                        logger.info(f"Using model bundle {_bundle.version} from {_bundle.path}")
+                    except (OSError, KeyError, ValueError) as e:
+                        logger.warning(f"Ignoring unreadable model bundle at {MODEL_BUNDLE_PATH}: {e}")
+    return _bundle or None
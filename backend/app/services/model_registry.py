@@ -0,0 +1,49 @@
+import gc
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_nlp_analyzer = None
+_scoring_service = None
+
+def get_nlp_analyzer():
+    """Return the process-wide NLPAnalyzer, loading its models on first use.
+
+    Sharing one instance avoids reloading spaCy and SentenceTransformer per
+    request, and lets a pre-fork server load the models once in the master
+    process so workers share the pages copy-on-write.
+    """
+    global _nlp_analyzer
+    if _nlp_analyzer is None:
+        with _lock:
+            if _nlp_analyzer is None:
+                from .nlp_analyzer import NLPAnalyzer
+                _nlp_analyzer = NLPAnalyzer()
+    return _nlp_analyzer
+
+def get_scoring_service():
+    """Return the process-wide ScoringService built on the shared analyzer"""
+    global _scoring_service
+    if _scoring_service is None:
+        analyzer = get_nlp_analyzer()
+        with _lock:
+            if _scoring_service is None:
+                from .scoring_service import ScoringService
+                _scoring_service = ScoringService(analyzer)
+    return _scoring_service
+
+def preload_models(freeze: bool = True):
+    """Load all models now, optionally freezing them out of the cyclic GC.
+
+    ``gc.freeze()`` moves every object that exists at this point into a
+    permanent generation, so later collections in forked workers do not
+    write to (and thereby un-share) the pages holding model objects.
+    """
+    analyzer = get_nlp_analyzer()
+    if freeze:
+        gc.collect()
+        gc.freeze()
+        logger.info(f"Preloaded NLP models; froze {gc.get_freeze_count()} objects for copy-on-write sharing")
+    return analyzer
@@ -1,108 +1,102 @@
 import spacy
 import re
+from functools import lru_cache
 from typing import List, Dict, Set, Tuple, Optional
-from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
-from sentence_transformers import SentenceTransformer
 import numpy as np
 import logging
+from .embedding_models import load_sentence_model, sentence_model_name
+from .model_bundle import SPACY_MODEL, get_model_bundle
+from .scoring_engine import TermMatcher
+from .taxonomy import get_taxonomy, get_taxonomy_registry
 
 logger = logging.getLogger(__name__)
 
+# Common degree patterns
+DEGREE_PATTERNS = [re.compile(p) for p in (
+    r'bachelor[\'s]*\s*(?:of\s*)?(\w+(?:\s+\w+)*)',
+    r'master[\'s]*\s*(?:of\s*)?(\w+(?:\s+\w+)*)',
+    r'phd?\s*(?:in\s*)?(\w+(?:\s+\w+)*)',
+    r'doctorate\s*(?:in\s*)?(\w+(?:\s+\w+)*)',
+    r'b\.?[sa]\.?\s*(?:in\s*)?(\w+(?:\s+\w+)*)',
+    r'm\.?[sa]\.?\s*(?:in\s*)?(\w+(?:\s+\w+)*)',
+)]
+INSTITUTION_LINE_PATTERN = re.compile(r'^.*(?:university|college|institute|school).*$',
+                                      re.IGNORECASE | re.MULTILINE)
+
+@lru_cache(maxsize=64)
+def keyword_matcher(keywords: Tuple[str, ...]) -> TermMatcher:
+    """Compiled word-bounded matcher for an ad-hoc keyword list"""
+    return TermMatcher(keywords, word_boundary=True)
+
 class NLPAnalyzer:
     """Advanced NLP service for resume and job description analysis"""
     
     def __init__(self):
+        # Models load from the local bundle when one is installed (see model_bundle.py)
+        bundle = get_model_bundle()
         try:
             # Load spaCy model
-            self.nlp = spacy.load("en_core_web_sm")
+            spacy_path = bundle.spacy_model_path(SPACY_MODEL) if bundle else None
+            self.nlp = spacy.load(spacy_path or SPACY_MODEL)
         except OSError:
-            logger.warning("spaCy model not found. Please install: python -m spacy download en_core_web_sm")
+            logger.warning(f"spaCy model not found. Please install: python -m spacy download {SPACY_MODEL}")
             self.nlp = None
         
         # Initialize sentence transformer for semantic similarity
         try:
-            self.sentence_model = SentenceTransformer('all-MiniLM-L6-v2')
+            self.sentence_model = load_sentence_model()
         except Exception as e:
             logger.warning(f"Could not load sentence transformer: {e}")
             self.sentence_model = None
         
-        # Comprehensive skill categories
-        self.skill_categories = {
-            "programming_languages": [
-                "python", "java", "javascript", "c++", "c#", "ruby", "php", "swift", 
-                "kotlin", "go", "rust", "scala", "typescript", "r", "matlab", "sql",
-                "html", "css", "react", "angular", "vue", "node.js", "django", "flask"
-            ],
-            "cloud_platforms": [
-                "aws", "azure", "gcp", "google cloud", "amazon web services", 
-                "microsoft azure", "docker", "kubernetes", "terraform", "ansible"
-            ],
-            "databases": [
-                "mysql", "postgresql", "mongodb", "redis", "elasticsearch", 
-                "oracle", "sql server", "sqlite", "cassandra", "dynamodb"
-            ],
-            "frameworks": [
-                "spring", "spring boot", "hibernate", "struts", "laravel", 
-                "codeigniter", "express.js", "fastapi", "tornado", "pandas", "numpy"
-            ],
-            "tools": [
-                "git", "jenkins", "jira", "confluence", "tableau", "power bi",
-                "excel", "photoshop", "illustrator", "figma", "sketch", "postman"
-            ],
-            "soft_skills": [
-                "leadership", "communication", "teamwork", "project management",
-                "problem solving", "analytical", "creative", "adaptable", "organized"
-            ],
-            "methodologies": [
-                "agile", "scrum", "waterfall", "devops", "ci/cd", "tdd", "bdd",
-                "lean", "kanban", "safe", "itil", "six sigma"
-            ]
-        }
-        
-        # Create flat skill list
-        self.all_skills = []
-        for category, skills in self.skill_categories.items():
-            self.all_skills.extend(skills)
-        
-        # Common certifications
-        self.certifications = [
-            "aws certified", "azure certified", "google cloud certified",
-            "pmp", "cissp", "cisa", "cism", "comptia", "cisco certified",
-            "microsoft certified", "oracle certified", "salesforce certified",
-            "scrum master", "safe", "itil", "six sigma"
-        ]
-        
-        # Experience indicators
-        self.experience_patterns = [
-            r'(\d+)[\+\s]*years?\s*(of\s*)?(experience|exp)',
-            r'(\d+)[\+\s]*yrs?\s*(of\s*)?(experience|exp)',
-            r'over\s*(\d+)\s*years?',
-            r'more than\s*(\d+)\s*years?',
-            r'(\d+)\+\s*years?'
-        ]
-        
-        # Job title patterns
-        self.job_titles = [
-            "software engineer", "software developer", "full stack developer",
-            "frontend developer", "backend developer", "devops engineer",
-            "data scientist", "data analyst", "machine learning engineer",
-            "product manager", "project manager", "scrum master",
-            "architect", "senior", "junior", "lead", "principal", "director",
-            "manager", "consultant", "analyst", "specialist", "coordinator"
-        ]
+        # Skill, certification, title and experience vocabularies come from the
+        # hot-reloadable taxonomy index (see taxonomy.py)
+        self.taxonomy = get_taxonomy_registry()
+        if self.sentence_model:
+            self.taxonomy.set_encoder(self.sentence_model.encode)
+            index = self.taxonomy.current
+            if bundle:
+                embeddings = bundle.skill_embeddings(index.version, sentence_model_name())
+                if embeddings is not None:
+                    index.use_skill_embeddings(embeddings)
+                else:
+                    logger.warning(
+                        f"Model bundle {bundle.version} has no skill embeddings for sentence model "
+                        f"{sentence_model_name()} and taxonomy {index.version}; computing them"
+                    )
+            index.skill_embeddings(self.sentence_model.encode)
+    
+    @property
+    def skill_categories(self) -> Dict[str, List[str]]:
+        return self.taxonomy.current.skill_categories
+    
+    @property
+    def all_skills(self) -> List[str]:
+        return self.taxonomy.current.all_skills
+    
+    @property
+    def certifications(self) -> List[str]:
+        return self.taxonomy.current.certifications
+    
+    @property
+    def experience_patterns(self) -> List[re.Pattern]:
+        return self.taxonomy.current.experience_patterns
+    
+    @property
+    def job_titles(self) -> List[str]:
+        return self.taxonomy.current.job_titles
     
     def extract_skills(self, text: str) -> Dict[str, List[str]]:
         """Extract skills from text categorized by type"""
-        text_lower = text.lower()
-        found_skills = {category: [] for category in self.skill_categories.keys()}
+        index = get_taxonomy()
+        vocabulary = index.vocabulary
+        found_skills = {category: [] for category in index.skill_categories.keys()}
         
-        for category, skills in self.skill_categories.items():
-            for skill in skills:
-                # Use word boundaries for better matching
-                pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-                if re.search(pattern, text_lower):
-                    found_skills[category].append(skill)
+        # One compiled scan finds every skill (word-boundary matches)
+        for skill_id in np.flatnonzero(vocabulary.skill_matcher.mask(text)):
+            category = vocabulary.categories[vocabulary.skill_category_ids[skill_id]]
+            found_skills[category].append(vocabulary.skills[skill_id])
         
         return found_skills
     
@@ -112,7 +106,7 @@ class NLPAnalyzer:
         max_years = 0
         
         for pattern in self.experience_patterns:
-            matches = re.findall(pattern, text_lower)
+            matches = pattern.findall(text_lower)
             for match in matches:
                 if isinstance(match, tuple):
                     years = int(match[0])
@@ -124,34 +118,29 @@ class NLPAnalyzer:
     
     def extract_job_titles(self, text: str) -> List[str]:
         """Extract job titles from text"""
-        text_lower = text.lower()
-        found_titles = []
-        
-        for title in self.job_titles:
-            if title.lower() in text_lower:
-                found_titles.append(title)
-        
-        return list(set(found_titles))
+        vocabulary = get_taxonomy().vocabulary
+        return [vocabulary.job_titles[i] for i in np.flatnonzero(vocabulary.title_matcher.mask(text))]
     
     def extract_certifications(self, text: str) -> List[str]:
         """Extract certifications from text"""
-        text_lower = text.lower()
-        found_certs = []
-        
-        for cert in self.certifications:
-            if cert.lower() in text_lower:
-                found_certs.append(cert)
-        
-        return found_certs
+        vocabulary = get_taxonomy().vocabulary
+        return [vocabulary.certifications[i] for i in np.flatnonzero(vocabulary.cert_matcher.mask(text))]
     
-    def calculate_semantic_similarity(self, resume_text: str, job_description: str) -> float:
-        """Calculate semantic similarity between resume and job description"""
+    def calculate_semantic_similarity(self, resume_text: str, job_description: str,
+                                      resume_embedding: Optional[np.ndarray] = None) -> float:
+        """Calculate semantic similarity between resume and job description.
+        
+        A precomputed ``resume_embedding`` (e.g. from cached section
+        embeddings) is used instead of encoding ``resume_text``.
+        """
         if not self.sentence_model:
             return 0.0
         
         try:
             # Get embeddings
-            resume_embedding = self.sentence_model.encode([resume_text])
+            if resume_embedding is None:
+                resume_embedding = self.sentence_model.encode([resume_text])
+            resume_embedding = np.asarray(resume_embedding).reshape(1, -1)
             jd_embedding = self.sentence_model.encode([job_description])
             
             # Calculate cosine similarity
@@ -169,8 +158,8 @@ class NLPAnalyzer:
         semantic_matches = []
         
         try:
-            resume_embeddings = self.sentence_model.encode(resume_skills)
-            jd_embeddings = self.sentence_model.encode(jd_skills)
+            resume_embeddings = self._skill_embeddings(resume_skills)
+            jd_embeddings = self._skill_embeddings(jd_skills)
             
             # Calculate similarity matrix
             similarity_matrix = cosine_similarity(resume_embeddings, jd_embeddings)
@@ -190,6 +179,14 @@ class NLPAnalyzer:
         
         return semantic_matches
     
+    def _skill_embeddings(self, skills: List[str]) -> np.ndarray:
+        """Embed skills, reusing the taxonomy's precomputed vectors for known skills"""
+        index = get_taxonomy()
+        ids = [index.skill_ids.get(skill.lower()) for skill in skills]
+        if any(skill_id is None for skill_id in ids):
+            return self.sentence_model.encode(skills)
+        return index.skill_embeddings(self.sentence_model.encode)[ids]
+    
     def extract_entities(self, text: str) -> Dict[str, List[str]]:
         """Extract named entities from text using spaCy"""
         if not self.nlp:
@@ -208,17 +205,21 @@ class NLPAnalyzer:
         
         return entities
     
-    def calculate_keyword_density(self, text: str, keywords: List[str]) -> Dict[str, float]:
-        """Calculate keyword density in text"""
-        text_lower = text.lower()
-        word_count = len(text_lower.split())
-        densities = {}
-        
-        for keyword in keywords:
-            count = len(re.findall(r'\b' + re.escape(keyword.lower()) + r'\b', text_lower))
-            densities[keyword] = (count / word_count) * 100 if word_count > 0 else 0.0
-        
-        return densities
+    def calculate_keyword_density(self, text: str, keywords: Optional[List[str]] = None) -> Dict[str, float]:
+        """Occurrences per 100 words of each keyword, counted in one scan of the text.
+        
+        Without ``keywords`` the density of every taxonomy skill is returned.
+        """
+        if keywords is None:
+            matcher = get_taxonomy().vocabulary.skill_matcher
+        else:
+            matcher = keyword_matcher(tuple(keywords))
+        
+        word_count = len(text.split())
+        if word_count == 0:
+            return dict.fromkeys(matcher.terms, 0.0)
+        densities = matcher.counts(text) * (100.0 / word_count)
+        return dict(zip(matcher.terms, densities.tolist()))
     
     def extract_education_info(self, text: str) -> Dict[str, List[str]]:
         """Extract education information"""
@@ -228,31 +229,18 @@ class NLPAnalyzer:
             "fields_of_study": []
         }
         
-        # Common degree patterns
-        degree_patterns = [
-            r'bachelor[\'s]*\s*(?:of\s*)?(\w+(?:\s+\w+)*)',
-            r'master[\'s]*\s*(?:of\s*)?(\w+(?:\s+\w+)*)',
-            r'phd?\s*(?:in\s*)?(\w+(?:\s+\w+)*)',
-            r'doctorate\s*(?:in\s*)?(\w+(?:\s+\w+)*)',
-            r'b\.?[sa]\.?\s*(?:in\s*)?(\w+(?:\s+\w+)*)',
-            r'm\.?[sa]\.?\s*(?:in\s*)?(\w+(?:\s+\w+)*)',
-        ]
-        
         text_lower = text.lower()
         
-        for pattern in degree_patterns:
-            matches = re.finditer(pattern, text_lower)
-            for match in matches:
+        for pattern in DEGREE_PATTERNS:
+            for match in pattern.finditer(text_lower):
                 education_info["degrees"].append(match.group())
                 if match.group(1):
                     education_info["fields_of_study"].append(match.group(1).strip())
         
-        # Extract university/college names (basic pattern)
-        institution_pattern = r'university|college|institute|school'
-        lines = text.split('\n')
-        
-        for line in lines:
-            if re.search(institution_pattern, line.lower()) and len(line.strip()) < 100:
-                education_info["institutions"].append(line.strip())
+        # Extract university/college names (basic pattern) in one scan over all lines
+        for match in INSTITUTION_LINE_PATTERN.finditer(text):
+            line = match.group().strip()
+            if len(line) < 100:
+                education_info["institutions"].append(line)
         
         return education_info
\ No newline at end of file
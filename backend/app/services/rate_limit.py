@@ -0,0 +1,109 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "1") == "1"
+RATE_LIMIT_PER_MINUTE = float(os.getenv("RATE_LIMIT_PER_MINUTE", "60"))
+RATE_LIMIT_BURST = float(os.getenv("RATE_LIMIT_BURST", "20"))
+RATE_LIMIT_BATCH_PER_MINUTE = float(os.getenv("RATE_LIMIT_BATCH_PER_MINUTE", "600"))
+RATE_LIMIT_BATCH_BURST = float(os.getenv("RATE_LIMIT_BATCH_BURST", "100"))
+RATE_LIMIT_MAX_CLIENTS = int(os.getenv("RATE_LIMIT_MAX_CLIENTS", "100000"))
+def _key_set(value: str) -> frozenset:
+    return frozenset(key.strip() for key in value.split(",") if key.strip())
+
+# Only configured API keys identify a client; any other key is ignored, so
+# rotating made-up keys cannot buy fresh token buckets or fair-queue flows
+API_KEYS = _key_set(os.getenv("API_KEYS", ""))
+# API keys of batch tenants: higher request rate, lower scheduling weight
+BATCH_API_KEYS = _key_set(os.getenv("BATCH_API_KEYS", ""))
+# Use the first X-Forwarded-For address as the client IP (only behind a trusted proxy)
+TRUST_PROXY_HEADERS = os.getenv("TRUST_PROXY_HEADERS", "0") == "1"
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+
+@dataclass(frozen=True, slots=True)
+class ClientIdentity:
+    """Who a request is accounted to: an API key (hashed) or an IP address"""
+    key: str
+    service_class: str = INTERACTIVE
+
+ANONYMOUS = ClientIdentity("anonymous")
+
+# Set by the rate-limit middleware for the duration of a request
+current_client: ContextVar[ClientIdentity] = ContextVar("current_client", default=ANONYMOUS)
+
+def identify_client(api_key: Optional[str], client_host: Optional[str],
+                    forwarded_for: Optional[str] = None) -> ClientIdentity:
+    """Account to a configured API key, else to the client IP"""
+    if api_key and (api_key in API_KEYS or api_key in BATCH_API_KEYS):
+        service_class = BATCH if api_key in BATCH_API_KEYS else INTERACTIVE
+        return ClientIdentity("key:" + hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16], service_class)
+    if TRUST_PROXY_HEADERS and forwarded_for:
+        client_host = forwarded_for.split(",")[0].strip()
+    return ClientIdentity(f"ip:{client_host or 'unknown'}")
+
+class TokenBucketLimiter:
+    """Per-client token buckets refilled continuously at a per-class rate.
+
+    A bucket holds at most ``burst`` tokens and each request takes one, so a
+    client can send ``burst`` requests at once and then ``rate`` per minute.
+    Buckets are kept for the ``max_clients`` most recently seen clients;
+    an evicted client simply starts again with a full bucket.
+    """
+
+    def __init__(self, per_minute: float = RATE_LIMIT_PER_MINUTE, burst: float = RATE_LIMIT_BURST,
+                 batch_per_minute: float = RATE_LIMIT_BATCH_PER_MINUTE,
+                 batch_burst: float = RATE_LIMIT_BATCH_BURST, max_clients: int = RATE_LIMIT_MAX_CLIENTS):
+        self.limits = {
+            INTERACTIVE: (per_minute / 60.0, burst),
+            BATCH: (batch_per_minute / 60.0, batch_burst),
+        }
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()  # key -> (tokens, updated)
+        self._lock = threading.Lock()
+
+    def acquire(self, client: ClientIdentity, cost: float = 1.0) -> Tuple[bool, float, float]:
+        """Take ``cost`` tokens; returns ``(allowed, tokens left, seconds until allowed)``.
+        
+        With a refill rate of zero a denied client is never allowed again, and
+        the wait is infinite.
+        """
+        rate, burst = self.limits[client.service_class]
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(client.key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[client.key] = (tokens, now)
+            while len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        if allowed:
+            retry_after = 0.0
+        else:
+            retry_after = (cost - tokens) / rate if rate > 0 else float("inf")
+        return allowed, tokens, retry_after
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+def get_rate_limiter() -> Optional[TokenBucketLimiter]:
+    """Return the process-wide rate limiter, or None when disabled"""
+    global _limiter
+    if not RATE_LIMIT_ENABLED:
+        return None
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = TokenBucketLimiter()
+    return _limiter
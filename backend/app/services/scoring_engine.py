@@ -0,0 +1,320 @@
+import re
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import logging
+from ..models.results import ScreeningOutcome
+
+logger = logging.getLogger(__name__)
+
+IMPORTANCE_WEIGHTS = {"high": 3, "medium": 2, "low": 1}
+HIGH_PRIORITY_CERT_KEYWORDS = ["aws", "azure", "google", "pmp"]
+
+# Screening evaluates components in this order, cheapest and most decisive first
+SCREENING_STAGES = ("skills", "certifications", "titles", "years")
+# Most points each screening stage can contribute (experience is years + titles)
+SCREENING_MAX_POINTS = {"skills": 100.0, "certifications": 100.0, "titles": 40.0, "years": 60.0}
+
+class TermMatcher:
+    """Find every vocabulary term present in a text with one compiled scan.
+
+    All terms are compiled into a single zero-width lookahead alternation
+    (longest first), so each start position reports its longest matching
+    term. Shorter terms that are prefixes of a longer match (``spring`` inside
+    ``spring boot``) are recovered from a precomputed implication table, which
+    keeps results identical to searching for each term separately.
+
+    ``aliases`` maps extra surface forms to canonical terms (``k8s`` to
+    ``kubernetes``); they are compiled into the same alternation and resolve
+    to the canonical term's ID, so normalization costs no extra pass.
+    """
+
+    def __init__(self, terms: Sequence[str], word_boundary: bool = True,
+                 aliases: Optional[Dict[str, str]] = None):
+        self.terms = list(terms)
+        self.size = len(self.terms)
+        boundary = r'\b' if word_boundary else ''
+
+        self._ids: Dict[str, List[int]] = {}
+        for term_id, term in enumerate(self.terms):
+            self._ids.setdefault(term.lower(), []).append(term_id)
+
+        # Surface forms resolve to the IDs of their canonical term
+        for alias, canonical in (aliases or {}).items():
+            canonical_ids = self._ids.get(canonical.lower())
+            if canonical_ids and alias.lower() not in self._ids:
+                self._ids[alias.lower()] = list(canonical_ids)
+
+        unique_terms = sorted(self._ids, key=len, reverse=True)
+        self._pattern = None
+        if unique_terms:
+            alternation = '|'.join(re.escape(term) for term in unique_terms)
+            self._pattern = re.compile(rf'(?=({boundary}(?:{alternation}){boundary}))')
+
+        # Terms implied by a match: the term itself plus its boundary-respecting prefixes
+        self._implied: Dict[str, np.ndarray] = {}
+        for term in unique_terms:
+            ids = list(self._ids[term])
+            for other in unique_terms:
+                if len(other) < len(term) and re.match(boundary + re.escape(other) + boundary, term):
+                    ids.extend(self._ids[other])
+            self._implied[term] = np.unique(np.array(ids, dtype=np.intp))
+
+    def mask(self, text: str) -> np.ndarray:
+        """Return a boolean array marking which terms occur in the text"""
+        found = np.zeros(self.size, dtype=bool)
+        if self._pattern is None or not text:
+            return found
+        for term in {match.group(1) for match in self._pattern.finditer(text.lower())}:
+            found[self._implied[term]] = True
+        return found
+
+    def counts(self, text: str) -> np.ndarray:
+        """Return per-term occurrence counts from the same single scan as ``mask``.
+        
+        Every start position contributes one occurrence to its longest match
+        and to the prefixes it implies, so the counts equal a separate
+        word-bounded ``re.findall`` per term.
+        """
+        found = np.zeros(self.size, dtype=np.int64)
+        if self._pattern is None or not text:
+            return found
+        matched: Dict[str, int] = {}
+        for match in self._pattern.finditer(text.lower()):
+            term = match.group(1)
+            matched[term] = matched.get(term, 0) + 1
+        for term, occurrences in matched.items():
+            found[self._implied[term]] += occurrences
+        return found
+
+class SkillVocabulary:
+    """Integer ID space and per-ID weights for skills, certifications and titles"""
+
+    def __init__(self, skill_categories: Dict[str, List[str]], certifications: List[str],
+                 job_titles: List[str], category_importance: Dict[str, str],
+                 aliases: Optional[Dict[str, Dict[str, str]]] = None,
+                 labels: Optional[Dict[str, str]] = None):
+        self.categories = list(skill_categories.keys())
+        self.skills: List[str] = []
+        skill_category_ids = []
+        for category_id, (category, skills) in enumerate(skill_categories.items()):
+            self.skills.extend(skills)
+            skill_category_ids.extend([category_id] * len(skills))
+
+        # Display names for results; canonical names when no label is given
+        labels = labels or {}
+        self.skill_labels = [labels.get(skill, skill) for skill in self.skills]
+        self.skill_category_ids = np.array(skill_category_ids, dtype=np.intp)
+        self.skill_importance = [
+            category_importance.get(self.categories[category_id], "medium")
+            for category_id in skill_category_ids
+        ]
+        self.skill_weights = np.array(
+            [IMPORTANCE_WEIGHTS[importance] for importance in self.skill_importance], dtype=np.float64
+        )
+
+        self.certifications = list(certifications)
+        self.cert_importance = [
+            "high" if any(keyword in cert.lower() for keyword in HIGH_PRIORITY_CERT_KEYWORDS) else "medium"
+            for cert in self.certifications
+        ]
+        self.cert_weights = np.array(
+            [IMPORTANCE_WEIGHTS[importance] for importance in self.cert_importance], dtype=np.float64
+        )
+
+        self.job_titles = list(job_titles)
+
+        # Skills match on word boundaries; certifications and titles on substrings.
+        # ``aliases`` holds one alias -> canonical map per vocabulary.
+        aliases = aliases or {}
+        self.skill_matcher = TermMatcher(self.skills, word_boundary=True,
+                                         aliases=aliases.get("skills"))
+        self.cert_matcher = TermMatcher(self.certifications, word_boundary=False,
+                                        aliases=aliases.get("certifications"))
+        self.title_matcher = TermMatcher(self.job_titles, word_boundary=False,
+                                         aliases=aliases.get("job_titles"))
+
+    def skills_for(self, mask: np.ndarray) -> List[str]:
+        return [self.skills[i] for i in np.flatnonzero(mask)]
+
+@dataclass
+class DocumentProfile:
+    """Bitset representation of one resume or job description"""
+    skills: np.ndarray
+    certifications: np.ndarray
+    titles: np.ndarray
+    years: Optional[int]
+
+@dataclass
+class ProfileMatrix:
+    """Row-stacked profiles for scoring many documents in one call"""
+    skills: np.ndarray          # (n, n_skills) bool
+    certifications: np.ndarray  # (n, n_certs) bool
+    titles: np.ndarray          # (n, n_titles) bool
+    years: np.ndarray           # (n,) float, NaN when not stated
+
+    def __len__(self) -> int:
+        return self.skills.shape[0]
+
+    @classmethod
+    def from_profiles(cls, profiles: Sequence[DocumentProfile], vocabulary: SkillVocabulary) -> "ProfileMatrix":
+        def stack(rows, width):
+            return np.vstack(rows) if rows else np.zeros((0, width), dtype=bool)
+
+        return cls(
+            skills=stack([p.skills for p in profiles], len(vocabulary.skills)),
+            certifications=stack([p.certifications for p in profiles], len(vocabulary.certifications)),
+            titles=stack([p.titles for p in profiles], len(vocabulary.job_titles)),
+            years=np.array([np.nan if p.years is None else p.years for p in profiles], dtype=np.float64),
+        )
+
+@dataclass
+class BatchScores:
+    """Vectorized scores and match masks for n resumes against one job description"""
+    overall_score: np.ndarray
+    skills_score: np.ndarray
+    experience_score: np.ndarray
+    certification_score: np.ndarray
+    experience_matched: np.ndarray
+    matched_skills: np.ndarray    # (n, n_skills) in resume and JD
+    missing_skills: np.ndarray    # (n, n_skills) in JD only
+    matched_certs: np.ndarray     # (n, n_certs) in resume and JD
+    matched_titles: np.ndarray    # (n, n_titles) in resume and JD
+    missing_titles: np.ndarray    # (n, n_titles) in JD only
+
+class ScoringEngine:
+    """Computes match scores over skill bitsets with NumPy operations"""
+
+    def __init__(self, vocabulary: SkillVocabulary, years_extractor: Callable[[str], Optional[int]],
+                 weights: Dict[str, float]):
+        self.vocabulary = vocabulary
+        self.years_extractor = years_extractor
+        self.weights = weights
+
+    def profile(self, text: str) -> DocumentProfile:
+        """Encode a document into skill, certification and title bitsets"""
+        return DocumentProfile(
+            skills=self.vocabulary.skill_matcher.mask(text),
+            certifications=self.vocabulary.cert_matcher.mask(text),
+            titles=self.vocabulary.title_matcher.mask(text),
+            years=self.years_extractor(text),
+        )
+
+    def profile_many(self, texts: Sequence[str]) -> ProfileMatrix:
+        return ProfileMatrix.from_profiles([self.profile(text) for text in texts], self.vocabulary)
+
+    def score(self, resume: DocumentProfile, jd: DocumentProfile) -> BatchScores:
+        """Score a single resume; the result arrays have length one"""
+        return self.score_many(ProfileMatrix.from_profiles([resume], self.vocabulary), jd)
+
+    def score_many(self, resumes: ProfileMatrix, jd: DocumentProfile) -> BatchScores:
+        """Score every row of a resume matrix against one job description"""
+        # Skills: importance-weighted coverage of the JD's skills
+        matched_skills = resumes.skills & jd.skills
+        missing_skills = jd.skills & ~resumes.skills
+        skills_score = self._skills_score(matched_skills, jd)
+
+        # Certifications: importance-weighted coverage, neutral default when none required
+        matched_certs = resumes.certifications & jd.certifications
+        certification_score = self._certification_score(matched_certs, jd)
+
+        # Experience: years requirement (60 points) plus title overlap (40 points)
+        experience_matched, years_points = self._years_points(resumes.years, jd)
+        matched_titles = resumes.titles & jd.titles
+        missing_titles = jd.titles & ~resumes.titles
+        experience_score = np.minimum(100.0, years_points + self._title_points(matched_titles, jd))
+
+        overall_score = self._overall_score(skills_score, experience_score, certification_score)
+
+        return BatchScores(
+            overall_score=overall_score,
+            skills_score=skills_score,
+            experience_score=experience_score,
+            certification_score=certification_score,
+            experience_matched=experience_matched,
+            matched_skills=matched_skills,
+            missing_skills=missing_skills,
+            matched_certs=matched_certs,
+            matched_titles=matched_titles,
+            missing_titles=missing_titles,
+        )
+
+    def screen(self, text: str, jd: DocumentProfile, min_score: float) -> ScreeningOutcome:
+        """Decide whether a resume reaches ``min_score``, stopping as soon as it cannot.
+
+        Components are evaluated in ``SCREENING_STAGES`` order; the ones not
+        evaluated yet count at their maximum, which bounds the achievable
+        overall score from above. Once that bound falls below ``min_score``
+        the rest of the resume is never scanned. A resume that passes is
+        fully evaluated, so its score equals the one ``score`` computes.
+        """
+        points = dict(SCREENING_MAX_POINTS)
+        evaluated = []
+        upper_bound = self._bound(points)
+        for stage in SCREENING_STAGES:
+            points[stage] = self._screen_stage(stage, text, jd)
+            evaluated.append(stage)
+            upper_bound = self._bound(points)
+            # Scores are reported to one decimal, so compare them the same way
+            if round(upper_bound, 1) < min_score:
+                return ScreeningOutcome(passed=False, min_score=min_score, overall_score=None,
+                                        max_possible_score=round(upper_bound, 1), evaluated=evaluated)
+
+        score = round(upper_bound, 1)
+        return ScreeningOutcome(passed=score >= min_score, min_score=min_score, overall_score=score,
+                                max_possible_score=score, evaluated=evaluated)
+
+    def _screen_stage(self, stage: str, text: str, jd: DocumentProfile) -> float:
+        """Points of one screening stage; skips the resume scan when the JD asks for nothing"""
+        vocab = self.vocabulary
+        if stage == "skills":
+            matched = vocab.skill_matcher.mask(text) & jd.skills if jd.skills.any() else jd.skills
+            return float(self._skills_score(matched[np.newaxis], jd)[0])
+        if stage == "certifications":
+            matched = vocab.cert_matcher.mask(text) & jd.certifications if jd.certifications.any() else jd.certifications
+            return float(self._certification_score(matched[np.newaxis], jd)[0])
+        if stage == "titles":
+            matched = vocab.title_matcher.mask(text) & jd.titles if jd.titles.any() else jd.titles
+            return float(self._title_points(matched[np.newaxis], jd)[0])
+        years = self.years_extractor(text) if jd.years else None
+        found = np.array([np.nan if years is None else years], dtype=np.float64)
+        return float(self._years_points(found, jd)[1][0])
+
+    def _bound(self, points: Dict[str, float]) -> float:
+        return float(self._overall_score(
+            np.array([points["skills"]]),
+            np.minimum(100.0, np.array([points["years"] + points["titles"]])),
+            np.array([points["certifications"]]),
+        )[0])
+
+    def _skills_score(self, matched_skills: np.ndarray, jd: DocumentProfile) -> np.ndarray:
+        jd_skill_weight = float(self.vocabulary.skill_weights @ jd.skills)
+        if jd_skill_weight > 0:
+            return (matched_skills @ self.vocabulary.skill_weights) / jd_skill_weight * 100
+        return np.zeros(len(matched_skills))
+
+    def _certification_score(self, matched_certs: np.ndarray, jd: DocumentProfile) -> np.ndarray:
+        jd_cert_weight = float(self.vocabulary.cert_weights @ jd.certifications)
+        if jd_cert_weight > 0:
+            return (matched_certs @ self.vocabulary.cert_weights) / jd_cert_weight * 100
+        return np.full(len(matched_certs), 80.0)
+
+    def _years_points(self, found_years: np.ndarray, jd: DocumentProfile) -> Tuple[np.ndarray, np.ndarray]:
+        """``(requirement met, points out of 60)`` for stated years of experience (NaN when absent)"""
+        has_years = ~np.isnan(found_years)
+        if jd.years:
+            experience_matched = has_years & (np.nan_to_num(found_years) >= jd.years)
+            partial = np.minimum(60.0, np.nan_to_num(found_years) / jd.years * 60)
+            return experience_matched, np.where(experience_matched, 60.0, np.where(has_years, partial, 0.0))
+        return np.ones(len(found_years), dtype=bool), np.full(len(found_years), 60.0)
+
+    def _title_points(self, matched_titles: np.ndarray, jd: DocumentProfile) -> np.ndarray:
+        return matched_titles.sum(axis=1) / max(int(jd.titles.sum()), 1) * 40
+
+    def _overall_score(self, skills_score: np.ndarray, experience_score: np.ndarray,
+                       certification_score: np.ndarray) -> np.ndarray:
+        return (
+            skills_score * self.weights["skills"] +
+            experience_score * self.weights["experience"] +
+            certification_score * self.weights["certifications"]
+        )
@@ -1,18 +1,38 @@
-from typing import Dict, List, Tuple
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
 import logging
-from ..models.schemas import (
-    SkillMatch, ExperienceMatch, CertificationMatch, 
-    MatchBreakdown, DetailedSuggestion, AnalysisResult
+from ..models.results import (
+    SkillMatchResult, ExperienceResult, CertificationResult,
+    BreakdownResult, SuggestionResult, AnalysisOutcome, ScreeningOutcome
 )
 from .nlp_analyzer import NLPAnalyzer
+from .model_registry import get_nlp_analyzer
+from .scoring_engine import BatchScores, DocumentProfile, ScoringEngine, SkillVocabulary
+from .incremental import IncrementalAnalyzer, IncrementalStats
+from .keywords import KeywordEngine, get_keyword_engine
+from .load_control import SCORING_STAGE, SEMANTIC_STAGE, get_load_controller
+from .taxonomy import get_taxonomy
 
 logger = logging.getLogger(__name__)
 
+# Analysis tiers: "fast" scores skill/certification/experience bitsets only;
+# "full" adds the SentenceTransformer stages (skill semantic matches and
+# document-level semantic similarity)
+FAST_TIER = "fast"
+FULL_TIER = "full"
+ANALYSIS_TIERS = (FAST_TIER, FULL_TIER)
+
+# Job description profiles kept for screening many resumes against the same jobs
+JD_PROFILE_CACHE_SIZE = 64
+
 class ScoringService:
     """Service for calculating match scores and generating recommendations"""
     
-    def __init__(self):
-        self.nlp_analyzer = NLPAnalyzer()
+    def __init__(self, nlp_analyzer: Optional[NLPAnalyzer] = None):
+        self.nlp_analyzer = nlp_analyzer or get_nlp_analyzer()
         
         # Scoring weights
         self.weights = {
@@ -21,48 +41,137 @@ class ScoringService:
             "certifications": 0.2
         }
         
-        # Skill importance mapping
-        self.skill_importance = {
-            "programming_languages": "high",
-            "cloud_platforms": "high", 
-            "databases": "medium",
-            "frameworks": "medium",
-            "tools": "medium",
-            "soft_skills": "low",
-            "methodologies": "medium"
-        }
-    
-    def analyze_resume_jd_match(self, resume_text: str, job_description: str) -> AnalysisResult:
-        """Main method to analyze resume-JD match and generate comprehensive results"""
+        # Scoring engine bound to the taxonomy version it was built from
+        self._engine_entry: Optional[Tuple[str, ScoringEngine]] = None
         
-        # Extract skills from both texts
-        resume_skills = self.nlp_analyzer.extract_skills(resume_text)
-        jd_skills = self.nlp_analyzer.extract_skills(job_description)
+        # Per-session section cache for re-submitted resumes
+        self.incremental = IncrementalAnalyzer()
         
-        # Calculate skill matches
-        skill_matches = self._calculate_skill_matches(resume_skills, jd_skills)
-        missing_skills = self._find_missing_skills(resume_skills, jd_skills)
+        # TF-IDF keyword ranking, cached per job description
+        self.keywords: KeywordEngine = get_keyword_engine()
         
-        # Calculate experience match
-        experience_match = self._calculate_experience_match(resume_text, job_description)
+        # (taxonomy version, JD text) -> profile, for screening
+        self._jd_profiles: "OrderedDict[Tuple[str, str], DocumentProfile]" = OrderedDict()
+        self._jd_profiles_lock = threading.Lock()
+    
+    def get_engine(self) -> ScoringEngine:
+        """Return a scoring engine for the taxonomy index currently in service"""
+        return self._current_engine()[1]
+    
+    def _current_engine(self) -> Tuple[str, ScoringEngine]:
+        """Return ``(taxonomy version, engine)``, rebuilding after a taxonomy reload"""
+        index = get_taxonomy()
+        entry = self._engine_entry
+        if entry is None or entry[0] != index.version:
+            engine = ScoringEngine(index.vocabulary, self.nlp_analyzer.extract_experience_years, self.weights)
+            entry = (index.version, engine)
+            self._engine_entry = entry
+        return entry
+    
+    def analyze_resume_jd_match(self, resume_text: str, job_description: str,
+                                tier: str = FULL_TIER) -> AnalysisOutcome:
+        """Main method to analyze resume-JD match and generate comprehensive results.
         
-        # Calculate certification match
-        certification_matches = self._calculate_certification_match(resume_text, job_description)
+        ``tier`` selects the pipeline depth (see ``ANALYSIS_TIERS``); scores
+        are identical in both tiers, only the semantic fields differ.
+        Returns the compact internal result; call ``to_dict()`` on it at the
+        API boundary.
+        """
         
-        # Calculate scores
-        skills_score = self._calculate_skills_score(skill_matches)
-        experience_score = self._calculate_experience_score(experience_match)
-        certification_score = self._calculate_certification_score(certification_matches)
+        # Pin one taxonomy version for the whole analysis
+        engine = self.get_engine()
         
-        # Calculate overall score
-        overall_score = (
-            skills_score * self.weights["skills"] +
-            experience_score * self.weights["experience"] +
-            certification_score * self.weights["certifications"]
-        )
+        # Encode both documents as skill/certification/title bitsets
+        resume_profile = engine.profile(resume_text)
+        jd_profile = engine.profile(job_description)
+        
+        return self._analyze_profiles(engine, resume_text, job_description, resume_profile, jd_profile, tier)
+    
+    def analyze_incremental(self, session_id: str, resume_text: str, job_description: str,
+                            tier: str = FULL_TIER) -> Tuple[AnalysisOutcome, IncrementalStats]:
+        """Analyze a revised resume, re-extracting only the sections that changed.
+        
+        Unchanged sections (and an unchanged job description) reuse the
+        profiles cached for ``session_id``; scores are identical to a full
+        ``analyze_resume_jd_match`` on the same texts. In the full tier the
+        resume's embedding is the length-weighted mean of its section
+        embeddings, so only edited sections are encoded again;
+        ``semantic_similarity`` can therefore differ slightly from encoding
+        the whole text at once.
+        """
+        version, engine = self._current_engine()
+        
+        # Concurrent requests on one session would race on its section cache
+        with self.incremental.locked(session_id, version):
+            resume_profile, stats = self.incremental.profile(session_id, resume_text, engine, version)
+            jd_profile, _ = self.incremental.profile(f"{session_id}:jd", job_description, engine, version)
+            
+            def resume_embedding() -> Optional[np.ndarray]:
+                model = self.nlp_analyzer.sentence_model
+                if model is None:
+                    return None
+                return self.incremental.document_embedding(session_id, resume_text, model.encode, version)
+            
+            outcome = self._analyze_profiles(engine, resume_text, job_description, resume_profile, jd_profile,
+                                             tier, resume_embedding)
+        return outcome, stats
+    
+    def screen_resume(self, resume_text: str, job_description: str, min_score: float) -> ScreeningOutcome:
+        """Decide whether a resume reaches ``min_score`` without a full analysis.
+        
+        Only the scoring rubric is evaluated, cheapest components first, and
+        evaluation stops once the resume can no longer reach the cutoff (see
+        ``ScoringEngine.screen``). Suggestions, ATS keywords and the semantic
+        stages are never computed.
+        """
+        version, engine = self._current_engine()
+        return engine.screen(resume_text, self._jd_profile(version, engine, job_description), min_score)
+    
+    def _jd_profile(self, version: str, engine: ScoringEngine, job_description: str) -> DocumentProfile:
+        key = (version, job_description)
+        with self._jd_profiles_lock:
+            profile = self._jd_profiles.get(key)
+            if profile is not None:
+                self._jd_profiles.move_to_end(key)
+                return profile
+        
+        profile = engine.profile(job_description)
+        with self._jd_profiles_lock:
+            self._jd_profiles[key] = profile
+            while len(self._jd_profiles) > JD_PROFILE_CACHE_SIZE:
+                self._jd_profiles.popitem(last=False)
+        return profile
+    
+    def _analyze_profiles(self, engine: ScoringEngine, resume_text: str, job_description: str,
+                          resume_profile: DocumentProfile, jd_profile: DocumentProfile,
+                          tier: str = FULL_TIER,
+                          resume_embedding: Optional[Callable[[], Optional[np.ndarray]]] = None) -> AnalysisOutcome:
+        """Score precomputed profiles and assemble the analysis result for a tier.
+        
+        ``resume_embedding`` optionally supplies the resume's document
+        embedding for the full tier instead of encoding the whole text.
+        """
+        if tier not in ANALYSIS_TIERS:
+            raise ValueError(f"Unknown analysis tier '{tier}'; expected one of {', '.join(ANALYSIS_TIERS)}")
+        started = time.perf_counter()
+        vocabulary = engine.vocabulary
+        
+        # Calculate all scores with vectorized operations
+        scores = engine.score(resume_profile, jd_profile)
+        
+        # Convert match masks into result objects
+        skill_matches = self._build_skill_matches(vocabulary, scores, 0)
+        missing_skills = self._build_missing_skills(vocabulary, scores, 0)
+        experience_match = self._build_experience_match(vocabulary, scores, 0, resume_profile, jd_profile)
+        certification_matches = self._build_certification_matches(vocabulary, scores, 0, jd_profile)
+        
+        skills_score = float(scores.skills_score[0])
+        experience_score = float(scores.experience_score[0])
+        certification_score = float(scores.certification_score[0])
+        overall_score = float(scores.overall_score[0])
         
         # Generate match breakdown
-        match_breakdown = MatchBreakdown(
+        match_breakdown = BreakdownResult(
             skills_score=round(skills_score, 1),
             experience_score=round(experience_score, 1),
             certification_score=round(certification_score, 1),
@@ -78,19 +187,29 @@ class ScoringService:
         # Extract ATS keywords
         ats_keywords = self._extract_ats_keywords(resume_text, job_description)
         
-        # Find semantic matches
-        all_resume_skills = []
-        all_jd_skills = []
-        for skills_list in resume_skills.values():
-            all_resume_skills.extend(skills_list)
-        for skills_list in jd_skills.values():
-            all_jd_skills.extend(skills_list)
-        
-        semantic_matches = self.nlp_analyzer.find_semantic_matches(
-            all_resume_skills, all_jd_skills
-        )
-        
-        return AnalysisResult(
+        # Stage timings feed the load controller's full-tier latency estimate
+        controller = get_load_controller()
+        semantic_started = time.perf_counter()
+        if controller is not None:
+            controller.observe(SCORING_STAGE, (semantic_started - started) * 1000)
+        
+        # Semantic stages run only in the full tier
+        semantic_matches = []
+        semantic_similarity = None
+        if tier == FULL_TIER:
+            semantic_matches = self.nlp_analyzer.find_semantic_matches(
+                vocabulary.skills_for(resume_profile.skills),
+                vocabulary.skills_for(jd_profile.skills)
+            )
+            semantic_similarity = round(
+                self.nlp_analyzer.calculate_semantic_similarity(
+                    resume_text, job_description, resume_embedding() if resume_embedding else None
+                ) * 100, 1
+            )
+            if controller is not None:
+                controller.observe(SEMANTIC_STAGE, (time.perf_counter() - semantic_started) * 1000)
+        
+        return AnalysisOutcome(
             overall_score=round(overall_score, 1),
             match_breakdown=match_breakdown,
             matched_skills=skill_matches,
@@ -99,156 +218,58 @@ class ScoringService:
             certification_analysis=certification_matches,
             detailed_suggestions=suggestions,
             ats_keywords=ats_keywords,
-            semantic_matches=semantic_matches
+            semantic_matches=semantic_matches,
+            semantic_similarity=semantic_similarity,
+            analysis_method=tier
         )
     
-    def _calculate_skill_matches(self, resume_skills: Dict[str, List[str]], 
-                                jd_skills: Dict[str, List[str]]) -> List[SkillMatch]:
-        """Calculate which skills match between resume and JD"""
-        skill_matches = []
-        
-        for category in resume_skills.keys():
-            resume_category_skills = set(skill.lower() for skill in resume_skills[category])
-            jd_category_skills = set(skill.lower() for skill in jd_skills[category])
-            
-            # Find matches
-            matched = resume_category_skills.intersection(jd_category_skills)
-            
-            for skill in resume_skills[category]:
-                if skill.lower() in matched:
-                    skill_matches.append(SkillMatch(
-                        skill=skill,
-                        matched=True,
-                        importance=self.skill_importance.get(category, "medium"),
-                        found_variations=[skill]
-                    ))
-        
-        return skill_matches
+    def _build_skill_matches(self, vocab: SkillVocabulary, scores: BatchScores,
+                             row: int) -> List[SkillMatchResult]:
+        """List skills present in both resume and JD"""
+        return [
+            SkillMatchResult(
+                skill=vocab.skill_labels[i],
+                matched=True,
+                importance=vocab.skill_importance[i],
+                found_variations=[vocab.skills[i]]
+            )
+            for i in np.flatnonzero(scores.matched_skills[row])
+        ]
     
-    def _find_missing_skills(self, resume_skills: Dict[str, List[str]], 
-                           jd_skills: Dict[str, List[str]]) -> List[str]:
-        """Find skills present in JD but missing from resume"""
-        missing_skills = []
-        
-        for category in jd_skills.keys():
-            resume_category_skills = set(skill.lower() for skill in resume_skills[category])
-            jd_category_skills = set(skill.lower() for skill in jd_skills[category])
-            
-            missing = jd_category_skills - resume_category_skills
-            missing_skills.extend([skill.title() for skill in missing])
-        
-        return missing_skills
+    def _build_missing_skills(self, vocab: SkillVocabulary, scores: BatchScores, row: int) -> List[str]:
+        """List skills present in JD but missing from resume"""
+        return [vocab.skill_labels[i] for i in np.flatnonzero(scores.missing_skills[row])]
     
-    def _calculate_experience_match(self, resume_text: str, job_description: str) -> ExperienceMatch:
-        """Calculate experience match between resume and JD requirements"""
-        
-        # Extract experience years
-        resume_years = self.nlp_analyzer.extract_experience_years(resume_text)
-        jd_years = self.nlp_analyzer.extract_experience_years(job_description)
-        
-        # Extract job titles
-        resume_titles = self.nlp_analyzer.extract_job_titles(resume_text)
-        jd_titles = self.nlp_analyzer.extract_job_titles(job_description)
-        
-        # Find matching job titles
-        matched_titles = list(set(resume_titles).intersection(set(jd_titles)))
-        missing_titles = list(set(jd_titles) - set(resume_titles))
-        
-        # Determine if experience matches
-        experience_matched = True
-        if jd_years and resume_years:
-            experience_matched = resume_years >= jd_years
-        elif jd_years and not resume_years:
-            experience_matched = False
-        
-        return ExperienceMatch(
-            required_years=jd_years,
-            found_years=resume_years,
-            matched=experience_matched,
-            job_titles_matched=matched_titles,
-            missing_job_titles=missing_titles
+    def _build_experience_match(self, vocab: SkillVocabulary, scores: BatchScores, row: int,
+                                resume_profile: DocumentProfile,
+                                jd_profile: DocumentProfile) -> ExperienceResult:
+        """Describe experience match between resume and JD requirements"""
+        titles = vocab.job_titles
+        return ExperienceResult(
+            required_years=jd_profile.years,
+            found_years=resume_profile.years,
+            matched=bool(scores.experience_matched[row]),
+            job_titles_matched=[titles[i] for i in np.flatnonzero(scores.matched_titles[row])],
+            missing_job_titles=[titles[i] for i in np.flatnonzero(scores.missing_titles[row])]
         )
     
-    def _calculate_certification_match(self, resume_text: str, 
-                                     job_description: str) -> List[CertificationMatch]:
-        """Calculate certification matches"""
-        
-        resume_certs = self.nlp_analyzer.extract_certifications(resume_text)
-        jd_certs = self.nlp_analyzer.extract_certifications(job_description)
-        
-        cert_matches = []
-        
-        for cert in jd_certs:
-            matched = cert in resume_certs
-            importance = "high" if any(keyword in cert.lower() 
-                                    for keyword in ["aws", "azure", "google", "pmp"]) else "medium"
-            
-            cert_matches.append(CertificationMatch(
-                certification=cert,
-                matched=matched,
-                importance=importance
-            ))
-        
-        return cert_matches
-    
-    def _calculate_skills_score(self, skill_matches: List[SkillMatch]) -> float:
-        """Calculate overall skills score based on matches"""
-        if not skill_matches:
-            return 0.0
-        
-        total_weight = 0
-        weighted_score = 0
-        
-        for match in skill_matches:
-            weight = {"high": 3, "medium": 2, "low": 1}[match.importance]
-            total_weight += weight
-            if match.matched:
-                weighted_score += weight
-        
-        return (weighted_score / total_weight) * 100 if total_weight > 0 else 0.0
-    
-    def _calculate_experience_score(self, experience_match: ExperienceMatch) -> float:
-        """Calculate experience score"""
-        score = 0.0
-        
-        # Years of experience (60% weight)
-        if experience_match.matched:
-            score += 60
-        elif experience_match.found_years and experience_match.required_years:
-            # Partial credit if close to requirement
-            ratio = experience_match.found_years / experience_match.required_years
-            score += min(60, ratio * 60)
-        
-        # Job title matches (40% weight)
-        if experience_match.job_titles_matched:
-            total_jd_titles = len(experience_match.job_titles_matched) + len(experience_match.missing_job_titles)
-            if total_jd_titles > 0:
-                title_score = (len(experience_match.job_titles_matched) / total_jd_titles) * 40
-                score += title_score
-        
-        return min(100.0, score)
-    
-    def _calculate_certification_score(self, cert_matches: List[CertificationMatch]) -> float:
-        """Calculate certification score"""
-        if not cert_matches:
-            return 80.0  # Default good score if no certifications required
-        
-        total_weight = 0
-        weighted_score = 0
-        
-        for match in cert_matches:
-            weight = {"high": 3, "medium": 2, "low": 1}[match.importance]
-            total_weight += weight
-            if match.matched:
-                weighted_score += weight
-        
-        return (weighted_score / total_weight) * 100 if total_weight > 0 else 0.0
+    def _build_certification_matches(self, vocab: SkillVocabulary, scores: BatchScores, row: int,
+                                     jd_profile: DocumentProfile) -> List[CertificationResult]:
+        """List certifications required by the JD and whether the resume has them"""
+        return [
+            CertificationResult(
+                certification=vocab.certifications[i],
+                matched=bool(scores.matched_certs[row, i]),
+                importance=vocab.cert_importance[i]
+            )
+            for i in np.flatnonzero(jd_profile.certifications)
+        ]
     
-    def _generate_suggestions(self, skill_matches: List[SkillMatch], 
+    def _generate_suggestions(self, skill_matches: List[SkillMatchResult], 
                             missing_skills: List[str],
-                            experience_match: ExperienceMatch,
-                            cert_matches: List[CertificationMatch],
-                            overall_score: float) -> List[DetailedSuggestion]:
+                            experience_match: ExperienceResult,
+                            cert_matches: List[CertificationResult],
+                            overall_score: float) -> List[SuggestionResult]:
         """Generate detailed suggestions for resume improvement"""
         
         suggestions = []
@@ -257,7 +278,7 @@ class ScoringService:
         if missing_skills:
             high_priority_skills = missing_skills[:5]  # Top 5 missing skills
             if high_priority_skills:
-                suggestions.append(DetailedSuggestion(
+                suggestions.append(SuggestionResult(
                     category="skills",
                     suggestion=f"Add these critical missing skills: {', '.join(high_priority_skills)}",
                     priority="high",
@@ -268,14 +289,14 @@ class ScoringService:
         if not experience_match.matched:
             if experience_match.required_years and experience_match.found_years:
                 gap = experience_match.required_years - experience_match.found_years
-                suggestions.append(DetailedSuggestion(
+                suggestions.append(SuggestionResult(
                     category="experience",
                     suggestion=f"You need {gap} more years of experience for this role",
                     priority="high",
                     specific_action="Highlight relevant projects, internships, or freelance work that demonstrate equivalent experience."
                 ))
             elif experience_match.required_years and not experience_match.found_years:
-                suggestions.append(DetailedSuggestion(
+                suggestions.append(SuggestionResult(
                     category="experience",
                     suggestion=f"Clearly state your years of experience (requirement: {experience_match.required_years}+ years)",
                     priority="high",
@@ -283,7 +304,7 @@ class ScoringService:
                 ))
         
         if experience_match.missing_job_titles:
-            suggestions.append(DetailedSuggestion(
+            suggestions.append(SuggestionResult(
                 category="experience",
                 suggestion=f"Consider highlighting experience related to: {', '.join(experience_match.missing_job_titles)}",
                 priority="medium",
@@ -296,7 +317,7 @@ class ScoringService:
             high_priority_certs = [cert for cert in missing_certs if any(keyword in cert.lower() 
                                  for keyword in ["aws", "azure", "google", "pmp"])]
             if high_priority_certs:
-                suggestions.append(DetailedSuggestion(
+                suggestions.append(SuggestionResult(
                     category="certifications",
                     suggestion=f"Consider obtaining these certifications: {', '.join(high_priority_certs)}",
                     priority="medium",
@@ -305,14 +326,14 @@ class ScoringService:
         
         # General ATS suggestions
         if overall_score < 70:
-            suggestions.append(DetailedSuggestion(
+            suggestions.append(SuggestionResult(
                 category="general",
                 suggestion="Your resume needs significant optimization for this job",
                 priority="high",
                 specific_action="Focus on incorporating more relevant keywords, quantifying achievements, and better aligning your experience with job requirements."
             ))
         elif overall_score < 85:
-            suggestions.append(DetailedSuggestion(
+            suggestions.append(SuggestionResult(
                 category="general",
                 suggestion="Good match! Consider minor optimizations for better alignment",
                 priority="low",
@@ -322,32 +343,5 @@ class ScoringService:
         return suggestions
     
     def _extract_ats_keywords(self, resume_text: str, job_description: str) -> Dict[str, bool]:
-        """Extract and check ATS-friendly keywords"""
-        
-        # Common ATS keywords to check
-        ats_keywords = [
-            "managed", "developed", "implemented", "designed", "created", "led", "improved",
-            "optimized", "analyzed", "collaborated", "achieved", "delivered", "maintained",
-            "coordinated", "supervised", "trained", "mentored", "presented", "negotiated"
-        ]
-        
-        resume_lower = resume_text.lower()
-        jd_lower = job_description.lower()
-        
-        keyword_status = {}
-        
-        # Extract important keywords from JD
-        jd_words = set(jd_lower.split())
-        important_jd_words = [word for word in jd_words 
-                            if len(word) > 4 and word not in ["that", "with", "from", "this", "have", "will", "would"]]
-        
-        # Check ATS action words
-        for keyword in ats_keywords:
-            keyword_status[keyword] = keyword in resume_lower
-        
-        # Check important JD words in resume
-        for word in important_jd_words[:10]:  # Top 10 important words
-            if word.isalpha():  # Only alphabetic words
-                keyword_status[word] = word in resume_lower
-        
-        return keyword_status
\ No newline at end of file
+        """Check ATS action verbs and the top TF-IDF-ranked JD terms against the resume"""
+        return self.keywords.check(resume_text, job_description)
\ No newline at end of file
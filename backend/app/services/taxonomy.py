@@ -0,0 +1,214 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+import numpy as np
+import logging
+from .model_bundle import get_model_bundle
+from .scoring_engine import SkillVocabulary
+
+logger = logging.getLogger(__name__)
+
+TAXONOMY_PATH = os.getenv(
+    "TAXONOMY_PATH", os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "taxonomy.json")
+)
+TAXONOMY_RELOAD_INTERVAL = float(os.getenv("TAXONOMY_RELOAD_INTERVAL", "30"))  # seconds, 0 disables
+
+VALID_IMPORTANCE = {"high", "medium", "low"}
+
+class TaxonomyError(ValueError):
+    """Raised when a taxonomy file is malformed"""
+
+class TaxonomyIndex:
+    """One immutable, versioned build of the skill taxonomy.
+
+    Holds the canonical vocabularies, display labels, alias map, the compiled
+    matchers and ID space (``vocabulary``) and the skill embeddings. Callers
+    grab the current index once per request and use it throughout, so a
+    reload never changes the vocabulary under an in-flight analysis.
+    """
+
+    def __init__(self, data: dict, version: str, encoder: Optional[Callable] = None):
+        self.version = version
+        self.loaded_at = datetime.utcnow().isoformat()
+
+        categories = data.get("categories")
+        if not isinstance(categories, dict) or not categories:
+            raise TaxonomyError("Taxonomy must define at least one skill category")
+
+        self.skill_categories: Dict[str, List[str]] = {}
+        self.category_importance: Dict[str, str] = {}
+        self.labels: Dict[str, str] = {}
+        # alias -> canonical name, kept separately for each vocabulary
+        self.aliases: Dict[str, Dict[str, str]] = {"skills": {}, "certifications": {}, "job_titles": {}}
+
+        for category, spec in categories.items():
+            importance = spec.get("importance", "medium")
+            if importance not in VALID_IMPORTANCE:
+                raise TaxonomyError(f"Category '{category}' has invalid importance '{importance}'")
+            self.category_importance[category] = importance
+            self.skill_categories[category] = []
+            for entry in spec.get("skills", []):
+                name = self._register(entry, "skills")
+                self.skill_categories[category].append(name)
+
+        self.certifications = [self._register(entry, "certifications") for entry in data.get("certifications", [])]
+        self.job_titles = [self._register(entry, "job_titles") for entry in data.get("job_titles", [])]
+
+        try:
+            self.experience_patterns = [re.compile(p) for p in data.get("experience_patterns", [])]
+        except re.error as e:
+            raise TaxonomyError(f"Invalid experience pattern: {e}")
+
+        self.all_skills = [skill for skills in self.skill_categories.values() for skill in skills]
+        self.vocabulary = SkillVocabulary(
+            self.skill_categories, self.certifications, self.job_titles, self.category_importance,
+            aliases=self.aliases, labels=self.labels
+        )
+        self.skill_ids = {skill: i for i, skill in enumerate(self.vocabulary.skills)}
+
+        self._embeddings: Optional[np.ndarray] = None
+        self._embeddings_lock = threading.Lock()
+        if encoder is not None:
+            self.skill_embeddings(encoder)
+
+    def _register(self, entry, vocabulary: str) -> str:
+        """Record label and aliases for a vocabulary entry and return its canonical name"""
+        if isinstance(entry, str):
+            entry = {"name": entry}
+        name = entry.get("name", "").strip().lower()
+        if not name:
+            raise TaxonomyError(f"Taxonomy entry without a name: {entry}")
+        self.labels.setdefault(name, entry.get("label", name))
+        for alias in entry.get("aliases", []):
+            self.aliases[vocabulary][alias.strip().lower()] = name
+        return name
+
+    def skill_embeddings(self, encoder: Callable) -> np.ndarray:
+        """Return (and compute once per index) embeddings for every canonical skill"""
+        if self._embeddings is None:
+            with self._embeddings_lock:
+                if self._embeddings is None:
+                    self._embeddings = np.asarray(encoder(self.vocabulary.skills))
+        return self._embeddings
+
+    def use_skill_embeddings(self, embeddings: np.ndarray) -> None:
+        """Adopt precomputed skill embeddings (e.g. memory-mapped from a model bundle)"""
+        if embeddings.shape[0] != len(self.vocabulary.skills):
+            raise TaxonomyError(
+                f"Expected {len(self.vocabulary.skills)} skill embeddings, got {embeddings.shape[0]}"
+            )
+        with self._embeddings_lock:
+            if self._embeddings is None:
+                self._embeddings = embeddings
+
+    def skills_by_category(self) -> Dict[str, List[str]]:
+        """Display labels grouped by category, as served by /skills"""
+        return {
+            category: [self.labels[skill] for skill in skills]
+            for category, skills in self.skill_categories.items()
+        }
+
+def load_taxonomy(path: str, encoder: Optional[Callable] = None,
+                  expected_version: Optional[str] = None) -> TaxonomyIndex:
+    """Read and compile a taxonomy file; the version is a hash of its bytes.
+    
+    Raises ``TaxonomyError`` when ``expected_version`` is given and differs.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    version = hashlib.sha256(raw).hexdigest()[:12]
+    if expected_version is not None and version != expected_version:
+        raise TaxonomyError(f"Taxonomy {path} has version {version}, expected {expected_version}")
+    try:
+        data = json.loads(raw)
+    except json.JSONDecodeError as e:
+        raise TaxonomyError(f"Taxonomy file is not valid JSON: {e}")
+    return TaxonomyIndex(data, version, encoder)
+
+class TaxonomyRegistry:
+    """Holds the current TaxonomyIndex and swaps in rebuilt ones atomically.
+    
+    With ``expected_version`` (a taxonomy shipped in a model bundle) any
+    other version is refused, at startup and on reload.
+    """
+
+    def __init__(self, path: str = TAXONOMY_PATH, expected_version: Optional[str] = None):
+        self.path = path
+        self.expected_version = expected_version
+        self._encoder: Optional[Callable] = None
+        self._reload_lock = threading.Lock()
+        self._stamp = self._file_stamp()
+        self._index = load_taxonomy(path, expected_version=expected_version)
+        logger.info(f"Loaded skill taxonomy {self._index.version} from {path}")
+
+    @property
+    def current(self) -> TaxonomyIndex:
+        return self._index
+
+    def set_encoder(self, encoder: Callable) -> None:
+        """Register the sentence encoder used to precompute skill embeddings"""
+        self._encoder = encoder
+
+    def _file_stamp(self):
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload(self) -> TaxonomyIndex:
+        """Rebuild the index from disk and publish it in one reference swap.
+
+        The new index (matchers and embeddings included) is fully built before
+        the swap; on any error the previous index stays in service.
+        """
+        with self._reload_lock:
+            stamp = self._file_stamp()
+            index = load_taxonomy(self.path, self._encoder, self.expected_version)
+            if index.version != self._index.version:
+                self._index = index
+                logger.info(f"Reloaded skill taxonomy {index.version}")
+            self._stamp = stamp
+            return self._index
+
+    def reload_if_changed(self) -> bool:
+        """Reload when the file changed on disk; returns True if a new version went live"""
+        try:
+            if self._file_stamp() == self._stamp:
+                return False
+            previous = self._index.version
+            return self.reload().version != previous
+        except (OSError, TaxonomyError) as e:
+            logger.error(f"Taxonomy reload failed, keeping version {self._index.version}: {e}")
+            # Do not retry until the file changes again
+            try:
+                self._stamp = self._file_stamp()
+            except OSError:
+                pass
+            return False
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_taxonomy_registry() -> TaxonomyRegistry:
+    """Return the process-wide taxonomy registry.
+    
+    An installed model bundle's taxonomy takes precedence over
+    ``TAXONOMY_PATH``, so the served taxonomy always matches the bundled
+    skill embeddings.
+    """
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                bundle = get_model_bundle()
+                if bundle is not None and bundle.taxonomy_path:
+                    _registry = TaxonomyRegistry(bundle.taxonomy_path, bundle.taxonomy_version)
+                else:
+                    _registry = TaxonomyRegistry()
+    return _registry
+
+def get_taxonomy() -> TaxonomyIndex:
+    """Return the taxonomy index currently in service"""
+    return get_taxonomy_registry().current
@@ -0,0 +1,173 @@
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+TEXT_CACHE_MAX_CHARS = int(os.getenv("TEXT_CACHE_MAX_CHARS", str(50_000_000)))
+TEXT_CACHE_DIR = os.getenv("TEXT_CACHE_DIR")
+TEXT_CACHE_DISK_MAX_MB = int(os.getenv("TEXT_CACHE_DISK_MAX_MB", "500"))
+# Bump whenever extraction or cleaning changes its output, so text cached by
+# an older parser (in memory or on disk) is never served again
+TEXT_PARSER_VERSION = "2"
+
+_DOCUMENT_ID_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+class ExtractedTextCache:
+    """LRU cache of extracted document text keyed by the SHA-256 of the file bytes.
+
+    Entries are stored under the document id plus ``parser_version``, so a
+    parser upgrade misses instead of returning text the old parser produced.
+    The in-memory tier is bounded by total characters. When ``disk_dir`` is
+    set, entries are also written there (bounded by ``disk_max_bytes``,
+    oldest evicted first) so they survive restarts and are visible to every
+    worker process.
+    """
+
+    def __init__(self, max_chars: int = TEXT_CACHE_MAX_CHARS, disk_dir: Optional[str] = TEXT_CACHE_DIR,
+                 disk_max_bytes: int = TEXT_CACHE_DISK_MAX_MB * 1024 * 1024,
+                 parser_version: str = TEXT_PARSER_VERSION):
+        self.max_chars = max_chars
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self.parser_version = parser_version
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._chars = 0
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self._disk_bytes = sum(entry.stat().st_size for entry in os.scandir(disk_dir) if entry.is_file())
+
+    @staticmethod
+    def is_valid_id(document_id: str) -> bool:
+        return bool(document_id and _DOCUMENT_ID_PATTERN.match(document_id))
+
+    def get(self, document_id: str) -> Optional[str]:
+        """Return cached text for a document, checking memory then disk"""
+        if not self.is_valid_id(document_id):
+            return None
+
+        key = self._key(document_id)
+        with self._lock:
+            text = self._entries.get(key)
+            if text is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return text
+
+        text = self._read_disk(key)
+        with self._lock:
+            if text is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store_memory(key, text)
+        return text
+
+    def put(self, document_id: str, text: str) -> None:
+        """Cache text for a document in memory and, if configured, on disk"""
+        if not self.is_valid_id(document_id):
+            raise ValueError(f"Invalid document id: {document_id}")
+
+        key = self._key(document_id)
+        with self._lock:
+            self._store_memory(key, text)
+        self._write_disk(key, text)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "chars": self._chars,
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_bytes": self._disk_bytes,
+            }
+
+    def _key(self, document_id: str) -> str:
+        return f"{document_id}-v{self.parser_version}"
+
+    def _store_memory(self, key: str, text: str) -> None:
+        # Caller holds the lock
+        if len(text) > self.max_chars:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._chars -= len(previous)
+        self._entries[key] = text
+        self._chars += len(text)
+        while self._chars > self.max_chars:
+            _, evicted = self._entries.popitem(last=False)
+            self._chars -= len(evicted)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.txt")
+
+    def _read_disk(self, key: str) -> Optional[str]:
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key), "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Could not read cached text for {key}: {e}")
+            return None
+
+    def _write_disk(self, key: str, text: str) -> None:
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        if os.path.exists(path):
+            return
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write cached text for {key}: {e}")
+            return
+
+        with self._lock:
+            self._disk_bytes += os.path.getsize(path)
+            if self._disk_bytes > self.disk_max_bytes:
+                self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        # Caller holds the lock; remove oldest files until under the cap
+        files = sorted(
+            (entry for entry in os.scandir(self.disk_dir) if entry.name.endswith(".txt")),
+            key=lambda entry: entry.stat().st_mtime,
+        )
+        total = sum(entry.stat().st_size for entry in files)
+        for entry in files:
+            if total <= self.disk_max_bytes * 0.9:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+                total -= size
+            except OSError:
+                continue
+        self._disk_bytes = total
+
+_text_cache = None
+_text_cache_lock = threading.Lock()
+
+def get_text_cache() -> ExtractedTextCache:
+    """Return the process-wide extracted text cache"""
+    global _text_cache
+    if _text_cache is None:
+        with _text_cache_lock:
+            if _text_cache is None:
+                _text_cache = ExtractedTextCache()
+    return _text_cache
@@ -1,66 +1,199 @@
 import pdfplumber
 from docx import Document
 import re
-from typing import Optional, Dict, Any
+import zipfile
+from dataclasses import dataclass
+from xml.etree import ElementTree
+from typing import Optional, Dict, Any, List, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+_CLEAN_TEXT_PATTERN = re.compile(r'[^\w\.\,\-\(\)\+\#\@]+')
+
+# WordprocessingML tags used by the streaming DOCX reader
+_W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_BODY = _W_NS + "body"
+_W_P = _W_NS + "p"
+_W_T = _W_NS + "t"
+_W_TAB = _W_NS + "tab"
+_W_BREAKS = {_W_NS + "br", _W_NS + "cr"}
+_W_TR = _W_NS + "tr"
+_W_TC = _W_NS + "tc"
+
+def _release(body) -> None:
+    """Detach finished top-level blocks so the parsed tree never grows"""
+    if body is not None:
+        body.clear()
+
+# Section header vocabulary. A line is a header only when one of these
+# phrases makes up the whole line (optionally bulleted, and optionally
+# followed by a colon and inline content), so ordinary sentences that
+# mention "work" or "technical" are not mistaken for headers.
+SECTION_HEADERS = {
+    "education": r'education(?:al background)?|academic (?:background|history|qualifications)|qualifications',
+    "experience": r'(?:(?:work|professional|relevant|industry) )?experience|employment(?: history)?'
+                  r'|work history|career history',
+    "skills": r'(?:(?:technical|core|key|professional) )?skills(?: (?:&|and) \w+(?: \w+)?)?'
+              r'|(?:core )?competencies|technical proficiencies|technologies|tech stack',
+    "certifications": r'certifications?(?: (?:&|and) licen[cs]es)?|licen[cs]es(?: (?:&|and) certifications)?'
+                      r'|certificates',
+    "projects": r'(?:(?:personal|selected|key|academic|side) )?projects|portfolio|work samples',
+}
+
+# One alternation classifies every header line in a single scan: the named
+# group that matched is the section, ``inline`` is content after a colon
+_SECTION_HEADER_PATTERN = re.compile(
+    r'^[ \t]*(?:[#*\-\u2022]+[ \t]*)?(?:'
+    + '|'.join(f'(?P<{name}>{pattern})' for name, pattern in SECTION_HEADERS.items())
+    + r')[ \t]*(?::[ \t]*(?P<inline>[^\n]*?))?[ \t]*$',
+    re.IGNORECASE | re.MULTILINE
+)
+
+@dataclass(frozen=True, slots=True)
+class SectionSpan:
+    """Offsets of one document section; ``body_start`` skips the header text"""
+    section: str
+    start: int
+    body_start: int
+    end: int
+
+    def text(self, source: str) -> str:
+        return source[self.start:self.end]
+
+    def body(self, source: str) -> str:
+        return source[self.body_start:self.end]
+
 class TextParser:
     """Service for parsing text from various file formats"""
     
     @staticmethod
-    def extract_text_from_pdf(file_path: str) -> str:
+    def extract_text_from_pdf(file_path: str, max_pages: Optional[int] = None) -> str:
         """Extract text from PDF files using pdfplumber"""
         try:
-            text = ""
+            parts = []
             with pdfplumber.open(file_path) as pdf:
+                if max_pages and len(pdf.pages) > max_pages:
+                    raise ValueError(f"PDF has {len(pdf.pages)} pages; the maximum is {max_pages}")
                 for page in pdf.pages:
                     page_text = page.extract_text()
                     if page_text:
-                        text += page_text + "\n"
-            return text.strip()
+                        parts.append(page_text)
+                    # Release parsed layout objects so only one page is held at a time
+                    page.flush_cache()
+            return "\n".join(parts).strip()
         except Exception as e:
             logger.error(f"Error extracting text from PDF: {str(e)}")
             raise ValueError(f"Failed to extract text from PDF: {str(e)}")
     
     @staticmethod
     def extract_text_from_docx(file_path: str) -> str:
-        """Extract text from DOCX files using python-docx"""
+        """Extract text from DOCX files, preferring the streaming XML reader"""
+        try:
+            return TextParser.extract_text_from_docx_xml(file_path)
+        except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as e:
+            logger.warning(f"Streaming DOCX extraction failed, falling back to python-docx: {str(e)}")
+        
         try:
             doc = Document(file_path)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
+            parts = [paragraph.text for paragraph in doc.paragraphs]
             
             # Also extract text from tables
             for table in doc.tables:
                 for row in table.rows:
-                    for cell in row.cells:
-                        text += cell.text + " "
-                    text += "\n"
+                    parts.append(" ".join(cell.text for cell in row.cells))
                     
-            return text.strip()
+            return "\n".join(parts).strip()
         except Exception as e:
             logger.error(f"Error extracting text from DOCX: {str(e)}")
             raise ValueError(f"Failed to extract text from DOCX: {str(e)}")
     
+    @staticmethod
+    def extract_text_from_docx_xml(file_path: str) -> str:
+        """Stream text out of word/document.xml without building an object model.
+        
+        Paragraphs and tables are emitted in document order: one line per
+        body paragraph and one line per table row, with cells separated by
+        spaces. Finished blocks are detached from the tree as soon as they
+        are consumed, so memory stays flat regardless of document size.
+        """
+        lines = []
+        paragraph = []
+        # Stacks of open table rows (cell texts so far) and open cells
+        # (paragraph texts so far); nesting depth follows nested tables
+        rows = []
+        cells = []
+        body = None
+        
+        with zipfile.ZipFile(file_path) as archive:
+            with archive.open("word/document.xml") as document:
+                for event, elem in ElementTree.iterparse(document, events=("start", "end")):
+                    tag = elem.tag
+                    if event == "start":
+                        if tag == _W_BODY:
+                            body = elem
+                        elif tag == _W_TR:
+                            rows.append([])
+                        elif tag == _W_TC:
+                            cells.append([])
+                        continue
+                    
+                    if tag == _W_T:
+                        if elem.text:
+                            paragraph.append(elem.text)
+                    elif tag == _W_TAB:
+                        paragraph.append("\t")
+                    elif tag in _W_BREAKS:
+                        paragraph.append("\n")
+                    elif tag == _W_P:
+                        text = "".join(paragraph)
+                        paragraph = []
+                        if cells:
+                            cells[-1].append(text)
+                        else:
+                            lines.append(text)
+                            _release(body)
+                    elif tag == _W_TC:
+                        rows[-1].append("\n".join(cells.pop()))
+                        elem.clear()
+                    elif tag == _W_TR:
+                        row_text = " ".join(rows.pop())
+                        # Rows of nested tables become paragraphs of the enclosing cell
+                        if cells:
+                            cells[-1].append(row_text)
+                        else:
+                            lines.append(row_text)
+                            _release(body)
+        
+        return "\n".join(lines).strip()
+    
+    @staticmethod
+    def extract_text(source, file_ext: str, max_pages: Optional[int] = None) -> str:
+        """Extract text from a file path or binary stream, dispatching on extension"""
+        file_ext = file_ext.lower()
+        if file_ext == ".txt":
+            if isinstance(source, str):
+                with open(source, "rb") as f:
+                    data = f.read()
+            else:
+                data = source.read()
+            # Section headers are matched per line, so Windows line endings must go
+            return data.decode("utf-8", errors="replace").replace("\r\n", "\n")
+        if file_ext == ".pdf":
+            return TextParser.extract_text_from_pdf(source, max_pages=max_pages)
+        if file_ext in (".docx", ".doc"):
+            return TextParser.extract_text_from_docx(source)
+        raise ValueError(f"Unsupported file type: {file_ext}")
+    
     @staticmethod
     def clean_text(text: str) -> str:
         """Clean and normalize extracted text"""
         if not text:
             return ""
-            
-        # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove special characters but keep important punctuation
-        text = re.sub(r'[^\w\s\.\,\-\(\)\+\#\@]', ' ', text)
         
-        # Normalize spacing
-        text = re.sub(r'\s+', ' ', text)
-        
-        return text.strip()
+        # Collapse every run of whitespace and unsupported characters into a
+        # single space in one pass (keeps important punctuation)
+        return _CLEAN_TEXT_PATTERN.sub(' ', text).strip()
     
     @staticmethod
     def extract_contact_info(text: str) -> Dict[str, Optional[str]]:
@@ -99,7 +232,41 @@ class TextParser:
         return contact_info
     
     @staticmethod
-    def extract_sections(text: str) -> Dict[str, str]:
+    def section_spans(text: str) -> List[SectionSpan]:
+        """Segment text into contiguous section spans in one pass.
+        
+        The spans cover the whole text in order; anything before the first
+        header is returned as section ``"header"``. Offsets index into
+        ``text``, so callers slice only the sections they need.
+        """
+        spans = []
+        section, start, body_start = "header", 0, 0
+        
+        for match in _SECTION_HEADER_PATTERN.finditer(text):
+            if match.start() > start:
+                spans.append(SectionSpan(section, start, body_start, match.start()))
+            section = next(name for name in SECTION_HEADERS if match.start(name) >= 0)
+            start = match.start()
+            inline_start = match.start("inline")
+            body_start = inline_start if inline_start >= 0 else match.end()
+        
+        if len(text) > start or not spans:
+            spans.append(SectionSpan(section, start, body_start, len(text)))
+        
+        return spans
+    
+    @staticmethod
+    def split_sections(text: str) -> List[Tuple[str, str]]:
+        """Split text into ordered (section, content) segments covering every line"""
+        return [(span.section, span.text(text)) for span in TextParser.section_spans(text)]
+    
+    @staticmethod
+    def section_text(text: str, spans: List[SectionSpan], section: str) -> str:
+        """Bodies of every span of one section joined together (empty if absent)"""
+        return '\n'.join(span.body(text) for span in spans if span.section == section)
+    
+    @staticmethod
+    def extract_sections(text: str, spans: Optional[List[SectionSpan]] = None) -> Dict[str, str]:
         """Extract different sections from resume text"""
         sections = {
             "education": "",
@@ -109,42 +276,11 @@ class TextParser:
             "projects": ""
         }
         
-        # Common section headers patterns
-        patterns = {
-            "education": r'(education|academic|qualification|degree)',
-            "experience": r'(experience|employment|work|career|professional)',
-            "skills": r'(skills|technical|competenc|technolog)',
-            "certifications": r'(certification|certificate|license)',
-            "projects": r'(projects|portfolio|work samples)'
-        }
-        
-        text_lower = text.lower()
-        lines = text.split('\n')
-        
-        current_section = None
-        section_content = []
-        
-        for line in lines:
-            line_lower = line.strip().lower()
-            if not line_lower:
-                continue
-                
-            # Check if line is a section header
-            section_found = False
-            for section, pattern in patterns.items():
-                if re.search(pattern, line_lower) and len(line_lower) < 50:
-                    if current_section and section_content:
-                        sections[current_section] = '\n'.join(section_content)
-                    current_section = section
-                    section_content = []
-                    section_found = True
-                    break
-            
-            if not section_found and current_section:
-                section_content.append(line.strip())
+        if spans is None:
+            spans = TextParser.section_spans(text)
         
-        # Add the last section
-        if current_section and section_content:
-            sections[current_section] = '\n'.join(section_content)
+        for section in sections:
+            body = TextParser.section_text(text, spans, section)
+            sections[section] = '\n'.join(line.strip() for line in body.split('\n') if line.strip())
         
         return sections
\ No newline at end of file
@@ -0,0 +1,55 @@
+import asyncio
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+def content_key(*parts: Optional[str]) -> str:
+    """Hash request fields into a coalescing key; ``None`` and ``""`` are distinct"""
+    digest = hashlib.sha256()
+    for part in parts:
+        if part is None:
+            digest.update(b"\x00")
+        else:
+            encoded = part.encode("utf-8")
+            digest.update(len(encoded).to_bytes(8, "little"))
+            digest.update(encoded)
+    return digest.hexdigest()
+
+class SingleFlight:
+    """Share one in-flight computation among concurrent callers with the same key.
+
+    The first caller for a key starts the computation as its own task;
+    callers arriving before it finishes await that task instead of starting
+    another. Each caller awaits through ``asyncio.shield``, so a client that
+    disconnects cancels only its own wait, never the shared work. The key is
+    forgotten as soon as the task finishes: only concurrent calls coalesce,
+    and nothing is cached.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, "asyncio.Task[Any]"] = {}
+        self.shared = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Return ``(result, shared)``; ``shared`` is True for callers that joined an existing call"""
+        task = self._calls.get(key)
+        shared = task is not None
+        if shared:
+            self.shared += 1
+        else:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task), shared
+
+    def _finish(self, key: str, task: "asyncio.Task[Any]") -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception retrieved in case every waiter was cancelled
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"Coalesced call failed: {task.exception()!r}")
+
+    def __len__(self) -> int:
+        return len(self._calls)
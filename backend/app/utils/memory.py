@@ -0,0 +1,115 @@
+import os
+import sys
+import resource
+from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Memory budget configuration (all overridable through the environment)
+MEMORY_BUDGET_MB = int(os.getenv("MEMORY_BUDGET_MB", "0"))  # 0 disables budget checks
+MAX_TEXT_CHARS = int(os.getenv("MAX_TEXT_CHARS", "200000"))
+TEXT_OVERFLOW_MODE = os.getenv("TEXT_OVERFLOW_MODE", "truncate")  # truncate | sample | reject
+MAX_PDF_PAGES = int(os.getenv("MAX_PDF_PAGES", "50"))
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Rough peak-memory multipliers over the raw file size while extracting text
+EXTRACTION_COST_FACTORS = {
+    ".pdf": 25,
+    ".docx": 12,
+    ".doc": 12,
+    ".txt": 6,
+}
+
+class MemoryBudgetExceeded(Exception):
+    """Raised when a document cannot be processed within the memory budget"""
+
+def current_rss() -> int:
+    """Return the current resident set size of this process in bytes"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return peak_rss()
+
+def peak_rss() -> int:
+    """Return the peak resident set size of this process in bytes"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes on Linux
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def budget_bytes() -> Optional[int]:
+    """Return the configured budget in bytes, or None when disabled"""
+    return MEMORY_BUDGET_MB * 1024 * 1024 if MEMORY_BUDGET_MB > 0 else None
+
+def estimate_processing_cost(file_size: int, file_ext: str) -> int:
+    """Estimate the extra memory needed to extract and analyze a document"""
+    return file_size * EXTRACTION_COST_FACTORS.get(file_ext.lower(), 12)
+
+def check_budget(file_size: int, file_ext: str) -> None:
+    """Reject a document early if processing it would exceed the budget"""
+    budget = budget_bytes()
+    if budget is None:
+        return
+
+    projected = current_rss() + estimate_processing_cost(file_size, file_ext)
+    if projected > budget:
+        raise MemoryBudgetExceeded(
+            f"Processing this {file_size // 1024}KB {file_ext or 'file'} would need about "
+            f"{projected // (1024 * 1024)}MB, over the {MEMORY_BUDGET_MB}MB memory budget."
+        )
+
+def limit_text(text: str, max_chars: int = None, mode: str = None) -> str:
+    """Bound text length before NLP.
+
+    ``truncate`` keeps the head of the document, ``sample`` keeps evenly spaced
+    windows across the whole document and ``reject`` raises instead.
+    """
+    max_chars = max_chars or MAX_TEXT_CHARS
+    mode = mode or TEXT_OVERFLOW_MODE
+    if len(text) <= max_chars:
+        return text
+
+    if mode == "reject":
+        raise MemoryBudgetExceeded(
+            f"Document has {len(text)} characters; the maximum is {max_chars}."
+        )
+
+    if mode == "sample":
+        windows = 8
+        window = max_chars // windows
+        stride = (len(text) - window) / (windows - 1)
+        parts = [text[int(i * stride):int(i * stride) + window] for i in range(windows)]
+        logger.info(f"Sampled {windows} windows from {len(text)} characters")
+        return "\n".join(parts)
+
+    logger.info(f"Truncated text from {len(text)} to {max_chars} characters")
+    return text[:max_chars]
+
+class RequestMemoryTracker:
+    """Measure RSS growth and process peak RSS across one request"""
+
+    def __init__(self):
+        self.start_rss = 0
+        self.start_peak = 0
+        self.end_rss = 0
+        self.end_peak = 0
+
+    def __enter__(self):
+        self.start_rss = current_rss()
+        self.start_peak = peak_rss()
+        return self
+
+    def __exit__(self, *exc):
+        self.end_rss = current_rss()
+        self.end_peak = peak_rss()
+        return False
+
+    @property
+    def peak_growth(self) -> int:
+        """Bytes by which this request raised the process high-water mark"""
+        return max(0, self.end_peak - self.start_peak)
+
+    @property
+    def rss_delta(self) -> int:
+        return self.end_rss - self.start_rss
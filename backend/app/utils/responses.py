@@ -0,0 +1,50 @@
+from typing import Any
+import dataclasses
+import json
+import logging
+from fastapi.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+    logger.warning("orjson not installed; falling back to the standard JSON encoder")
+
+def _default(value: Any) -> Any:
+    """Encode types orjson does not handle natively"""
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+def dumps_json(content: Any) -> bytes:
+    """Serialize results (dicts, dataclasses, NumPy values) to compact JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
+    if dataclasses.is_dataclass(content):
+        content = dataclasses.asdict(content)
+    return json.dumps(content, default=_default, separators=(",", ":")).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson.
+
+    Serializes dicts, slotted dataclasses, NumPy arrays/scalars and Pydantic
+    models directly. As the app's default response class it only replaces
+    the final encoding step: a handler that returns a plain dict still goes
+    through FastAPI's ``jsonable_encoder`` first. Hot endpoints therefore
+    return a ``FastJSONResponse`` instance, which FastAPI sends as is.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return dumps_json(content)
+        if dataclasses.is_dataclass(content):
+            content = dataclasses.asdict(content)
+        return super().render(content)
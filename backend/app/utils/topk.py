@@ -0,0 +1,58 @@
+import heapq
+from typing import Generic, Iterator, List, Optional, Tuple, TypeVar
+import logging
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+class TopK(Generic[T]):
+    """The ``k`` highest-scoring items of a stream, in O(k) memory.
+
+    Items are kept in a min-heap whose root is the weakest candidate still
+    ranked, so each push costs O(log k) and an item that does not beat the
+    root is dropped immediately. Ties keep the item that arrived first.
+    Once the heap is full, ``threshold`` is the score a new item must exceed
+    to be ranked; producers can use it to skip work on items that cannot
+    make the cut.
+    """
+
+    def __init__(self, k: int):
+        if k <= 0:
+            raise ValueError("k must be positive")
+        self.k = k
+        self.seen = 0
+        # (score, -arrival, item): the root is the lowest score, latest arrival among ties
+        self._heap: List[Tuple[float, int, T]] = []
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __iter__(self) -> Iterator[T]:
+        """Ranked items in no particular order"""
+        return (item for _, _, item in self._heap)
+
+    @property
+    def threshold(self) -> Optional[float]:
+        """Score to beat, or None while fewer than ``k`` items are ranked"""
+        return self._heap[0][0] if len(self._heap) >= self.k else None
+
+    def push(self, score: float, item: T) -> bool:
+        """Offer an item; returns whether it is ranked (for now)"""
+        return self.pushpop(score, item) is not item
+
+    def pushpop(self, score: float, item: T) -> Optional[T]:
+        """Offer an item; returns the item that left the ranking (the offered one if
+        it did not make it), or None when the ranking just grew"""
+        self.seen += 1
+        entry = (score, -self.seen, item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+            return None
+        if score <= self._heap[0][0]:
+            return item
+        return heapq.heapreplace(self._heap, entry)[2]
+
+    def ranked(self) -> List[Tuple[float, T]]:
+        """``(score, item)`` pairs, best first"""
+        return [(score, item) for score, _, item in sorted(self._heap, key=lambda entry: (-entry[0], -entry[1]))]
@@ -0,0 +1,40 @@
+"""Gunicorn configuration for multi-worker serving with shared model memory.
+
+Run from the ``backend`` directory::
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+With ``preload_app`` the master imports ``app.main`` (and, through
+PRELOAD_MODELS, loads spaCy and SentenceTransformer) before forking, so the
+model weights are shared copy-on-write instead of loaded once per worker.
+Set PRELOAD_MODELS=0 to fall back to per-worker loading.
+"""
+import multiprocessing
+import os
+
+os.environ.setdefault("PRELOAD_MODELS", "1")
+
+bind = os.getenv("BIND", f"0.0.0.0:{os.getenv('API_PORT', '8000')}")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = os.environ["PRELOAD_MODELS"] == "1"
+timeout = 120
+graceful_timeout = 30
+keepalive = 5
+
+def post_fork(server, worker):
+    # Split the cores between workers so torch thread pools do not oversubscribe.
+    # Models are only loaded (never run) in the master, so no OpenMP pool exists
+    # yet when we fork.
+    threads = max(1, multiprocessing.cpu_count() // workers)
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+def post_worker_init(worker):
+    # Without preloading, load models at worker boot rather than on the first request
+    if not preload_app:
+        from app.services.model_registry import preload_models
+        preload_models(freeze=False)
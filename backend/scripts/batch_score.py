@@ -0,0 +1,492 @@
+"""Score an archive of resumes against one or more job descriptions offline.
+
+Resumes are streamed from a ZIP file or a directory tree and scored in
+batches across a process pool: each batch is profiled once into skill
+bitsets and scored against every job description with the vectorized
+``ScoringEngine``. Results are written as JSON Lines or as a directory of
+Parquet part files.
+
+Progress is checkpointed to ``<output>.checkpoint`` after every write, so
+an interrupted run picks up where it stopped when started again with the
+same arguments. A crash between writing results and recording them can
+repeat a batch; rows carry ``document_id`` (SHA-256 of the file bytes) for
+de-duplication.
+
+With ``--top-k N`` only the N best-scoring resumes per job description are
+kept, in bounded heaps, and the output is rewritten with the current
+ranking after every batch. Workers are told the score each job's ranking
+currently requires and drop weaker resumes before building their rows, so
+memory stays constant however large the archive is.
+
+Resumes whose cleaned text (near-)duplicates one already seen by the same
+worker are flagged with ``duplicate_of``; ``--skip-duplicates`` writes only
+the flag for them instead of scoring them again.
+
+Run from the ``backend`` directory::
+
+    python -m scripts.batch_score resumes.zip --jd jobs/ --output results.jsonl
+    python -m scripts.batch_score resumes/ --jd backend.txt --jd data.txt \\
+        --output results.parquet --workers 8 --detailed
+    python -m scripts.batch_score resumes.zip --jd backend.txt --output top50.jsonl --top-k 50
+"""
+import argparse
+import hashlib
+import io
+import json
+import logging
+import multiprocessing
+import os
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
+
+logger = logging.getLogger("batch_score")
+
+SUPPORTED_EXTENSIONS = {".pdf", ".docx", ".doc", ".txt"}
+
+# (name, payload): payload is the member's bytes for ZIP input, or a file path
+DocumentTask = Tuple[str, Union[bytes, str]]
+
+def iter_documents(source: str) -> Iterator[DocumentTask]:
+    """Yield supported resumes from a ZIP archive or directory tree, one at a time"""
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for filename in sorted(files):
+                if os.path.splitext(filename)[1].lower() in SUPPORTED_EXTENSIONS:
+                    path = os.path.join(root, filename)
+                    yield os.path.relpath(path, source), path
+        return
+
+    with zipfile.ZipFile(source) as archive:
+        for info in archive.infolist():
+            if info.is_dir() or os.path.splitext(info.filename)[1].lower() not in SUPPORTED_EXTENSIONS:
+                continue
+            yield info.filename, archive.read(info)
+
+def iter_batches(tasks: Iterator[DocumentTask], size: int, done: Set[str]) -> Iterator[List[DocumentTask]]:
+    batch = []
+    for task in tasks:
+        if task[0] in done:
+            continue
+        batch.append(task)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def load_job_descriptions(paths: List[str]) -> List[Tuple[str, str]]:
+    """Read (job_id, text) pairs from files or directories of files"""
+    from app.services.text_parser import TextParser
+
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(
+                os.path.join(path, name) for name in sorted(os.listdir(path))
+                if os.path.splitext(name)[1].lower() in SUPPORTED_EXTENSIONS
+            )
+        else:
+            files.append(path)
+
+    jobs = []
+    for path in files:
+        job_id, ext = os.path.splitext(os.path.basename(path))
+        text = TextParser.extract_text(path, ext)
+        if not text.strip():
+            raise ValueError(f"Job description {path} is empty")
+        jobs.append((job_id, text))
+    return jobs
+
+class Checkpoint:
+    """Append-only list of finished document names"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.done: Set[str] = set()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.done = {line.rstrip("\n") for line in f if line.strip()}
+
+    def mark(self, names: List[str]) -> None:
+        if not names:
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.writelines(f"{name}\n" for name in names)
+            f.flush()
+            os.fsync(f.fileno())
+        self.done.update(names)
+
+class JsonlWriter:
+    """Appends one JSON object per row; every write is durable before checkpointing"""
+
+    def __init__(self, path: str):
+        self._file = open(path, "a", encoding="utf-8")
+
+    def write(self, rows: List[Dict]) -> None:
+        self._file.writelines(json.dumps(row) + "\n" for row in rows)
+
+    def flush_due(self) -> bool:
+        return True
+
+    def flush(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        self.flush()
+        self._file.close()
+
+class ParquetWriter:
+    """Buffers rows and writes them as numbered part files in a directory"""
+
+    def __init__(self, path: str, rows_per_part: int):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise SystemExit("Parquet output requires pyarrow (pip install pyarrow)")
+        self.path = path
+        self.rows_per_part = rows_per_part
+        self._rows: List[Dict] = []
+        os.makedirs(path, exist_ok=True)
+        self._next_part = len([name for name in os.listdir(path) if name.endswith(".parquet")])
+
+    def write(self, rows: List[Dict]) -> None:
+        for row in rows:
+            # Nested analysis results are stored as JSON strings
+            if "analysis" in row:
+                row = {**row, "analysis": json.dumps(row["analysis"])}
+            self._rows.append(row)
+
+    def flush_due(self) -> bool:
+        return len(self._rows) >= self.rows_per_part
+
+    def flush(self) -> None:
+        if not self._rows:
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        part_path = os.path.join(self.path, f"part-{self._next_part:05d}.parquet")
+        tmp_path = part_path + ".tmp"
+        pq.write_table(pa.Table.from_pylist(self._rows), tmp_path)
+        os.replace(tmp_path, part_path)
+        self._next_part += 1
+        self._rows = []
+
+    def close(self) -> None:
+        self.flush()
+
+class TopKWriter:
+    """Keeps the ``k`` best rows per job and rewrites them as JSON Lines when they change.
+
+    An existing output file is loaded back into the rankings, so an
+    interrupted run resumes with the ranking it had written.
+    """
+
+    def __init__(self, path: str, k: int):
+        from app.utils.topk import TopK
+
+        self.path = path
+        self._new_ranking = lambda: TopK(k)
+        self._rankings: Dict[str, "TopK[Dict]"] = {}
+        # Documents currently ranked per job, kept in step with the heaps
+        self._ranked_documents: Dict[str, Set[str]] = {}
+        self._changed = False
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.write([json.loads(line) for line in f if line.strip()])
+            self._changed = False
+
+    def write(self, rows: List[Dict]) -> None:
+        for row in rows:
+            if row["overall_score"] is None:
+                continue
+            ranking = self._rankings.get(row["job_id"])
+            if ranking is None:
+                ranking = self._rankings[row["job_id"]] = self._new_ranking()
+                self._ranked_documents[row["job_id"]] = set()
+            ranked_documents = self._ranked_documents[row["job_id"]]
+            # A batch repeated after a crash must not rank the same resume twice
+            if row["document"] in ranked_documents:
+                continue
+            dropped = ranking.pushpop(row["overall_score"], row)
+            if dropped is row:
+                continue
+            ranked_documents.add(row["document"])
+            if dropped is not None:
+                ranked_documents.discard(dropped["document"])
+            self._changed = True
+
+    def thresholds(self) -> Dict[str, float]:
+        """Per job, the score a resume must exceed to be ranked (jobs with full rankings only)"""
+        return {job_id: ranking.threshold for job_id, ranking in self._rankings.items()
+                if ranking.threshold is not None}
+
+    def flush_due(self) -> bool:
+        return True
+
+    def flush(self) -> None:
+        if not self._changed:
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for ranking in self._rankings.values():
+                for rank, (_, row) in enumerate(ranking.ranked(), 1):
+                    f.write(json.dumps({**row, "rank": rank}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._changed = False
+
+    def close(self) -> None:
+        self.flush()
+
+# Per-process state, set up by init_worker
+_service = None
+_jobs: List[Tuple[str, str, object]] = []
+_detailed = False
+_duplicates = None
+_skip_duplicates = False
+
+def init_worker(jobs: List[Tuple[str, str]], detailed: bool, threads: int, skip_duplicates: bool) -> None:
+    """Bind the shared ScoringService and profile every job description once"""
+    global _service, _jobs, _detailed, _duplicates, _skip_duplicates
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+    from app.services.dedup import DuplicateIndex
+    from app.services.model_registry import get_scoring_service
+
+    _service = get_scoring_service()
+    engine = _service.get_engine()
+    _jobs = [(job_id, text, engine.profile(text)) for job_id, text in jobs]
+    _detailed = detailed
+    # Each worker indexes the documents it has seen
+    _duplicates = DuplicateIndex()
+    _skip_duplicates = skip_duplicates
+
+def extract_document(name: str, payload: Union[bytes, str]) -> Tuple[str, str]:
+    """Return (document_id, bounded text), using the shared extracted-text cache"""
+    from app.services.text_cache import get_text_cache
+    from app.services.text_parser import TextParser
+    from app.utils.memory import MAX_PDF_PAGES, limit_text
+
+    if isinstance(payload, str):
+        with open(payload, "rb") as f:
+            payload = f.read()
+    document_id = hashlib.sha256(payload).hexdigest()
+
+    text_cache = get_text_cache()
+    text = text_cache.get(document_id)
+    if text is None:
+        ext = os.path.splitext(name)[1]
+        text = TextParser.extract_text(io.BytesIO(payload), ext, max_pages=MAX_PDF_PAGES)
+        if text.strip():
+            text_cache.put(document_id, text)
+    return document_id, limit_text(text)
+
+def empty_row(name: str, document_id: str = None, job_id: str = None) -> Dict:
+    """Row with every column present, so Parquet parts share one schema"""
+    return {
+        "document": name,
+        "document_id": document_id,
+        "job_id": job_id,
+        "overall_score": None,
+        "skills_score": None,
+        "experience_score": None,
+        "certification_score": None,
+        "experience_matched": None,
+        "matched_skills": [],
+        "missing_skills": [],
+        "duplicate_of": None,
+        "duplicate_similarity": None,
+        "error": None,
+    }
+
+def score_batch(batch: List[DocumentTask],
+                thresholds: Optional[Dict[str, float]] = None) -> Tuple[List[str], List[Dict]]:
+    """Extract, profile and score one batch against every job description.
+
+    With ``thresholds`` (``--top-k``), resumes scoring at or below their
+    job's threshold cannot be ranked and get no row.
+    """
+    thresholds = thresholds or {}
+    engine = _service.get_engine()
+    vocabulary = engine.vocabulary
+    rows: List[Dict] = []
+    names, document_ids, texts, duplicates = [], [], [], []
+
+    for name, payload in batch:
+        try:
+            document_id, text = extract_document(name, payload)
+            if not text.strip():
+                raise ValueError("no text could be extracted")
+        except Exception as e:
+            rows.append({**empty_row(name), "error": str(e)})
+            continue
+
+        duplicate = _duplicates.check_and_add(document_id, text)
+        if duplicate is not None and _skip_duplicates:
+            rows.append({**empty_row(name, document_id), "duplicate_of": duplicate.document_id,
+                         "duplicate_similarity": duplicate.similarity})
+            continue
+        names.append(name)
+        document_ids.append(document_id)
+        texts.append(text)
+        duplicates.append(duplicate)
+
+    if texts:
+        matrix = engine.profile_many(texts)
+        for job_id, job_text, job_profile in _jobs:
+            scores = engine.score_many(matrix, job_profile)
+            threshold = thresholds.get(job_id)
+            for row_index, name in enumerate(names):
+                overall_score = round(float(scores.overall_score[row_index]), 1)
+                if threshold is not None and overall_score <= threshold:
+                    continue
+                duplicate = duplicates[row_index]
+                row = {
+                    **empty_row(name, document_ids[row_index], job_id),
+                    "overall_score": overall_score,
+                    "skills_score": round(float(scores.skills_score[row_index]), 1),
+                    "experience_score": round(float(scores.experience_score[row_index]), 1),
+                    "certification_score": round(float(scores.certification_score[row_index]), 1),
+                    "experience_matched": bool(scores.experience_matched[row_index]),
+                    "matched_skills": vocabulary.skills_for(scores.matched_skills[row_index]),
+                    "missing_skills": vocabulary.skills_for(scores.missing_skills[row_index]),
+                }
+                if duplicate is not None:
+                    row["duplicate_of"] = duplicate.document_id
+                    row["duplicate_similarity"] = duplicate.similarity
+                if _detailed:
+                    row["analysis"] = _service.analyze_resume_jd_match(texts[row_index], job_text).to_dict()
+                rows.append(row)
+
+    return [name for name, _ in batch], rows
+
+def run(args) -> Dict:
+    jobs = load_job_descriptions(args.jd)
+    checkpoint = Checkpoint(args.checkpoint or f"{args.output.rstrip(os.sep)}.checkpoint")
+    output_format = args.format or ("parquet" if args.output.endswith(".parquet") else "jsonl")
+    if args.top_k:
+        if output_format != "jsonl":
+            raise SystemExit("--top-k writes JSON Lines output")
+        writer = TopKWriter(args.output, args.top_k)
+    elif output_format == "parquet":
+        writer = ParquetWriter(args.output, args.rows_per_part)
+    else:
+        writer = JsonlWriter(args.output)
+
+    workers = args.workers or os.cpu_count() or 1
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    context = None
+    if "fork" in multiprocessing.get_all_start_methods():
+        # Load models once here so forked workers share them copy-on-write
+        from app.services.model_registry import get_scoring_service, preload_models
+        preload_models()
+        get_scoring_service()
+        context = multiprocessing.get_context("fork")
+
+    skipped = len(checkpoint.done)
+    processed = failed = duplicates = rows_written = 0
+    pending: List[str] = []
+    start = time.perf_counter()
+    last_report = start
+
+    batches = iter_batches(iter_documents(args.input), args.batch_size, checkpoint.done)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=init_worker,
+                             initargs=(jobs, args.detailed, threads, args.skip_duplicates)) as pool:
+        in_flight = set()
+        exhausted = False
+        while in_flight or not exhausted:
+            # Keep a bounded number of batches queued so the archive is streamed, not loaded
+            while not exhausted and len(in_flight) < workers * 2:
+                batch = next(batches, None)
+                if batch is None:
+                    exhausted = True
+                else:
+                    thresholds = writer.thresholds() if args.top_k else None
+                    in_flight.add(pool.submit(score_batch, batch, thresholds))
+            if not in_flight:
+                break
+
+            finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                names, rows = future.result()
+                if args.top_k:
+                    # Only ranked rows are written; report failures here instead
+                    for row in rows:
+                        if row["error"]:
+                            logger.warning(f"{row['document']}: {row['error']}")
+                writer.write(rows)
+                pending.extend(names)
+                processed += len(names)
+                failed += sum(1 for row in rows if row["error"])
+                duplicates += len({row["document"] for row in rows if row["duplicate_of"]})
+                rows_written += len(rows)
+
+            if writer.flush_due():
+                writer.flush()
+                checkpoint.mark(pending)
+                pending = []
+
+            now = time.perf_counter()
+            if now - last_report >= args.progress_interval:
+                logger.info(f"{processed} documents scored ({processed / (now - start):.1f}/s), {failed} failed")
+                last_report = now
+
+    writer.close()
+    checkpoint.mark(pending)
+
+    elapsed = time.perf_counter() - start
+    return {
+        "jobs": len(jobs),
+        "documents": processed,
+        "skipped": skipped,
+        "failed": failed,
+        "duplicates": duplicates,
+        "rows": rows_written,
+        "elapsed_s": round(elapsed, 2),
+        "documents_per_s": round(processed / elapsed, 2) if elapsed else 0.0,
+        "workers": workers,
+    }
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Score a ZIP or directory of resumes against job descriptions")
+    parser.add_argument("input", help="ZIP archive or directory of resumes (PDF/DOCX/DOC/TXT)")
+    parser.add_argument("--jd", action="append", required=True,
+                        help="Job description file or directory; repeat for several")
+    parser.add_argument("--output", required=True, help="Output .jsonl file or .parquet directory")
+    parser.add_argument("--format", choices=["jsonl", "parquet"], help="Defaults to the output extension")
+    parser.add_argument("--checkpoint", help="Checkpoint path (default: <output>.checkpoint)")
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=32, help="Resumes profiled and scored per task")
+    parser.add_argument("--rows-per-part", type=int, default=50_000, help="Rows per Parquet part file")
+    parser.add_argument("--detailed", action="store_true",
+                        help="Include the full analysis (suggestions, semantic matches) for every pair")
+    parser.add_argument("--top-k", type=int, default=0,
+                        help="Keep only the K best resumes per job description (JSON Lines output)")
+    parser.add_argument("--skip-duplicates", action="store_true",
+                        help="Do not score resumes that duplicate one the same worker already scored")
+    parser.add_argument("--fake-model", action="store_true",
+                        help="Use the deterministic offline embedding model")
+    parser.add_argument("--progress-interval", type=float, default=10.0, help="Seconds between progress logs")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    args = parse_args(argv)
+    if args.fake_model:
+        os.environ["SENTENCE_MODEL"] = "fake"
+
+    summary = run(args)
+    print(json.dumps(summary, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Benchmark the streaming DOCX reader against python-docx.
+
+Generates synthetic resumes of increasing size (paragraphs plus tables),
+then times ``TextParser.extract_text_from_docx_xml`` and the python-docx
+object-model extraction and reports their peak Python heap usage. lxml's
+C allocations are not visible to tracemalloc, so python-docx's true peak is
+higher than reported.
+
+Run from the ``backend`` directory::
+
+    python -m scripts.bench_docx --sizes 100,1000,10000 --repeat 5
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Tuple
+
+from docx import Document
+
+from app.services.text_parser import TextParser
+
+def build_document(path: str, paragraphs: int) -> None:
+    """Write a resume-like DOCX with one 4x3 table per 20 paragraphs"""
+    doc = Document()
+    for index in range(paragraphs):
+        doc.add_paragraph(
+            f"Paragraph {index}: developed Python and Django services on AWS, "
+            f"led a team of engineers and improved throughput by {index % 50}%."
+        )
+        if index % 20 == 19:
+            table = doc.add_table(rows=4, cols=3)
+            for row in table.rows:
+                for cell_index, cell in enumerate(row.cells):
+                    cell.text = f"Skill {index}-{cell_index}"
+    doc.save(path)
+
+def python_docx_text(path: str) -> str:
+    doc = Document(path)
+    parts = [paragraph.text for paragraph in doc.paragraphs]
+    for table in doc.tables:
+        for row in table.rows:
+            parts.append(" ".join(cell.text for cell in row.cells))
+    return "\n".join(parts).strip()
+
+def measure(func: Callable[[str], str], path: str, repeat: int) -> Tuple[float, int, int]:
+    """Return (best seconds, peak traced bytes, output length)"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        text = func(path)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, len(text)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark DOCX text extraction")
+    parser.add_argument("--sizes", default="100,1000,10000", help="Paragraph counts to generate")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(f"{'paragraphs':>10}{'file KB':>10}{'extractor':>14}{'best ms':>10}{'peak MB':>10}{'chars':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in [int(s) for s in args.sizes.split(",")]:
+            path = os.path.join(tmp, f"resume_{size}.docx")
+            build_document(path, size)
+            file_kb = os.path.getsize(path) / 1024
+            for name, func in (("streaming", TextParser.extract_text_from_docx_xml),
+                               ("python-docx", python_docx_text)):
+                seconds, peak, chars = measure(func, path, args.repeat)
+                print(f"{size:>10}{file_kb:>10.0f}{name:>14}{seconds * 1000:>10.1f}"
+                      f"{peak / 2**20:>10.2f}{chars:>10}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Benchmark cold start and shared model memory, with and without a model bundle.
+
+For each source (the installed model bundle, or the hub cache and
+``spacy.load``) this measures:
+
+* cold start: a fresh interpreter importing the app and loading every
+  model with ``preload_models``, timed from process start;
+* serving: gunicorn with ``--workers`` pre-forked workers, timed until
+  ``/health`` answers, with total RSS and PSS of the process tree. RSS minus
+  PSS is memory counted once per process but shared between them.
+
+Build the bundle first (``python -m scripts.build_model_bundle``).
+
+Run from the ``backend`` directory (Linux only, reads ``/proc``)::
+
+    python -m scripts.bench_startup --workers 4
+"""
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from typing import Dict
+
+from scripts.bench_workers import memory_usage, process_tree, wait_healthy
+
+COLD_START_PROBE = """
+import json, resource, time
+started = time.perf_counter()
+from app.services.model_registry import preload_models
+preload_models(freeze=False)
+print(json.dumps({
+    "seconds": time.perf_counter() - started,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+}))
+"""
+
+def case_env(use_bundle: bool, args) -> Dict[str, str]:
+    env = dict(os.environ)
+    if not use_bundle:
+        env["MODEL_BUNDLE_PATH"] = ""
+    if args.fake_model:
+        env["SENTENCE_MODEL"] = "fake"
+    return env
+
+def cold_start(use_bundle: bool, args) -> Dict[str, float]:
+    """Best-of-N model load time in a fresh interpreter"""
+    runs = []
+    for _ in range(args.repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", COLD_START_PROBE], env=case_env(use_bundle, args),
+            capture_output=True, text=True, check=True,
+        ).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    return min(runs, key=lambda run: run["seconds"])
+
+def serve(use_bundle: bool, args) -> Dict[str, float]:
+    """Time until a pre-forked gunicorn answers, then its memory footprint"""
+    url = f"http://127.0.0.1:{args.port}"
+    env = dict(case_env(use_bundle, args),
+               WEB_CONCURRENCY=str(args.workers),
+               BIND=f"127.0.0.1:{args.port}",
+               PRELOAD_MODELS="1")
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app.main:app"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_healthy(url, args.startup_timeout)
+        ready = time.perf_counter() - started
+        # Give every worker time to finish booting before measuring memory
+        time.sleep(2)
+        memory = memory_usage(process_tree(server.pid))
+    finally:
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+    return {
+        "ready_seconds": ready,
+        "rss_mb": memory["rss"] / 2**20,
+        "pss_mb": memory["pss"] / 2**20,
+        "shared_mb": (memory["rss"] - memory["pss"]) / 2**20,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark cold start and shared model memory")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3, help="Cold-start runs per source (best is kept)")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--startup-timeout", type=float, default=180.0)
+    parser.add_argument("--fake-model", action="store_true", help="Use the deterministic fake model")
+    parser.add_argument("--no-serve", action="store_true", help="Only measure cold start")
+    args = parser.parse_args(argv)
+
+    from app.services.model_bundle import get_model_bundle
+
+    bundle = get_model_bundle()
+    if bundle is None:
+        raise SystemExit("No model bundle installed; run python -m scripts.build_model_bundle first")
+
+    print(f"Model bundle {bundle.version} at {bundle.path}")
+    print(f"{'source':>8}{'cold s':>9}{'max RSS MB':>12}{'ready s':>9}{'RSS MB':>9}{'PSS MB':>9}{'shared MB':>11}")
+    for use_bundle in (True, False):
+        result = cold_start(use_bundle, args)
+        line = f"{'bundle' if use_bundle else 'hub':>8}{result['seconds']:>9.2f}{result['max_rss_mb']:>12.0f}"
+        if not args.no_serve:
+            served = serve(use_bundle, args)
+            line += (f"{served['ready_seconds']:>9.2f}{served['rss_mb']:>9.0f}"
+                     f"{served['pss_mb']:>9.0f}{served['shared_mb']:>11.0f}")
+        print(line)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Benchmark the fast and full analysis tiers of ScoringService.
+
+Runs ``analyze_resume_jd_match`` over synthetic (or supplied) resumes at
+each tier and reports latency percentiles and throughput. The fast tier
+only scores skill bitsets; the full tier adds SentenceTransformer skill
+matching and document similarity, so the gap between them is the price of
+the semantic stages on this machine. With ``--min-score`` a ``screen`` row
+times ``screen_resume`` at that cutoff for comparison.
+
+Run from the ``backend`` directory::
+
+    python -m scripts.bench_tiers --resumes 200
+    python -m scripts.bench_tiers --files samples/ --fake-model
+    python -m scripts.bench_tiers --tiers fast --min-score 70
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from scripts.load_test import JOB_DESCRIPTION, load_resume_files, synthetic_resumes
+
+def run_tier(service, tier: str, texts: List[str], job_description: str, warmup: int) -> Dict[str, float]:
+    return time_calls(lambda text: service.analyze_resume_jd_match(text, job_description, tier), texts, warmup)
+
+def time_calls(analyze: Callable[[str], object], texts: List[str], warmup: int) -> Dict[str, float]:
+    for text in texts[:warmup]:
+        analyze(text)
+
+    latencies = []
+    start = time.perf_counter()
+    for text in texts:
+        began = time.perf_counter()
+        analyze(text)
+        latencies.append((time.perf_counter() - began) * 1000)
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "analyses": len(latencies),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "p50_ms": round(latencies[len(latencies) // 2], 3),
+        "p95_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3),
+        "max_ms": round(latencies[-1], 3),
+        "per_second": round(len(latencies) / elapsed, 1),
+    }
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare fast and full ScoringService tiers")
+    parser.add_argument("--resumes", type=int, default=100, help="Synthetic resumes to generate without --files")
+    parser.add_argument("--files", help="Directory of plain-text resumes to use instead")
+    parser.add_argument("--tiers", default="fast,full", help="Comma-separated tiers to run")
+    parser.add_argument("--min-score", type=float, help="Also time screening at this cutoff")
+    parser.add_argument("--warmup", type=int, default=5, help="Unrecorded analyses per tier")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--fake-model", action="store_true",
+                        help="Use the deterministic offline embedding model")
+    parser.add_argument("--json", dest="json_path", help="Write the report as JSON to this path")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.fake_model:
+        os.environ["SENTENCE_MODEL"] = "fake"
+
+    from app.services.model_registry import get_scoring_service
+
+    samples = load_resume_files(args.files) if args.files else synthetic_resumes(args.resumes, args.seed)
+    texts = [sample.text for sample in samples]
+    service = get_scoring_service()
+
+    report = {tier: run_tier(service, tier, texts, JOB_DESCRIPTION, args.warmup)
+              for tier in args.tiers.split(",")}
+    if args.min_score is not None:
+        report["screen"] = time_calls(
+            lambda text: service.screen_resume(text, JOB_DESCRIPTION, args.min_score), texts, args.warmup
+        )
+
+    print(f"{'tier':<8}{'n':>6}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'per s':>10}")
+    for tier, stats in report.items():
+        print(f"{tier:<8}{stats['analyses']:>6}{stats['mean_ms']:>10.2f}{stats['p50_ms']:>10.2f}"
+              f"{stats['p95_ms']:>10.2f}{stats['max_ms']:>10.2f}{stats['per_second']:>10.1f}")
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Benchmark throughput and memory of multi-worker serving.
+
+Starts gunicorn (see ``gunicorn.conf.py``) with an increasing number of
+workers, with and without pre-fork model loading, drives it with the load
+test harness and reports throughput next to the total RSS and PSS of the
+server processes. PSS divides shared pages between the processes that map
+them, so with preloading it should grow far slower than RSS as workers are
+added.
+
+Run from the ``backend`` directory (Linux only, reads ``/proc``)::
+
+    python -m scripts.bench_workers --workers 1,2,4 --duration 20
+"""
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+import httpx
+
+from scripts import load_test
+
+def process_tree(pid: int) -> List[int]:
+    """Return pid and all of its descendants"""
+    pids = [pid]
+    for child in _children(pid):
+        pids.extend(process_tree(child))
+    return pids
+
+def _children(pid: int) -> List[int]:
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(p) for p in f.read().split()]
+    except OSError:
+        return []
+
+def memory_usage(pids: List[int]) -> Dict[str, int]:
+    """Sum RSS and PSS (in bytes) over processes from smaps_rollup"""
+    totals = {"rss": 0, "pss": 0}
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/smaps_rollup") as f:
+                for line in f:
+                    key, _, rest = line.partition(":")
+                    if key in ("Rss", "Pss"):
+                        totals[key.lower()] += int(rest.split()[0]) * 1024
+        except OSError:
+            continue
+    return totals
+
+def wait_healthy(url: str, timeout: float) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{url}/health", timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"Server at {url} did not become healthy within {timeout}s")
+
+def run_case(workers: int, preload: bool, args) -> Dict:
+    port = args.port
+    url = f"http://127.0.0.1:{port}"
+    env = dict(os.environ,
+               WEB_CONCURRENCY=str(workers),
+               BIND=f"127.0.0.1:{port}",
+               PRELOAD_MODELS="1" if preload else "0")
+    if args.fake_model:
+        env["SENTENCE_MODEL"] = "fake"
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app.main:app"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_healthy(url, args.startup_timeout)
+        # Give every worker time to finish booting before measuring memory
+        time.sleep(2)
+        idle = memory_usage(process_tree(server.pid))
+
+        load_args = load_test.parse_args([
+            "--url", url,
+            "--concurrency", str(workers * args.per_worker_concurrency),
+            "--duration", str(args.duration),
+            "--warmup", str(workers * 2),
+        ])
+        report = asyncio.run(load_test.main_async(load_args))
+        loaded = memory_usage(process_tree(server.pid))
+    finally:
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+    return {
+        "workers": workers,
+        "preload": preload,
+        "throughput_rps": report["throughput_rps"],
+        "p95_ms": report["latency"].get("p95_ms", 0.0),
+        "error_rate": report["error_rate"],
+        "idle_rss_mb": idle["rss"] / 2**20,
+        "idle_pss_mb": idle["pss"] / 2**20,
+        "loaded_pss_mb": loaded["pss"] / 2**20,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark multi-worker throughput and memory")
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts")
+    parser.add_argument("--duration", type=float, default=20.0, help="Load duration per case in seconds")
+    parser.add_argument("--per-worker-concurrency", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--startup-timeout", type=float, default=180.0)
+    parser.add_argument("--fake-model", action="store_true", help="Serve with the deterministic fake model")
+    parser.add_argument("--modes", default="preload,no-preload", help="Which loading modes to compare")
+    args = parser.parse_args(argv)
+
+    modes = [mode.strip() == "preload" for mode in args.modes.split(",")]
+    results = []
+    for workers in [int(w) for w in args.workers.split(",")]:
+        for preload in modes:
+            results.append(run_case(workers, preload, args))
+
+    print(f"{'workers':>8}{'mode':>12}{'req/s':>10}{'p95 ms':>10}{'errors':>9}"
+          f"{'RSS MB':>10}{'PSS MB':>10}{'PSS load':>10}")
+    for r in results:
+        print(f"{r['workers']:>8}{'preload' if r['preload'] else 'no-preload':>12}"
+              f"{r['throughput_rps']:>10.1f}{r['p95_ms']:>10.1f}{r['error_rate'] * 100:>8.1f}%"
+              f"{r['idle_rss_mb']:>10.0f}{r['idle_pss_mb']:>10.0f}{r['loaded_pss_mb']:>10.0f}")
+
+if __name__ == "__main__":
+    main()
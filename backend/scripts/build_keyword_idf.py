@@ -0,0 +1,70 @@
+"""Build the IDF table used to rank ATS keywords in job descriptions.
+
+Document frequencies are counted over a reference corpus: ZIP archives or
+directories of job descriptions (and, optionally, resumes), plus the job
+descriptions already stored in the analysis history. Terms found in fewer
+than ``--min-df`` documents are left out and weighted as rare at runtime.
+
+Run from the ``backend`` directory::
+
+    python -m scripts.build_keyword_idf jobs/ postings.zip
+    python -m scripts.build_keyword_idf --history --output app/data/keyword_idf.json
+"""
+import argparse
+import io
+import json
+import os
+import sqlite3
+from typing import Iterator
+
+from scripts.batch_score import iter_documents
+
+def corpus_texts(sources, include_history: bool) -> Iterator[str]:
+    from app.services.text_parser import TextParser
+
+    for source in sources:
+        for name, payload in iter_documents(source):
+            ext = os.path.splitext(name)[1]
+            stream = io.BytesIO(payload) if isinstance(payload, bytes) else payload
+            text = TextParser.extract_text(stream, ext)
+            if text.strip():
+                yield text
+
+    if include_history:
+        from app.services.history_store import HISTORY_DB_PATH
+
+        conn = sqlite3.connect(f"file:{HISTORY_DB_PATH}?mode=ro", uri=True)
+        try:
+            for (description,) in conn.execute("SELECT description FROM job_profiles"):
+                yield description
+        finally:
+            conn.close()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build the ATS keyword IDF table")
+    parser.add_argument("sources", nargs="*", help="ZIP archives or directories of documents")
+    parser.add_argument("--history", action="store_true",
+                        help="Include job descriptions from the analysis history database")
+    parser.add_argument("--min-df", type=int, default=2, help="Minimum document frequency to keep a term")
+    parser.add_argument("--output", help="Table path (default: KEYWORD_IDF_PATH)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not args.sources and not args.history:
+        raise SystemExit("Nothing to index: pass document sources and/or --history")
+
+    from app.services.keywords import KEYWORD_IDF_PATH, build_idf_table
+
+    texts = list(corpus_texts(args.sources, args.history))
+    if not texts:
+        raise SystemExit("The reference corpus is empty")
+    table = build_idf_table(texts, args.min_df)
+
+    output = args.output or KEYWORD_IDF_PATH
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(table, f, indent=0, sort_keys=True)
+    print(f"Indexed {table['documents']} documents, {len(table['idf'])} terms -> {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Package the NLP models and taxonomy embeddings into one local artifact.
+
+Builds ``models/bundle-<version>/`` holding the SentenceTransformer model,
+the spaCy pipeline, the taxonomy it was built against and that taxonomy's
+skill embeddings (a ``.npy`` file the server memory-maps), then points the
+``models/current`` symlink at it. The version is a hash of the bundle's
+contents, so rebuilding unchanged inputs yields the same version. Build
+once with network access (e.g. in a Docker build stage) and ship the
+directory; the server then starts without touching the network.
+
+Run from the ``backend`` directory::
+
+    python -m scripts.build_model_bundle
+    python -m scripts.build_model_bundle --sentence-model fake --no-spacy   # CI
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+def content_hash(root: str) -> str:
+    """SHA-256 over every file's relative path and bytes, in sorted order"""
+    digest = hashlib.sha256()
+    for directory, dirs, files in os.walk(root):
+        dirs.sort()
+        for filename in sorted(files):
+            path = os.path.join(directory, filename)
+            digest.update(os.path.relpath(path, root).encode("utf-8"))
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+def build(args) -> str:
+    from app.services import model_bundle
+    from app.services.embedding_models import FAKE_SENTENCE_MODEL, load_sentence_model
+    from app.services.taxonomy import load_taxonomy
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".bundle-", dir=args.output_dir)
+    os.chmod(staging, 0o755)
+    try:
+        started = time.perf_counter()
+        model = load_sentence_model(args.sentence_model)
+        if args.sentence_model != FAKE_SENTENCE_MODEL:
+            model.save(os.path.join(staging, model_bundle.SENTENCE_MODEL_DIR))
+        print(f"Sentence model {args.sentence_model} ready in {time.perf_counter() - started:.1f}s")
+
+        spacy_model = None
+        if not args.no_spacy:
+            import spacy
+
+            started = time.perf_counter()
+            nlp = spacy.load(args.spacy_model)
+            nlp.to_disk(os.path.join(staging, model_bundle.SPACY_MODEL_DIR))
+            spacy_model = args.spacy_model
+            print(f"spaCy model {spacy_model} ready in {time.perf_counter() - started:.1f}s")
+
+        shutil.copyfile(args.taxonomy, os.path.join(staging, model_bundle.TAXONOMY_FILE))
+        index = load_taxonomy(args.taxonomy)
+        embeddings = np.ascontiguousarray(model.encode(index.vocabulary.skills), dtype=np.float32)
+        np.save(os.path.join(staging, model_bundle.SKILL_EMBEDDINGS_FILE), embeddings)
+
+        version = content_hash(staging)
+        manifest = {
+            "version": version,
+            "created_at": datetime.utcnow().isoformat(),
+            "sentence_model": args.sentence_model,
+            "spacy_model": spacy_model,
+            "taxonomy_version": index.version,
+            "skills": len(index.vocabulary.skills),
+            "embedding_dim": int(embeddings.shape[1]),
+        }
+        with open(os.path.join(staging, model_bundle.MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+        bundle_dir = os.path.join(args.output_dir, f"bundle-{version}")
+        if os.path.exists(bundle_dir):
+            shutil.rmtree(staging)
+        else:
+            os.replace(staging, bundle_dir)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    # Swap the symlink atomically so a starting server never sees a missing link
+    current = os.path.join(args.output_dir, "current")
+    tmp_link = f"{current}.tmp"
+    if os.path.lexists(tmp_link):
+        os.remove(tmp_link)
+    os.symlink(os.path.basename(bundle_dir), tmp_link)
+    os.replace(tmp_link, current)
+    return bundle_dir
+
+def parse_args(argv=None):
+    from app.services.embedding_models import sentence_model_name
+    from app.services.model_bundle import MODELS_DIR, SPACY_MODEL
+    from app.services.taxonomy import TAXONOMY_PATH
+
+    parser = argparse.ArgumentParser(description="Build a versioned local model bundle")
+    parser.add_argument("--output-dir", default=MODELS_DIR, help="Directory holding bundles and the 'current' link")
+    parser.add_argument("--sentence-model", default=sentence_model_name())
+    parser.add_argument("--spacy-model", default=SPACY_MODEL)
+    parser.add_argument("--no-spacy", action="store_true", help="Leave spaCy out of the bundle")
+    parser.add_argument("--taxonomy", default=TAXONOMY_PATH)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    bundle_dir = build(args)
+    print(f"Model bundle ready: {bundle_dir}")
+
+if __name__ == "__main__":
+    main()
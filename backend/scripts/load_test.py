@@ -0,0 +1,364 @@
+"""HTTP load-test harness for the Resume Analyzer API.
+
+Drives ``/analyze`` and ``/analyze-with-file`` with a configurable mix of
+endpoints and resume files, either closed-loop (fixed concurrency) or
+open-loop (Poisson arrivals at a fixed rate), and reports throughput, tail
+latencies and error rates.
+
+The API rate-limits each client (see ``RATE_LIMIT_*``), and one load
+generator is one client, so with the defaults most requests would be
+measured as ``429`` responses. ``--in-process`` runs disable the limiter
+unless ``--rate-limit`` is given. Against a running server, start it with
+``RATE_LIMIT_ENABLED=0`` or pass ``--api-key`` with a key from
+``BATCH_API_KEYS`` and a large enough ``RATE_LIMIT_BATCH_*`` budget.
+Rate-limited requests are reported separately.
+
+Examples (run from the ``backend`` directory)::
+
+    # Against a running worker started with SENTENCE_MODEL=fake RATE_LIMIT_ENABLED=0
+    python -m scripts.load_test --url http://localhost:8000 --concurrency 16 --duration 30
+
+    # In-process against the ASGI app with the deterministic fake model
+    python -m scripts.load_test --in-process --fake-model --rate 20 --requests 500
+
+    # Real resume files, weighted 3:1 towards the file endpoint
+    python -m scripts.load_test --url http://localhost:8000 --files ./samples \\
+        --mix analyze=1,analyze-with-file=3
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+ENDPOINTS = {
+    "analyze": "/analyze",
+    "analyze-with-file": "/analyze-with-file",
+}
+
+CONTENT_TYPES = {
+    ".pdf": "application/pdf",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ".doc": "application/msword",
+    ".txt": "text/plain",
+}
+
+SKILL_POOL = [
+    "python", "java", "javascript", "react", "node.js", "django", "flask", "aws",
+    "azure", "docker", "kubernetes", "terraform", "postgresql", "mongodb", "redis",
+    "git", "jenkins", "agile", "scrum", "machine learning", "tableau", "sql",
+]
+
+JOB_DESCRIPTION = (
+    "We are hiring a Senior Software Engineer with 5+ years of experience in "
+    "Python, Django, AWS, Docker and Kubernetes. Experience with PostgreSQL, "
+    "Redis and CI/CD is required. AWS Certified preferred. Agile and Scrum "
+    "experience, strong communication and leadership skills."
+)
+
+@dataclass
+class ResumeSample:
+    name: str
+    content: bytes
+    content_type: str
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="ignore")
+
+@dataclass
+class RequestRecord:
+    endpoint: str
+    started: float
+    latency: float
+    status: Optional[int]
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status is not None and 200 <= self.status < 300
+
+@dataclass
+class LoadTestConfig:
+    concurrency: int = 8
+    rate: float = 0.0
+    duration: float = 0.0
+    requests: int = 200
+    mix: Dict[str, float] = field(default_factory=lambda: {"analyze": 1.0, "analyze-with-file": 1.0})
+    timeout: float = 60.0
+    warmup: int = 0
+    seed: int = 42
+
+def synthetic_resumes(count: int, seed: int) -> List[ResumeSample]:
+    """Generate deterministic plain-text resumes of varying size"""
+    rng = random.Random(seed)
+    samples = []
+    for index in range(count):
+        skills = rng.sample(SKILL_POOL, rng.randint(4, 12))
+        years = rng.randint(1, 12)
+        paragraphs = rng.randint(2, 20)
+        body = "\n".join(
+            f"Developed and maintained services using {', '.join(rng.sample(skills, min(3, len(skills))))}. "
+            f"Led a team of {rng.randint(2, 9)} engineers and improved throughput by {rng.randint(5, 60)}%."
+            for _ in range(paragraphs)
+        )
+        text = (
+            f"Candidate {index}\nSoftware Engineer\n\nSUMMARY\n"
+            f"{years}+ years of experience building web applications.\n\n"
+            f"SKILLS\n{', '.join(skills)}\n\nEXPERIENCE\n{body}\n\n"
+            f"EDUCATION\nBachelor of Science in Computer Science, State University\n"
+        )
+        samples.append(ResumeSample(f"resume_{index}.txt", text.encode("utf-8"), CONTENT_TYPES[".txt"]))
+    return samples
+
+def load_resume_files(directory: str) -> List[ResumeSample]:
+    """Load every supported resume file from a directory"""
+    samples = []
+    for name in sorted(os.listdir(directory)):
+        extension = os.path.splitext(name)[1].lower()
+        if extension not in CONTENT_TYPES:
+            continue
+        with open(os.path.join(directory, name), "rb") as f:
+            samples.append(ResumeSample(name, f.read(), CONTENT_TYPES[extension]))
+    if not samples:
+        raise SystemExit(f"No supported resume files found in {directory}")
+    return samples
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """Parse an endpoint mix such as ``analyze=3,analyze-with-file=1``"""
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"Unknown endpoint '{name}'. Choose from: {', '.join(ENDPOINTS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+class LoadTester:
+    """Issues requests against the API and records per-request outcomes"""
+
+    def __init__(self, client: httpx.AsyncClient, samples: List[ResumeSample], config: LoadTestConfig):
+        self.client = client
+        self.samples = samples
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.records: List[RequestRecord] = []
+        self._endpoints, self._weights = zip(*config.mix.items())
+
+    def _next_request(self) -> Tuple[str, ResumeSample]:
+        endpoint = self.rng.choices(self._endpoints, weights=self._weights)[0]
+        return endpoint, self.rng.choice(self.samples)
+
+    async def _send(self, endpoint: str, sample: ResumeSample) -> RequestRecord:
+        if endpoint == "analyze":
+            kwargs = {"data": {"resume_text": sample.text, "job_description": JOB_DESCRIPTION}}
+        else:
+            kwargs = {
+                "data": {"job_description": JOB_DESCRIPTION},
+                "files": {"resume_file": (sample.name, sample.content, sample.content_type)},
+            }
+
+        started = time.perf_counter()
+        try:
+            response = await self.client.post(ENDPOINTS[endpoint], **kwargs)
+            return RequestRecord(endpoint, started, time.perf_counter() - started, response.status_code)
+        except httpx.HTTPError as e:
+            return RequestRecord(endpoint, started, time.perf_counter() - started, None, type(e).__name__)
+
+    async def warmup(self) -> None:
+        for _ in range(self.config.warmup):
+            await self._send(*self._next_request())
+
+    async def run_closed_loop(self) -> None:
+        """Keep ``concurrency`` requests in flight until the budget is spent"""
+        deadline = time.perf_counter() + self.config.duration if self.config.duration else None
+        remaining = self.config.requests
+
+        async def worker():
+            nonlocal remaining
+            while True:
+                if deadline is not None:
+                    if time.perf_counter() >= deadline:
+                        return
+                elif remaining <= 0:
+                    return
+                else:
+                    remaining -= 1
+                self.records.append(await self._send(*self._next_request()))
+
+        await asyncio.gather(*(worker() for _ in range(self.config.concurrency)))
+
+    async def run_open_loop(self) -> None:
+        """Start requests on a Poisson schedule, capped at ``concurrency`` in flight"""
+        limiter = asyncio.Semaphore(self.config.concurrency)
+        deadline = time.perf_counter() + self.config.duration if self.config.duration else None
+        tasks = []
+
+        async def fire(endpoint, sample):
+            async with limiter:
+                self.records.append(await self._send(endpoint, sample))
+
+        issued = 0
+        while True:
+            if deadline is not None:
+                if time.perf_counter() >= deadline:
+                    break
+            elif issued >= self.config.requests:
+                break
+            tasks.append(asyncio.create_task(fire(*self._next_request())))
+            issued += 1
+            await asyncio.sleep(self.rng.expovariate(self.config.rate))
+
+        await asyncio.gather(*tasks)
+
+    async def run(self) -> Dict:
+        await self.warmup()
+        started = time.perf_counter()
+        if self.config.rate > 0:
+            await self.run_open_loop()
+        else:
+            await self.run_closed_loop()
+        return summarize(self.records, time.perf_counter() - started)
+
+def summarize(records: List[RequestRecord], elapsed: float) -> Dict:
+    """Aggregate request records into throughput, latency and error statistics"""
+
+    def latency_stats(subset: List[RequestRecord]) -> Dict[str, float]:
+        latencies = sorted(r.latency * 1000 for r in subset)
+        if not latencies:
+            return {}
+        return {
+            "mean_ms": round(sum(latencies) / len(latencies), 2),
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p90_ms": round(percentile(latencies, 90), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+            "max_ms": round(latencies[-1], 2),
+        }
+
+    by_endpoint = defaultdict(list)
+    for record in records:
+        by_endpoint[record.endpoint].append(record)
+
+    ok = [r for r in records if r.ok]
+    failures = Counter(r.error or str(r.status) for r in records if not r.ok)
+
+    return {
+        "requests": len(records),
+        "succeeded": len(ok),
+        "failed": len(records) - len(ok),
+        "error_rate": round((len(records) - len(ok)) / len(records), 4) if records else 0.0,
+        "rate_limited": sum(1 for r in records if r.status == 429),
+        "errors": dict(failures),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(ok) / elapsed, 2) if elapsed > 0 else 0.0,
+        "latency": latency_stats(ok),
+        "endpoints": {
+            name: {
+                "requests": len(subset),
+                "failed": sum(1 for r in subset if not r.ok),
+                "latency": latency_stats([r for r in subset if r.ok]),
+            }
+            for name, subset in sorted(by_endpoint.items())
+        },
+    }
+
+def print_report(report: Dict) -> None:
+    print(f"Requests: {report['requests']}  ok: {report['succeeded']}  failed: {report['failed']} "
+          f"(error rate {report['error_rate'] * 100:.2f}%)")
+    print(f"Elapsed: {report['elapsed_s']}s  throughput: {report['throughput_rps']} req/s")
+    if report["rate_limited"]:
+        print(f"Rate limited (429): {report['rate_limited']} - disable the limiter or use --api-key")
+    if report["errors"]:
+        print("Errors: " + ", ".join(f"{k}={v}" for k, v in report["errors"].items()))
+    header = f"{'endpoint':<20}{'n':>7}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}"
+    print(header)
+    rows = [("all", report["requests"], report["latency"])]
+    rows += [(name, stats["requests"], stats["latency"]) for name, stats in report["endpoints"].items()]
+    for name, count, lat in rows:
+        if not lat:
+            print(f"{name:<20}{count:>7}{'-':>10}")
+            continue
+        print(f"{name:<20}{count:>7}{lat['mean_ms']:>10.1f}{lat['p50_ms']:>10.1f}"
+              f"{lat['p95_ms']:>10.1f}{lat['p99_ms']:>10.1f}{lat['max_ms']:>10.1f}")
+
+def build_client(args) -> httpx.AsyncClient:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    headers = {"X-API-Key": args.api_key} if args.api_key else None
+    if args.in_process:
+        # Import lazily so the fake-model and rate-limit environment is in place before the app loads
+        from app.main import app
+        transport = httpx.ASGITransport(app=app)
+        return httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=args.timeout,
+                                 headers=headers)
+    return httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits, headers=headers)
+
+async def main_async(args) -> Dict:
+    samples = load_resume_files(args.files) if args.files else synthetic_resumes(args.synthetic, args.seed)
+    config = LoadTestConfig(
+        concurrency=args.concurrency,
+        rate=args.rate,
+        duration=args.duration,
+        requests=args.requests,
+        mix=args.mix,
+        timeout=args.timeout,
+        warmup=args.warmup,
+        seed=args.seed,
+    )
+    async with build_client(args) as client:
+        return await LoadTester(client, samples, config).run()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the Resume Analyzer API")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", default="http://localhost:8000", help="Base URL of a running API")
+    target.add_argument("--in-process", action="store_true", help="Drive app.main:app via ASGI transport")
+    parser.add_argument("--fake-model", action="store_true",
+                        help="Use the deterministic offline embedding model (in-process only)")
+    parser.add_argument("--api-key", help="Send this X-API-Key (e.g. a batch key with a higher rate limit)")
+    parser.add_argument("--rate-limit", action="store_true",
+                        help="Keep the API rate limiter on for --in-process runs")
+    parser.add_argument("--concurrency", type=int, default=8, help="Maximum requests in flight")
+    parser.add_argument("--rate", type=float, default=0.0,
+                        help="Open-loop arrival rate in req/s (0 = closed loop)")
+    parser.add_argument("--duration", type=float, default=0.0, help="Run for N seconds instead of --requests")
+    parser.add_argument("--requests", type=int, default=200, help="Total requests when --duration is not set")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("analyze=1,analyze-with-file=1"),
+                        help="Endpoint weights, e.g. analyze=3,analyze-with-file=1")
+    parser.add_argument("--files", help="Directory of resume files (PDF/DOCX/DOC/TXT) to sample from")
+    parser.add_argument("--synthetic", type=int, default=50, help="Synthetic resumes to generate without --files")
+    parser.add_argument("--warmup", type=int, default=2, help="Unrecorded requests sent before measuring")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for request and file selection")
+    parser.add_argument("--json", dest="json_path", help="Write the report as JSON to this path")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.fake_model:
+        os.environ["SENTENCE_MODEL"] = "fake"
+    if args.in_process and not args.rate_limit:
+        os.environ["RATE_LIMIT_ENABLED"] = "0"
+
+    report = asyncio.run(main_async(args))
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
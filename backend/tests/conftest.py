@@ -0,0 +1,61 @@
+"""Shared test setup.
+
+Configuration is read from the environment at import time, so it is set
+here, before any ``app`` module is imported: the deterministic offline
+embedding model, no model bundle, and every on-disk store under a
+temporary directory. Sample inputs, the ``make_result`` factory and the
+app-level fixtures used by several test modules live here too.
+"""
+import os
+import tempfile
+
+import pytest
+
+_DATA_DIR = tempfile.mkdtemp(prefix="resume-analyzer-tests-")
+
+os.environ.setdefault("SENTENCE_MODEL", "fake")
+os.environ.setdefault("MODEL_BUNDLE_PATH", "")
+os.environ.setdefault("HISTORY_DB_PATH", os.path.join(_DATA_DIR, "history.db"))
+os.environ.setdefault("ANALYTICS_DIR", os.path.join(_DATA_DIR, "analytics"))
+os.environ.setdefault("CHUNKED_UPLOAD_DIR", os.path.join(_DATA_DIR, "chunked"))
+os.environ.setdefault("TEXT_CACHE_DIR", os.path.join(_DATA_DIR, "text-cache"))
+# Endpoint tests send many requests from one address; the limiter has its own tests
+os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+
+JOB_DESCRIPTION = (
+    "Senior Backend Engineer. Requirements: 5+ years of experience with Python, "
+    "Django and PostgreSQL. Experience with AWS, Docker and Kubernetes. "
+    "AWS Certified Solutions Architect preferred."
+)
+
+RESUME = (
+    "Jane Doe\nSenior Software Engineer\n\nExperience\n"
+    "7 years of experience building Python and Django services on PostgreSQL, "
+    "deployed with Docker on AWS.\n\nEducation\nBachelor of Science in Computer Science\n"
+)
+
+def make_result(score: float, missing=("kubernetes",), method: str = "full") -> dict:
+    """A minimal analysis result, as the stores receive it from ``/analyze``"""
+    return {
+        "overall_score": score,
+        "match_breakdown": {"skills_score": score, "experience_score": score, "certification_score": score},
+        "matched_skills": [{"skill": "Python"}],
+        "missing_skills": list(missing),
+        "experience_analysis": {"required_years": 5, "found_years": 3},
+        "certification_analysis": [],
+        "analysis_method": method,
+    }
+
+@pytest.fixture
+def service():
+    from app.services.model_registry import get_scoring_service
+
+    return get_scoring_service()
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
@@ -0,0 +1,74 @@
+from app.services.analytics_store import AnalyticsStore, job_key
+
+from conftest import make_result
+
+def test_report_on_empty_store(tmp_path):
+    store = AnalyticsStore(str(tmp_path / "analytics"))
+    report = store.report()
+    assert report["rows"] == 0
+    assert report["jobs"] == []
+    assert store.report(job="backend", start_date="2024-01-01")["rows"] == 0
+
+def test_report_aggregates_recorded_results(tmp_path):
+    store = AnalyticsStore(str(tmp_path / "analytics"))
+    store.record(make_result(80.0, ["kubernetes"]), "backend", "doc-1")
+    store.record(make_result(60.0, ["kubernetes", "go"]), "backend", "doc-2")
+    store.record(make_result(40.0, ["react"]), "frontend", "doc-3")
+
+    report = store.report()
+    assert report["rows"] == 3
+    assert store.report(job="backend")["rows"] == 2
+    gaps = {gap["skill"]: gap["count"] for gap in store.report(job="backend")["skill_gaps"]}
+    assert gaps["kubernetes"] == 2
+
+def test_job_key_prefers_job_id():
+    assert job_key("Any description", "Backend-2024-Q1") == "Backend-2024-Q1"
+    assert job_key("Any description").startswith("jd-")
+
+def test_job_keys_of_different_ids_do_not_collide():
+    ids = ["Backend 2024/Q1", "Backend-2024-Q1", "Backend 2024 Q1", "///", "***"]
+    keys = [job_key("Any description", job_id) for job_id in ids]
+    assert len(set(keys)) == len(ids)
+    assert keys[0].startswith("Backend-2024-Q1-")
+    assert all("/" not in key and " " not in key for key in keys)
+
+def test_reports_do_not_flush_and_see_buffered_rows(tmp_path):
+    store = AnalyticsStore(str(tmp_path / "analytics"), flush_rows=100, flush_interval=0)
+    store.record(make_result(80.0, ["kubernetes"]), "backend", "doc-1")
+    store.flush()
+    store.record(make_result(60.0, ["go"]), "backend", "doc-2")
+
+    assert store.report(job="backend")["rows"] == 2
+    assert store.report(job="frontend")["rows"] == 0
+    parts = list((tmp_path / "analytics").rglob("*.parquet"))
+    assert len(parts) == 1
+
+def test_rows_are_flushed_by_age(tmp_path, monkeypatch):
+    import app.services.analytics_store as analytics_store
+
+    clock = [1000.0]
+    monkeypatch.setattr(analytics_store.time, "monotonic", lambda: clock[0])
+    store = AnalyticsStore(str(tmp_path / "analytics"), flush_rows=100, flush_interval=60)
+    store.record(make_result(80.0, []), "backend")
+    clock[0] += 61
+    store.record(make_result(70.0, []), "backend")
+    assert len(list((tmp_path / "analytics").rglob("*.parquet"))) == 1
+
+def test_compaction_merges_small_parts(tmp_path):
+    store = AnalyticsStore(str(tmp_path / "analytics"), flush_rows=1, flush_interval=0, compact_files=3)
+    for score in (10.0, 20.0, 30.0, 40.0):
+        store.record(make_result(score, ["go"]), "backend")
+    store.record(make_result(50.0, ["go"]), "frontend")
+    before = store.report()
+
+    assert store.compact() == 1
+    parts = sorted(path.parent.name for path in (tmp_path / "analytics").rglob("*.parquet"))
+    assert parts == ["job=backend", "job=frontend"]
+    assert store.report() == before
+    # Only partitions flushed to since the last pass are checked again
+    assert store.compact() == 0
+
+def test_report_endpoint_on_fresh_deployment(client):
+    response = client.get("/analytics/report", params={"job_id": "never-analyzed"})
+    assert response.status_code == 200
+    assert response.json()["rows"] == 0
@@ -0,0 +1,141 @@
+import asyncio
+import hashlib
+import os
+
+import pytest
+
+from app.services.chunked_upload import (
+    ChunkedUploads, UploadChecksumMismatch, UploadConflict, UploadError, UploadNotFound, UploadTooLarge
+)
+
+PART = 1024
+
+def sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+@pytest.fixture
+def uploads(tmp_path):
+    return ChunkedUploads(str(tmp_path), max_size=64 * PART, max_part=8 * PART, min_part=PART)
+
+@pytest.fixture
+def payload():
+    return os.urandom(5 * PART + 100)
+
+def send(uploads, upload_id, payload, offset, length):
+    part = payload[offset:offset + length]
+    return uploads.write_part(upload_id, offset, part, sha256(part))
+
+def test_resume_sends_only_missing_ranges(uploads, payload):
+    upload_id = uploads.create("resume.pdf", len(payload), sha256(payload))["upload_id"]
+    send(uploads, upload_id, payload, 0, PART)
+    send(uploads, upload_id, payload, 3 * PART, PART)
+
+    # A new worker (or a restarted server) sees the same state
+    status = ChunkedUploads(uploads.root, max_size=uploads.max_size, max_part=uploads.max_part,
+                            min_part=PART).status(upload_id)
+    assert status["missing"] == [[PART, 3 * PART], [4 * PART, len(payload)]]
+    assert not status["complete"]
+    with pytest.raises(UploadConflict):
+        uploads.complete(upload_id)
+
+    for start, end in status["missing"]:
+        status = send(uploads, upload_id, payload, start, end - start)
+    assert status["complete"] and status["missing"] == []
+
+    path, document_id, filename = uploads.complete(upload_id)
+    assert document_id == sha256(payload) and filename == "resume.pdf"
+    with open(path, "rb") as f:
+        assert f.read() == payload
+    with pytest.raises(UploadNotFound):
+        uploads.status(upload_id)
+
+def test_identical_resend_is_a_noop_and_overlaps_conflict(uploads, payload):
+    upload_id = uploads.create("resume.pdf", len(payload))["upload_id"]
+    first = send(uploads, upload_id, payload, 0, 2 * PART)
+    assert send(uploads, upload_id, payload, 0, 2 * PART) == first
+    with pytest.raises(UploadConflict):
+        send(uploads, upload_id, payload, PART, 2 * PART)
+
+def test_part_checks(uploads, payload):
+    upload_id = uploads.create("resume.pdf", len(payload))["upload_id"]
+    with pytest.raises(UploadChecksumMismatch):
+        uploads.write_part(upload_id, 0, payload[:PART], sha256(b"something else"))
+    too_large = os.urandom(uploads.max_part + 1)
+    with pytest.raises(UploadTooLarge):
+        uploads.write_part(upload_id, 0, too_large, sha256(too_large))
+    past_end = os.urandom(20)
+    with pytest.raises(UploadError, match="outside"):
+        uploads.write_part(upload_id, len(payload) - 10, past_end, sha256(past_end))
+    # Small parts are refused unless they end the file
+    with pytest.raises(UploadError, match="at least"):
+        send(uploads, upload_id, payload, 0, 10)
+    assert send(uploads, upload_id, payload, len(payload) - 100, 100)["received_bytes"] == 100
+
+def test_whole_file_checksum_mismatch_discards_upload(uploads, payload):
+    upload_id = uploads.create("resume.pdf", len(payload), sha256(b"other file"))["upload_id"]
+    send(uploads, upload_id, payload, 0, len(payload))
+    with pytest.raises(UploadChecksumMismatch):
+        uploads.complete(upload_id)
+    with pytest.raises(UploadNotFound):
+        uploads.status(upload_id)
+
+def test_unknown_and_malformed_ids(uploads):
+    with pytest.raises(UploadNotFound):
+        uploads.status("../../etc/passwd")
+    with pytest.raises(UploadNotFound):
+        uploads.status("0" * 32)
+
+def test_purge_drops_expired_uploads_and_stale_hashers(uploads, payload):
+    upload_id = uploads.create("resume.pdf", len(payload))["upload_id"]
+    send(uploads, upload_id, payload, 0, PART)
+    assert upload_id in uploads._hashers
+
+    # Completed or aborted through another worker's store
+    ChunkedUploads(uploads.root, min_part=PART).abort(upload_id)
+    uploads.purge_expired()
+    assert upload_id not in uploads._hashers
+
+    expired = uploads.create("old.pdf", len(payload))["upload_id"]
+    uploads.ttl = -1
+    assert uploads.purge_expired() == 1
+    with pytest.raises(UploadNotFound):
+        uploads.status(expired)
+
+def test_part_endpoint_rejects_malformed_content_length(client):
+    created = client.post("/uploads", data={"filename": "resume.txt", "size": "10"}).json()
+    response = client.put(
+        f"/uploads/{created['upload_id']}/parts", params={"offset": 0}, content=b"0123456789",
+        headers={"X-Content-SHA256": sha256(b"0123456789"), "Content-Length": "ten"}
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid Content-Length header."
+
+def test_part_endpoint_stops_reading_an_oversized_chunked_body(client, monkeypatch):
+    from app.main import app
+    from app.services.chunked_upload import get_chunked_uploads
+
+    uploads = get_chunked_uploads()
+    monkeypatch.setattr(uploads, "max_part", 4 * PART)
+    created = client.post("/uploads", data={"filename": "resume.txt", "size": str(16 * PART)}).json()
+    received, sent = [], []
+
+    # Drive the ASGI app directly: a body without Content-Length arrives in
+    # pieces, and the handler must stop pulling them once it is too large
+    scope = {
+        "type": "http", "http_version": "1.1", "method": "PUT", "scheme": "http",
+        "path": f"/uploads/{created['upload_id']}/parts", "raw_path": b"", "root_path": "",
+        "query_string": b"offset=0", "client": ("127.0.0.1", 1234), "server": ("testserver", 80),
+        "headers": [(b"host", b"testserver"), (b"transfer-encoding", b"chunked"),
+                    (b"x-content-sha256", b"0" * 64)],
+    }
+
+    async def receive():
+        received.append(PART)
+        return {"type": "http.request", "body": bytes(PART), "more_body": len(received) < 16}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    assert sent[0]["status"] == 413
+    assert len(received) == 5
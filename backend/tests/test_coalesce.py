@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from app.utils.coalesce import SingleFlight, content_key
+
+def test_content_key_separates_fields():
+    assert content_key("ab", "c") != content_key("a", "bc")
+    assert content_key(None) != content_key("")
+    assert content_key("job", "resume") == content_key("job", "resume")
+
+def test_concurrent_identical_keys_run_once():
+    flights = SingleFlight()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"score": 70}
+
+    async def main():
+        results = await asyncio.gather(*(flights.do("key", compute) for _ in range(5)),
+                                       flights.do("other", compute))
+        return results
+
+    results = asyncio.run(main())
+    assert len(calls) == 2
+    assert [shared for _, shared in results] == [False, True, True, True, True, False]
+    assert all(result == {"score": 70} for result, _ in results)
+    assert results[0][0] is results[1][0]
+    assert flights.shared == 4
+    assert len(flights) == 0
+
+def test_exception_reaches_every_waiter():
+    flights = SingleFlight()
+    calls = []
+
+    async def fail():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("unreadable resume")
+
+    async def main():
+        return await asyncio.gather(*(flights.do("key", fail) for _ in range(3)), return_exceptions=True)
+
+    errors = asyncio.run(main())
+    assert len(calls) == 1
+    assert all(isinstance(error, ValueError) for error in errors)
+    assert len(flights) == 0
+
+def test_cancelled_leader_does_not_cancel_followers():
+    flights = SingleFlight()
+    release = None
+
+    async def compute():
+        await release.wait()
+        return "done"
+
+    async def main():
+        nonlocal release
+        release = asyncio.Event()
+        leader = asyncio.ensure_future(flights.do("key", compute))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flights.do("key", compute))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(main()) == ("done", True)
+    assert len(flights) == 0
+
+def test_finished_calls_are_not_cached():
+    flights = SingleFlight()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return len(calls)
+
+    async def main():
+        first = await flights.do("key", compute)
+        second = await flights.do("key", compute)
+        return first, second
+
+    assert asyncio.run(main()) == ((1, False), (2, False))
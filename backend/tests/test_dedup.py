@@ -0,0 +1,46 @@
+from app.services.dedup import DuplicateIndex, fingerprint
+
+from conftest import RESUME
+
+OTHER_RESUME = """Maria Lopez
+Registered nurse with eight years of intensive care experience at County General.
+Certified in advanced cardiac life support and pediatric advanced life support.
+Led a team of twelve nurses and introduced a new patient handover checklist.
+Education: Bachelor of Science in Nursing, State College."""
+
+def test_reformatted_copy_is_an_exact_duplicate():
+    index = DuplicateIndex()
+    assert index.check_and_add("pdf", RESUME) is None
+    # A DOCX export of the same resume differs only in whitespace and bullets
+    reformatted = "\n\n".join("• " + line for line in RESUME.splitlines())
+    match = index.check_and_add("docx", reformatted)
+    assert (match.document_id, match.similarity, match.exact) == ("pdf", 1.0, True)
+
+def test_small_edit_is_a_near_duplicate():
+    index = DuplicateIndex()
+    # Long enough that one changed word alters only a few percent of the shingles
+    long_resume = RESUME + OTHER_RESUME
+    index.check_and_add("original", long_resume)
+    match = index.check_and_add("edited", long_resume.replace("twelve", "fifteen"))
+    assert match.document_id == "original"
+    assert not match.exact
+    assert index.threshold <= match.similarity < 1.0
+
+def test_unrelated_resume_is_not_a_duplicate():
+    index = DuplicateIndex()
+    index.check_and_add("first", RESUME)
+    assert index.check_and_add("second", OTHER_RESUME) is None
+    assert len(index) == 2
+
+def test_resubmitting_a_document_does_not_match_itself():
+    index = DuplicateIndex()
+    index.check_and_add("same", RESUME)
+    assert index.check_and_add("same", RESUME) is None
+    assert len(index) == 1
+
+def test_oldest_entries_are_evicted():
+    index = DuplicateIndex(max_entries=1)
+    index.check_and_add("old", RESUME)
+    index.check_and_add("new", OTHER_RESUME)
+    assert index.query(fingerprint(RESUME)) is None
+    assert index.query(fingerprint(OTHER_RESUME)).document_id == "new"
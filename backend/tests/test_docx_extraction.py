@@ -0,0 +1,63 @@
+import pytest
+from docx import Document
+
+from app.services.text_parser import TextParser
+
+def build_docx(path, nested=False):
+    document = Document()
+    document.add_paragraph("Jane Doe")
+    document.add_paragraph("Experience")
+    document.add_paragraph("Backend engineer at Acme")
+    table = document.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = "Python"
+    table.cell(0, 1).text = "5 years"
+    table.cell(1, 0).text = "Cloud"
+    if nested:
+        inner = table.cell(1, 1).add_table(rows=1, cols=2)
+        inner.cell(0, 0).text = "AWS"
+        inner.cell(0, 1).text = "Azure"
+    else:
+        table.cell(1, 1).text = "AWS"
+    document.save(str(path))
+    return str(path)
+
+def python_docx_text(path, monkeypatch):
+    """Text from the python-docx fallback, forced by failing the streaming reader"""
+    def fail(_):
+        raise KeyError("word/document.xml")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(TextParser, "extract_text_from_docx_xml", staticmethod(fail))
+        return TextParser.extract_text_from_docx(path)
+
+def test_streaming_matches_python_docx(tmp_path, monkeypatch):
+    path = build_docx(tmp_path / "resume.docx")
+    streamed = TextParser.extract_text_from_docx(path)
+    assert streamed == python_docx_text(path, monkeypatch)
+    assert streamed.splitlines() == ["Jane Doe", "Experience", "Backend engineer at Acme", "Python 5 years", "Cloud AWS"]
+
+def test_nested_table_rows_stay_in_their_cell(tmp_path, monkeypatch):
+    path = build_docx(tmp_path / "nested.docx", nested=True)
+    streamed = TextParser.extract_text_from_docx_xml(path)
+    # python-docx drops nested tables; the streaming reader keeps them inside the enclosing row
+    assert streamed.startswith(python_docx_text(path, monkeypatch))
+    assert streamed.splitlines()[-2:] == ["Cloud ", "AWS Azure"]
+
+def test_tables_keep_document_order(tmp_path):
+    document = Document()
+    table = document.add_table(rows=1, cols=2)
+    table.cell(0, 0).text = "Skills"
+    table.cell(0, 1).text = "Python"
+    document.add_paragraph("Summary after the table")
+    path = str(tmp_path / "table-first.docx")
+    document.save(path)
+    assert TextParser.extract_text_from_docx(path).splitlines() == ["Skills Python", "Summary after the table"]
+
+def test_malformed_file_raises_the_same_error(tmp_path, monkeypatch):
+    path = tmp_path / "broken.docx"
+    path.write_bytes(b"PK\x03\x04 not really a zip archive")
+    with pytest.raises(ValueError, match="Failed to extract text from DOCX") as streamed:
+        TextParser.extract_text_from_docx(str(path))
+    with pytest.raises(ValueError) as fallback:
+        python_docx_text(str(path), monkeypatch)
+    assert str(streamed.value) == str(fallback.value)
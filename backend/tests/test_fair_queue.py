@@ -0,0 +1,124 @@
+import asyncio
+import threading
+import time
+
+from app.services.fair_queue import FairScheduler
+from app.services.rate_limit import BATCH, INTERACTIVE, ClientIdentity
+
+def run_jobs(scheduler: FairScheduler, submissions):
+    """Submit ``(client, name)`` jobs in order while one job holds the only slot; return run order"""
+    order = []
+    release = threading.Event()
+
+    def job(name):
+        if name == "blocker":
+            release.wait(5)
+        order.append(name)
+
+    async def main():
+        blocker = asyncio.create_task(scheduler.run(ClientIdentity("blocker"), job, "blocker"))
+        await asyncio.sleep(0.05)
+        tasks = [asyncio.create_task(scheduler.run(client, job, name)) for client, name in submissions]
+        await asyncio.sleep(0.05)
+        release.set()
+        await asyncio.gather(blocker, *tasks)
+
+    asyncio.run(main())
+    return order[1:]
+
+def test_backlogged_client_does_not_starve_others():
+    scheduler = FairScheduler(slots=1, weights={INTERACTIVE: 1.0, BATCH: 1.0})
+    heavy, light = ClientIdentity("heavy"), ClientIdentity("light")
+    submissions = [(heavy, f"h{i}") for i in range(6)] + [(light, "l0"), (light, "l1")]
+
+    order = run_jobs(scheduler, submissions)
+    # The light client's jobs interleave with the heavy backlog instead of waiting behind it
+    assert order.index("l0") <= 2 and order.index("l1") <= 4
+    assert [name for name in order if name.startswith("h")] == [f"h{i}" for i in range(6)]
+
+def test_interactive_clients_get_more_turns_than_batch():
+    scheduler = FairScheduler(slots=1, weights={INTERACTIVE: 4.0, BATCH: 1.0})
+    batch, interactive = ClientIdentity("bulk", BATCH), ClientIdentity("user", INTERACTIVE)
+    submissions = [(batch, f"b{i}") for i in range(8)] + [(interactive, f"i{i}") for i in range(8)]
+
+    order = run_jobs(scheduler, submissions)
+    first_ten = order[:10]
+    assert sum(name.startswith("i") for name in first_ten) >= 7
+
+def test_idle_capacity_is_not_held_back():
+    scheduler = FairScheduler(slots=4)
+
+    def job():
+        time.sleep(0.1)
+
+    async def main():
+        started = time.perf_counter()
+        await asyncio.gather(*(scheduler.run(ClientIdentity("bulk", BATCH), job) for _ in range(4)))
+        return time.perf_counter() - started
+
+    # One client alone still gets every slot at once
+    assert asyncio.run(main()) < 0.3
+    assert scheduler.snapshot() == {"slots": 4, "busy": 0, "waiting": 0}
+
+def test_cancelled_waiter_releases_its_turn():
+    scheduler = FairScheduler(slots=1)
+    release = threading.Event()
+
+    async def main():
+        blocker = asyncio.create_task(scheduler.run(ClientIdentity("a"), release.wait, 5))
+        await asyncio.sleep(0.05)
+        waiter = asyncio.create_task(scheduler.run(ClientIdentity("b"), lambda: "b"))
+        await asyncio.sleep(0.05)
+        waiter.cancel()
+        release.set()
+        await blocker
+        assert await scheduler.run(ClientIdentity("c"), lambda: "c") == "c"
+
+    asyncio.run(main())
+    assert scheduler.snapshot()["busy"] == 0
+
+def test_client_tags_are_forgotten_under_sustained_load():
+    scheduler = FairScheduler(slots=2)
+    release = threading.Event()
+
+    async def main():
+        # A long-running job keeps the scheduler from ever going idle
+        blocker = asyncio.create_task(scheduler.run(ClientIdentity("blocker"), release.wait, 5))
+        await asyncio.sleep(0.05)
+        for i in range(100):
+            await scheduler.run(ClientIdentity(f"client-{i}"), lambda: None)
+        remembered = len(scheduler._last_tag)
+        release.set()
+        await blocker
+        return remembered
+
+    # Only clients whose tags are still ahead of the virtual time are remembered
+    assert asyncio.run(main()) <= 2
+    assert len(scheduler._tag_expiry) <= 2
+
+def test_cancelled_caller_keeps_its_slot_until_the_thread_ends():
+    scheduler = FairScheduler(slots=1)
+    release = threading.Event()
+    running = []
+
+    def job(name):
+        running.append(name)
+        if name == "first":
+            release.wait(5)
+        return name
+
+    async def main():
+        first = asyncio.create_task(scheduler.run(ClientIdentity("a"), job, "first"))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        await asyncio.sleep(0.05)
+        second = asyncio.create_task(scheduler.run(ClientIdentity("b"), job, "second"))
+        await asyncio.sleep(0.1)
+        # The first thread is still running, so the only slot is still taken
+        assert running == ["first"]
+        assert scheduler.snapshot()["busy"] == 1
+        release.set()
+        assert await second == "second"
+
+    asyncio.run(main())
+    assert scheduler.snapshot() == {"slots": 1, "busy": 0, "waiting": 0}
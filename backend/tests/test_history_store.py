@@ -0,0 +1,107 @@
+from app.services.history_store import SUMMARY_COLUMNS, HistoryStore, job_description_hash
+
+from conftest import JOB_DESCRIPTION, RESUME, make_result
+
+def test_job_description_hash_ignores_whitespace():
+    assert job_description_hash("Python  developer\n") == job_description_hash(" Python developer")
+    assert job_description_hash("Python developer") != job_description_hash("Go developer")
+
+def test_reuse_requires_same_job_description(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.db"), pool_size=1)
+    analysis_id = store.save_analysis(make_result(70.0), "backend", JOB_DESCRIPTION, "doc-1",
+                                      scoring_version="v1")
+
+    previous = store.latest_analysis("doc-1", "backend", JOB_DESCRIPTION, "v1", ["full"])
+    assert previous["id"] == analysis_id
+
+    edited = JOB_DESCRIPTION + " Go experience required."
+    assert store.latest_analysis("doc-1", "backend", edited, "v1", ["full"]) is None
+    assert store.latest_analysis("doc-1", "backend", JOB_DESCRIPTION, "v1", ["fast"]) is None
+    store.close()
+
+def test_reuse_requires_same_scoring_version_and_no_session(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.db"), pool_size=1)
+    store.save_analysis(make_result(70.0), "backend", JOB_DESCRIPTION, "doc-1", scoring_version="v1")
+    assert store.latest_analysis("doc-1", "backend", JOB_DESCRIPTION, "v2") is None
+
+    store.save_analysis(make_result(60.0), "backend", JOB_DESCRIPTION, "doc-2",
+                        scoring_version="v1", from_session=True)
+    assert store.latest_analysis("doc-2", "backend", JOB_DESCRIPTION, "v1") is None
+    store.close()
+
+def test_job_profile_follows_current_description(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.db"), pool_size=1)
+    store.save_analysis(make_result(70.0), "backend", JOB_DESCRIPTION, "doc-1")
+    store.save_analysis(make_result(50.0, missing=("go",)), "backend", "Go developer", "doc-1")
+
+    [job] = store.list_jobs()
+    assert job["id"] == "backend"
+    assert job["skills"] == ["go", "python"]
+    store.close()
+
+def test_edited_job_description_is_analyzed_again(client):
+    data = {"resume_text": RESUME, "job_description": JOB_DESCRIPTION, "job_id": "reuse-test", "tier": "fast"}
+    first = client.post("/analyze", data=data).json()
+    assert not first.get("reused")
+    assert client.post("/analyze", data=data).json()["reused"] is True
+
+    edited = dict(data, job_description=JOB_DESCRIPTION + " Strong Go and Rust skills required.")
+    second = client.post("/analyze", data=edited).json()
+    assert not second.get("reused")
+    assert second["analysis_id"] != first["analysis_id"]
+
+def test_taxonomy_change_is_analyzed_again(client, monkeypatch):
+    import app.main
+
+    data = {"resume_text": RESUME + "\nTaxonomy test.", "job_description": JOB_DESCRIPTION,
+            "job_id": "version-test", "tier": "fast"}
+    client.post("/analyze", data=data)
+    assert client.post("/analyze", data=data).json()["reused"] is True
+
+    monkeypatch.setattr(app.main, "scoring_version", lambda: "reloaded:none")
+    assert not client.post("/analyze", data=data).json().get("reused")
+
+def test_session_results_are_not_reused(client):
+    data = {"resume_text": RESUME + "\nSession test.", "job_description": JOB_DESCRIPTION,
+            "job_id": "session-test", "tier": "fast"}
+    assert "sections" in client.post("/analyze", data=dict(data, session_id="reuse-session")).json()
+    result = client.post("/analyze", data=data).json()
+    assert not result.get("reused")
+    assert "sections" not in result
+
+def test_reused_result_reports_current_duplicates(client, monkeypatch):
+    import app.main
+    from app.services.dedup import DuplicateIndex
+
+    original = RESUME + "\nLed the migration of twelve services to Kubernetes on AWS with Terraform."
+    edited = original.replace("twelve", "fifteen")
+    data = {"job_description": JOB_DESCRIPTION, "job_id": "duplicate-test", "tier": "fast"}
+    client.post("/analyze", data=dict(data, resume_text=original))
+    assert client.post("/analyze", data=dict(data, resume_text=edited)).json()["duplicate_of"]
+
+    # The original is no longer indexed, so the reused result is not a duplicate any more
+    monkeypatch.setattr(app.main, "get_duplicate_index", lambda: DuplicateIndex())
+    result = client.post("/analyze", data=dict(data, resume_text=edited)).json()
+    assert result["reused"] is True
+    assert "duplicate_of" not in result
+
+def test_job_and_document_pages_walk_an_index(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.db"), pool_size=1)
+    for number in range(20):
+        store.save_analysis(make_result(float(number)), f"job-{number % 3}", JOB_DESCRIPTION, f"doc-{number % 4}")
+
+    with store._connection() as conn:
+        for condition, params in (("job_id = ?", ["job-1"]), ("job_id = ? AND id < ?", ["job-1", 10]),
+                                  ("document_id = ? AND id < ?", ["doc-2", 10])):
+            plan = " ".join(row["detail"] for row in conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT {SUMMARY_COLUMNS} FROM analyses WHERE {condition} "
+                "ORDER BY id DESC LIMIT 51", params
+            ))
+            assert "USING INDEX idx_analyses_" in plan
+            assert "TEMP B-TREE" not in plan
+
+    page = store.list_analyses(job_id="job-1", limit=3)
+    rest = store.list_analyses(job_id="job-1", before_id=page["next_before_id"], limit=10)
+    ids = [item["id"] for item in page["items"] + rest["items"]]
+    assert ids == sorted(ids, reverse=True) and len(ids) == 7
+    store.close()
@@ -0,0 +1,102 @@
+import numpy as np
+
+from app.services.incremental import IncrementalAnalyzer
+from app.services.text_parser import TextParser
+
+from conftest import JOB_DESCRIPTION, RESUME
+
+EDITED = RESUME.replace("deployed with Docker on AWS.", "deployed with Docker and Kubernetes on AWS.")
+
+def test_scores_match_a_full_analysis(service):
+    service.analyze_incremental("scores", RESUME, JOB_DESCRIPTION, "fast")
+    outcome, stats = service.analyze_incremental("scores", EDITED, JOB_DESCRIPTION, "fast")
+    assert 0 < stats.sections_reused < stats.sections_total
+    assert outcome.to_dict() == service.analyze_resume_jd_match(EDITED, JOB_DESCRIPTION, "fast").to_dict()
+
+def test_only_edited_sections_are_encoded_again(service):
+    engine = service.get_engine()
+    incremental = IncrementalAnalyzer()
+    encoded = []
+
+    def encoder(texts):
+        encoded.extend(texts)
+        return np.ones((len(texts), 4))
+
+    incremental.profile("session", RESUME, engine, "v1")
+    first = incremental.document_embedding("session", RESUME, encoder, "v1")
+    sections = len(encoded)
+    assert first is not None and sections > 1
+
+    encoded.clear()
+    incremental.profile("session", EDITED, engine, "v1")
+    incremental.document_embedding("session", EDITED, encoder, "v1")
+    assert len(encoded) == 1 and "Kubernetes" in encoded[0]
+
+def test_full_tier_uses_cached_section_embeddings(service, monkeypatch):
+    model = service.nlp_analyzer.sentence_model
+    service.analyze_incremental("semantic", RESUME, JOB_DESCRIPTION, "full")
+
+    encoded = []
+    original = model.encode
+
+    def encode(texts, *args, **kwargs):
+        encoded.extend(texts if isinstance(texts, list) else [texts])
+        return original(texts, *args, **kwargs)
+
+    monkeypatch.setattr(model, "encode", encode)
+    outcome, _ = service.analyze_incremental("semantic", RESUME, JOB_DESCRIPTION, "full")
+    assert outcome.semantic_similarity is not None
+    # Nothing changed, so neither the resume nor any of its sections is encoded again
+    sections = [content for _, content in TextParser.split_sections(RESUME)]
+    assert RESUME not in encoded
+    assert not any(content in encoded for content in sections)
+
+def test_embedding_covers_sections_the_session_has_not_profiled(service):
+    incremental = IncrementalAnalyzer()
+    engine = service.get_engine()
+
+    def encoder(texts):
+        return np.array([[len(text), 1.0] for text in texts])
+
+    incremental.profile("gaps", RESUME, engine, "v1")
+    # EDITED was never profiled in this session, so its edited section has no cache entry
+    embedding = incremental.document_embedding("gaps", EDITED, encoder, "v1")
+    segments = [content for _, content in TextParser.split_sections(EDITED)]
+    weights = np.array([len(content) for content in segments], dtype=np.float64)
+    expected = (encoder(segments) * weights[:, None]).sum(axis=0) / weights.sum()
+    assert np.allclose(embedding, expected)
+
+def test_concurrent_requests_on_a_session_are_serialized(service, monkeypatch):
+    import threading
+    import time
+
+    engine = service.get_engine()
+    active, overlaps = [], []
+    original = engine.profile
+
+    def profile(text):
+        active.append(text)
+        overlaps.append(len(active))
+        time.sleep(0.005)
+        active.remove(text)
+        return original(text)
+
+    monkeypatch.setattr(engine, "profile", profile)
+    results = {}
+
+    def submit(name, text):
+        results[name] = service.analyze_incremental("concurrent", text, JOB_DESCRIPTION, "fast")[0]
+
+    threads = [threading.Thread(target=submit, args=(f"r{i}", text))
+               for i, text in enumerate([RESUME, EDITED] * 3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(overlaps) == 1
+    monkeypatch.setattr(engine, "profile", original)
+    expected = {text: service.analyze_resume_jd_match(text, JOB_DESCRIPTION, "fast").to_dict()
+                for text in (RESUME, EDITED)}
+    for i, text in enumerate([RESUME, EDITED] * 3):
+        assert results[f"r{i}"].to_dict() == expected[text]
@@ -0,0 +1,43 @@
+import re
+
+import pytest
+
+from app.services.model_registry import get_nlp_analyzer
+from app.services.scoring_engine import TermMatcher
+
+TEXT = (
+    "Built Spring Boot services in JAVA and Java; spring batch jobs, "
+    "Machine Learning pipelines and machine-learning research. "
+    "Boot camps on SQL, NoSQL and PostgreSQL. Go, Golang, go-to C++ and c# work."
+)
+TERMS = ["spring", "spring boot", "boot", "java", "machine learning", "learning",
+         "sql", "nosql", "postgresql", "go", "c++", "c#", "rust"]
+
+def findall_counts(text, terms):
+    text = text.lower()
+    return [len(re.findall(r'\b' + re.escape(term.lower()) + r'\b', text)) for term in terms]
+
+def test_counts_equal_a_findall_per_term():
+    matcher = TermMatcher(TERMS, word_boundary=True)
+    assert matcher.counts(TEXT).tolist() == findall_counts(TEXT, TERMS)
+
+def test_counts_on_overlapping_terms():
+    terms = ["data", "data science", "science", "data science lead"]
+    text = "Data Science Lead; data science; DATA; science of data science lead"
+    matcher = TermMatcher(terms, word_boundary=True)
+    assert matcher.counts(text).tolist() == findall_counts(text, terms) == [4, 3, 4, 2]
+
+def test_counts_of_empty_text():
+    assert TermMatcher(TERMS).counts("").tolist() == [0] * len(TERMS)
+
+def test_density_matches_the_per_keyword_formula():
+    densities = get_nlp_analyzer().calculate_keyword_density(TEXT, TERMS)
+    words = len(TEXT.split())
+    expected = [count / words * 100 for count in findall_counts(TEXT, TERMS)]
+    assert list(densities) == TERMS
+    assert list(densities.values()) == pytest.approx(expected)
+
+def test_density_defaults_to_the_skill_vocabulary():
+    densities = get_nlp_analyzer().calculate_keyword_density("Python and python and Docker")
+    assert densities["python"] == pytest.approx(2 / 5 * 100)
+    assert densities["kubernetes"] == 0.0
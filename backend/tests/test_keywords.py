@@ -0,0 +1,40 @@
+import json
+
+from app.services.keywords import ACTION_VERBS, KeywordEngine, build_idf_table
+
+JD = "Kafka pipelines. Python services, Python tooling, Kafka streams and Terraform modules."
+
+def test_ties_are_broken_by_first_occurrence():
+    engine = KeywordEngine(top_terms=5)
+    # Without an IDF table every term weighs its count; equal counts keep JD order
+    assert engine.rank_terms(JD) == ("kafka", "python", "pipelines", "services", "tooling")
+    assert engine.rank_terms("zeta alpha mango") == ("zeta", "alpha", "mango")
+
+def test_ranking_is_deterministic_across_engines():
+    jd = " ".join(f"term{chr(97 + i)}x" for i in range(26))
+    rankings = {KeywordEngine(top_terms=10).rank_terms(jd) for _ in range(5)}
+    assert len(rankings) == 1
+
+def test_idf_table_reorders_terms():
+    corpus = ["python services and python tooling"] * 5 + ["kafka streams"]
+    table = build_idf_table(corpus, min_df=1)
+    engine = KeywordEngine(table["idf"], table["documents"], top_terms=2)
+    # "python" is common in the corpus, so the rarer "kafka" outranks it despite equal counts
+    assert engine.rank_terms(JD)[0] == "kafka"
+
+def test_load_without_table_falls_back_to_frequency(tmp_path):
+    engine = KeywordEngine.load(str(tmp_path / "missing.json"))
+    assert engine.idf == {} and engine.version == "none"
+    assert engine.rank_terms(JD)[:2] == ("kafka", "python")
+
+def test_load_reads_table_and_versions_it(tmp_path):
+    path = tmp_path / "idf.json"
+    path.write_text(json.dumps(build_idf_table(["kafka streams", "python tooling"], min_df=1)))
+    engine = KeywordEngine.load(str(path))
+    assert engine.documents == 2 and engine.version != "none"
+
+def test_check_reports_presence_of_verbs_and_terms():
+    status = KeywordEngine(top_terms=3).check("I developed Kafka consumers.", JD)
+    assert status["developed"] and not status["managed"]
+    assert status["kafka"] and not status["python"]
+    assert set(ACTION_VERBS) <= set(status)
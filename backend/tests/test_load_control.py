@@ -0,0 +1,70 @@
+import pytest
+
+from app.services.load_control import QUEUE_STAGE, SCORING_STAGE, SEMANTIC_STAGE, LoadController
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def controller(clock):
+    return LoadController(slo_ms=1000, max_queue_depth=2, probe_interval=5, alpha=0.5, clock=clock)
+
+def test_ewma_starts_at_first_sample_and_moves_by_alpha(controller):
+    controller.observe(SEMANTIC_STAGE, 400)
+    assert controller.snapshot()["stage_ms"][SEMANTIC_STAGE] == 400
+    controller.observe(SEMANTIC_STAGE, 800)
+    assert controller.snapshot()["stage_ms"][SEMANTIC_STAGE] == 600
+    controller.observe(SEMANTIC_STAGE, 200)
+    assert controller.snapshot()["stage_ms"][SEMANTIC_STAGE] == 400
+
+    controller.observe(QUEUE_STAGE, 100)
+    controller.observe(SCORING_STAGE, 50)
+    assert controller.estimated_full_ms() == 550
+
+def test_sheds_to_the_fast_tier_once_over_budget(controller):
+    controller.observe(SCORING_STAGE, 100)
+    controller.observe(SEMANTIC_STAGE, 800)
+    assert controller.shed_semantic() is False
+
+    controller.observe(SEMANTIC_STAGE, 1600)
+    assert controller.estimated_full_ms() > controller.slo_ms
+    assert controller.shed_semantic() is True
+    assert controller.shed_semantic() is True
+    assert controller.snapshot()["shedding"] is True
+    assert controller.snapshot()["shed_analyses"] == 2
+
+def test_sheds_when_the_queue_is_too_deep(controller):
+    with controller.admit(), controller.admit():
+        assert controller.shed_semantic() is False
+        with controller.admit():
+            assert controller.shed_semantic() is True
+    assert controller.shed_semantic() is False
+    assert controller.snapshot()["queue_depth"] == 0
+
+def test_probes_let_the_controller_recover(controller, clock):
+    controller.observe(SEMANTIC_STAGE, 3000)
+    assert controller.shed_semantic() is True
+
+    # Within the probe interval every analysis is shed
+    clock.now += 4.9
+    assert controller.shed_semantic() is True
+
+    # Then one analysis runs the full tier, and only one
+    clock.now += 0.1
+    assert controller.shed_semantic() is False
+    assert controller.shed_semantic() is True
+
+    # Its timing shows the load has passed, so the next call stops shedding
+    for _ in range(4):
+        controller.observe(SEMANTIC_STAGE, 100)
+    assert controller.estimated_full_ms() < controller.slo_ms
+    assert controller.shed_semantic() is False
+    assert controller.snapshot()["shedding"] is False
@@ -0,0 +1,62 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from app.services import taxonomy
+from app.services.model_bundle import ModelBundle
+from app.services.taxonomy import TAXONOMY_PATH, TaxonomyError, TaxonomyRegistry, load_taxonomy
+
+@pytest.fixture(scope="module")
+def bundle(tmp_path_factory):
+    from scripts.build_model_bundle import main
+
+    output_dir = tmp_path_factory.mktemp("models")
+    main(["--output-dir", str(output_dir), "--sentence-model", "fake", "--no-spacy"])
+    return ModelBundle(str(output_dir / "current"))
+
+def test_bundle_ships_taxonomy_and_matching_embeddings(bundle):
+    index = load_taxonomy(bundle.taxonomy_path)
+    assert index.version == bundle.taxonomy_version
+    embeddings = bundle.skill_embeddings(index.version, "fake")
+    assert isinstance(embeddings, np.memmap)
+    assert embeddings.shape[0] == len(index.vocabulary.skills)
+    assert bundle.skill_embeddings("other-version", "fake") is None
+
+def test_rebuilding_unchanged_inputs_keeps_the_version(bundle, tmp_path):
+    from scripts.build_model_bundle import main
+
+    main(["--output-dir", str(tmp_path), "--sentence-model", "fake", "--no-spacy"])
+    assert ModelBundle(str(tmp_path / "current")).version == bundle.version
+
+def test_registry_serves_the_bundled_taxonomy(bundle, monkeypatch):
+    monkeypatch.setattr(taxonomy, "_registry", None)
+    monkeypatch.setattr(taxonomy, "get_model_bundle", lambda: bundle)
+    registry = taxonomy.get_taxonomy_registry()
+    assert registry.path == bundle.taxonomy_path
+    assert registry.current.version == bundle.taxonomy_version
+
+def test_taxonomy_version_mismatch_fails_loudly(bundle, tmp_path):
+    edited = tmp_path / "taxonomy.json"
+    with open(bundle.taxonomy_path, encoding="utf-8") as f:
+        data = json.load(f)
+    data["version_note"] = "edited after the bundle was built"
+    edited.write_text(json.dumps(data))
+
+    with pytest.raises(TaxonomyError):
+        TaxonomyRegistry(str(edited), bundle.taxonomy_version)
+
+def test_reload_keeps_the_bundled_version_on_mismatch(bundle, tmp_path):
+    path = tmp_path / "taxonomy.json"
+    with open(bundle.taxonomy_path, "rb") as f:
+        path.write_bytes(f.read())
+    registry = TaxonomyRegistry(str(path), bundle.taxonomy_version)
+
+    path.write_bytes(path.read_bytes() + b"\n")
+    os.utime(path, ns=(0, 1))
+    assert registry.reload_if_changed() is False
+    assert registry.current.version == bundle.taxonomy_version
+
+def test_without_a_bundle_the_repo_taxonomy_is_used():
+    assert TaxonomyRegistry().path == TAXONOMY_PATH
@@ -0,0 +1,87 @@
+import math
+
+from app.services import rate_limit
+from app.services.rate_limit import BATCH, INTERACTIVE, ClientIdentity, TokenBucketLimiter, identify_client
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+def test_unknown_api_keys_fall_back_to_client_ip(monkeypatch):
+    monkeypatch.setattr(rate_limit, "API_KEYS", frozenset({"known"}))
+    monkeypatch.setattr(rate_limit, "BATCH_API_KEYS", frozenset({"bulk"}))
+
+    # Rotating made-up keys must not create new identities
+    assert identify_client("random-1", "10.0.0.1") == identify_client("random-2", "10.0.0.1")
+    assert identify_client("random-1", "10.0.0.1") == ClientIdentity("ip:10.0.0.1")
+
+    known = identify_client("known", "10.0.0.1")
+    assert known.key.startswith("key:") and known.service_class == INTERACTIVE
+    assert identify_client("bulk", "10.0.0.1").service_class == BATCH
+
+def test_forwarded_for_only_when_trusted(monkeypatch):
+    monkeypatch.setattr(rate_limit, "TRUST_PROXY_HEADERS", False)
+    assert identify_client(None, "10.0.0.1", "1.2.3.4").key == "ip:10.0.0.1"
+    monkeypatch.setattr(rate_limit, "TRUST_PROXY_HEADERS", True)
+    assert identify_client(None, "10.0.0.1", "1.2.3.4, 10.0.0.1").key == "ip:1.2.3.4"
+
+def test_bucket_allows_burst_then_refills(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", clock)
+    limiter = TokenBucketLimiter(per_minute=60, burst=3)
+    client = ClientIdentity("ip:10.0.0.1")
+
+    assert [limiter.acquire(client)[0] for _ in range(4)] == [True, True, True, False]
+    allowed, _, retry_after = limiter.acquire(client)
+    assert not allowed and math.isclose(retry_after, 1.0)
+
+    clock.now += 1.0
+    assert limiter.acquire(client)[0]
+    # Other clients have their own bucket
+    assert limiter.acquire(ClientIdentity("ip:10.0.0.2"))[0]
+
+def test_batch_clients_use_batch_limits(monkeypatch):
+    monkeypatch.setattr(rate_limit.time, "monotonic", FakeClock())
+    limiter = TokenBucketLimiter(per_minute=60, burst=1, batch_per_minute=600, batch_burst=5)
+    batch = ClientIdentity("key:bulk", BATCH)
+    assert sum(limiter.acquire(batch)[0] for _ in range(10)) == 5
+
+def test_zero_rate_never_refills(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", clock)
+    limiter = TokenBucketLimiter(per_minute=0, burst=1)
+    client = ClientIdentity("ip:10.0.0.1")
+    assert limiter.acquire(client)[0]
+    clock.now += 3600
+    allowed, _, retry_after = limiter.acquire(client)
+    assert not allowed and retry_after == math.inf
+
+def test_least_recently_seen_buckets_are_evicted(monkeypatch):
+    monkeypatch.setattr(rate_limit.time, "monotonic", FakeClock())
+    limiter = TokenBucketLimiter(per_minute=60, burst=1, max_clients=2)
+    first = ClientIdentity("ip:1")
+    limiter.acquire(first)
+    limiter.acquire(ClientIdentity("ip:2"))
+    limiter.acquire(ClientIdentity("ip:3"))
+    # Evicted, so it starts again with a full bucket
+    assert limiter.acquire(first)[0]
+
+def test_middleware_returns_429_with_retry_after(client, monkeypatch):
+    import app.main
+
+    monkeypatch.setattr(app.main, "get_rate_limiter", lambda: limiter)
+    limiter = TokenBucketLimiter(per_minute=60, burst=1)
+    data = {"resume_text": "", "job_description": "Python developer"}
+
+    first = client.post("/analyze", data=data)
+    assert first.status_code == 400  # empty resume, but the request was admitted
+    assert first.headers["X-RateLimit-Remaining"] == "0"
+
+    denied = client.post("/analyze", data=data)
+    assert denied.status_code == 429
+    assert denied.headers["Retry-After"] == "1"
+    # Reads are not limited
+    assert client.get("/health").status_code == 200
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from app.services.model_registry import get_scoring_service
+
+from conftest import JOB_DESCRIPTION, RESUME
+
+RESUMES = [
+    RESUME,
+    "Junior developer\nExperience\n1 year of JavaScript and React work.\n",
+    "Senior Software Engineer, 10 years of experience. Python, Django, PostgreSQL, Docker, "
+    "Kubernetes and AWS. AWS Certified Solutions Architect.",
+    "Registered nurse with eight years of intensive care experience.",
+    "",
+]
+COMPONENTS = ("overall_score", "skills_score", "experience_score", "certification_score")
+
+@pytest.fixture
+def engine():
+    return get_scoring_service().get_engine()
+
+def test_score_many_matches_scoring_each_resume(engine):
+    jd = engine.profile(JOB_DESCRIPTION)
+    batch = engine.score_many(engine.profile_many(RESUMES), jd)
+
+    for row, text in enumerate(RESUMES):
+        single = engine.score(engine.profile(text), jd)
+        for component in COMPONENTS:
+            assert getattr(batch, component)[row] == pytest.approx(getattr(single, component)[0])
+        for mask in ("matched_skills", "missing_skills", "matched_certs", "matched_titles", "missing_titles"):
+            assert np.array_equal(getattr(batch, mask)[row], getattr(single, mask)[0])
+        assert batch.experience_matched[row] == single.experience_matched[0]
+
+def test_score_many_matches_the_analysis_endpoint_path(engine):
+    service = get_scoring_service()
+    batch = engine.score_many(engine.profile_many(RESUMES), engine.profile(JOB_DESCRIPTION))
+
+    for row, text in enumerate(RESUMES):
+        breakdown = service.analyze_resume_jd_match(text, JOB_DESCRIPTION, "fast").match_breakdown
+        for component in COMPONENTS:
+            assert getattr(breakdown, component) == round(float(getattr(batch, component)[row]), 1)
+
+def test_scores_differ_across_fixtures(engine):
+    batch = engine.score_many(engine.profile_many(RESUMES), engine.profile(JOB_DESCRIPTION))
+    assert len(set(np.round(batch.overall_score, 1))) > 2
@@ -0,0 +1,38 @@
+import pytest
+
+from conftest import JOB_DESCRIPTION, RESUME
+
+WEAK_RESUME = "John Smith\nRetail associate\n\nExperience\nStocked shelves and handled the till.\n"
+
+@pytest.mark.parametrize("resume", [RESUME, WEAK_RESUME])
+def test_verdict_matches_a_full_analysis(service, resume):
+    full_score = service.analyze_resume_jd_match(resume, JOB_DESCRIPTION, "fast").overall_score
+    for min_score in (0.0, full_score - 0.1, full_score, full_score + 0.1, 100.0):
+        outcome = service.screen_resume(resume, JOB_DESCRIPTION, min_score)
+        assert outcome.passed == (full_score >= min_score)
+        if outcome.overall_score is not None:
+            assert outcome.overall_score == full_score
+        else:
+            assert not outcome.passed
+            assert outcome.max_possible_score < min_score
+
+def test_hopeless_resume_stops_early(service):
+    outcome = service.screen_resume(WEAK_RESUME, JOB_DESCRIPTION, 90.0)
+    assert not outcome.passed
+    assert outcome.overall_score is None
+    assert len(outcome.evaluated) < 4
+
+def test_passing_resume_is_fully_evaluated(service):
+    outcome = service.screen_resume(RESUME, JOB_DESCRIPTION, 0.0)
+    assert outcome.passed
+    assert len(outcome.evaluated) == 4
+
+def test_analyze_with_min_score_screens(client):
+    data = {"resume_text": RESUME, "job_description": JOB_DESCRIPTION, "min_score": "0"}
+    response = client.post("/analyze", data=data)
+    assert response.status_code == 200
+    assert response.json()["passed"] is True
+    assert "matched_skills" not in response.json()
+
+    data["min_score"] = "150"
+    assert client.post("/analyze", data=data).status_code == 400
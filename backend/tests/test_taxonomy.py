@@ -0,0 +1,85 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from app.services.scoring_engine import ScoringEngine
+from app.services.taxonomy import TAXONOMY_PATH, TaxonomyError, TaxonomyRegistry
+
+TEXT = "Built Django and Flask services in Python."
+
+@pytest.fixture
+def taxonomy_path(tmp_path):
+    path = tmp_path / "taxonomy.json"
+    shutil.copy(TAXONOMY_PATH, path)
+    return path
+
+def rewrite(path, edit):
+    data = json.loads(path.read_text())
+    edit(data)
+    stat = os.stat(path)
+    path.write_text(json.dumps(data))
+    # Make sure the change is visible even on coarse mtime clocks
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+def drop_skill(name):
+    def edit(data):
+        for spec in data["categories"].values():
+            spec["skills"] = [entry for entry in spec["skills"]
+                              if (entry if isinstance(entry, str) else entry["name"]) != name]
+    return edit
+
+def found_skills(index):
+    vocabulary = index.vocabulary
+    return set(vocabulary.skills_for(vocabulary.skill_matcher.mask(TEXT.lower())))
+
+def test_unchanged_file_is_not_reloaded(taxonomy_path):
+    registry = TaxonomyRegistry(str(taxonomy_path))
+    assert registry.reload_if_changed() is False
+
+def test_edited_file_goes_live_with_a_new_version(taxonomy_path):
+    registry = TaxonomyRegistry(str(taxonomy_path))
+    before = registry.current
+    assert "django" in found_skills(before)
+
+    rewrite(taxonomy_path, drop_skill("django"))
+    assert registry.reload_if_changed() is True
+    assert registry.current.version != before.version
+    assert "django" not in found_skills(registry.current)
+
+def test_in_flight_analyses_keep_their_pinned_index(taxonomy_path):
+    registry = TaxonomyRegistry(str(taxonomy_path))
+    pinned = registry.current
+    engine = ScoringEngine(pinned.vocabulary, lambda text: None,
+                           {"skills": 0.5, "experience": 0.3, "certifications": 0.2})
+    before = engine.profile(TEXT)
+
+    rewrite(taxonomy_path, drop_skill("django"))
+    registry.reload_if_changed()
+
+    assert registry.current is not pinned
+    assert "django" in found_skills(pinned)
+    assert (engine.profile(TEXT).skills == before.skills).all()
+
+@pytest.mark.parametrize("content", ["{not json", json.dumps({"categories": {}})])
+def test_invalid_file_keeps_the_previous_index(taxonomy_path, content):
+    registry = TaxonomyRegistry(str(taxonomy_path))
+    previous = registry.current
+    stat = os.stat(taxonomy_path)
+    taxonomy_path.write_text(content)
+    os.utime(taxonomy_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert registry.reload_if_changed() is False
+    assert registry.current is previous
+    with pytest.raises(TaxonomyError):
+        registry.reload()
+    assert registry.current is previous
+
+def test_pinned_version_is_refused_when_the_file_differs(taxonomy_path):
+    registry = TaxonomyRegistry(str(taxonomy_path))
+    pinned = TaxonomyRegistry(str(taxonomy_path), expected_version=registry.current.version)
+
+    rewrite(taxonomy_path, drop_skill("django"))
+    assert pinned.reload_if_changed() is False
+    assert pinned.current.version == registry.current.version
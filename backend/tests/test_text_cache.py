@@ -0,0 +1,71 @@
+import hashlib
+import os
+
+import pytest
+
+from app.services.text_cache import ExtractedTextCache
+
+def doc_id(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+def test_memory_tier_stays_within_its_character_bound():
+    cache = ExtractedTextCache(max_chars=30, disk_dir=None)
+    ids = [doc_id(name) for name in "abcd"]
+    for document_id in ids[:3]:
+        cache.put(document_id, "x" * 10)
+    assert cache.stats()["chars"] == 30
+
+    # Touch the oldest entry so the second one is evicted instead
+    assert cache.get(ids[0]) is not None
+    cache.put(ids[3], "y" * 10)
+    assert cache.stats()["chars"] == 30
+    assert cache.get(ids[1]) is None
+    assert [cache.get(document_id) for document_id in (ids[0], ids[2], ids[3])] == ["x" * 10, "x" * 10, "y" * 10]
+
+    # Text larger than the whole cache is not kept in memory at all
+    cache.put(doc_id("huge"), "z" * 31)
+    assert cache.get(doc_id("huge")) is None
+    assert cache.stats()["chars"] <= 30
+
+def test_disk_tier_round_trips_across_instances(tmp_path):
+    document_id = doc_id("resume")
+    text = "Senior Python developer — 5 years\nSkills: Django, AWS"
+    ExtractedTextCache(max_chars=1000, disk_dir=str(tmp_path)).put(document_id, text)
+
+    restarted = ExtractedTextCache(max_chars=1000, disk_dir=str(tmp_path))
+    assert restarted.stats()["disk_bytes"] == len(text.encode("utf-8"))
+    assert restarted.get(document_id) == text
+    assert restarted.stats()["entries"] == 1
+    assert restarted.stats()["hits"] == 1
+
+def test_disk_tier_evicts_oldest_files(tmp_path):
+    cache = ExtractedTextCache(max_chars=1000, disk_dir=str(tmp_path), disk_max_bytes=250)
+    ids = [doc_id(str(number)) for number in range(3)]
+    for age, document_id in enumerate(ids):
+        cache.put(document_id, "x" * 100)
+        path = cache._disk_path(cache._key(document_id))
+        os.utime(path, (1000 + age, 1000 + age))
+
+    assert cache.stats()["disk_bytes"] <= 250
+    fresh = ExtractedTextCache(max_chars=1000, disk_dir=str(tmp_path))
+    assert fresh.get(ids[0]) is None
+    assert fresh.get(ids[2]) == "x" * 100
+
+def test_keyed_on_content_hash_and_parser_version(tmp_path):
+    document_id = doc_id("resume")
+    old = ExtractedTextCache(max_chars=1000, disk_dir=str(tmp_path), parser_version="1")
+    old.put(document_id, "text from the old parser")
+    assert old.get(doc_id("other resume")) is None
+
+    upgraded = ExtractedTextCache(max_chars=1000, disk_dir=str(tmp_path), parser_version="2")
+    assert upgraded.get(document_id) is None
+    upgraded.put(document_id, "text from the new parser")
+    assert upgraded.get(document_id) == "text from the new parser"
+    assert old.get(document_id) == "text from the old parser"
+
+def test_rejects_ids_that_are_not_content_hashes(tmp_path):
+    cache = ExtractedTextCache(max_chars=1000, disk_dir=str(tmp_path))
+    assert cache.get("../../etc/passwd") is None
+    with pytest.raises(ValueError):
+        cache.put("not-a-hash", "text")
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,31 @@
+import io
+
+from app.services.text_parser import TextParser
+
+RESUME_LINES = [
+    "Jane Doe",
+    "Experience",
+    "Backend engineer at Acme, 2019-2024",
+    "Education",
+    "B.S. in Computer Science, State University",
+    "Skills: Python, SQL",
+]
+
+def test_sections_found_in_one_pass():
+    text = "\n".join(RESUME_LINES)
+    sections = TextParser.extract_sections(text)
+    assert "Acme" in sections["experience"]
+    assert "State University" in sections["education"]
+    assert sections["skills"].strip() == "Python, SQL"
+
+def test_windows_line_endings_are_normalized():
+    payload = "\r\n".join(RESUME_LINES).encode("utf-8")
+    text = TextParser.extract_text(io.BytesIO(payload), ".txt")
+    assert "\r" not in text
+    assert [section for section, _ in TextParser.split_sections(text)][1:] == ["experience", "education", "skills"]
+
+def test_spans_cover_the_text_in_order():
+    text = "\n".join(RESUME_LINES)
+    spans = TextParser.section_spans(text)
+    assert spans[0].start == 0 and spans[-1].end == len(text)
+    assert all(left.end == right.start for left, right in zip(spans, spans[1:]))
@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from app.utils.topk import TopK
+from scripts.batch_score import TopKWriter
+
+def test_ranked_best_first_and_keeps_only_k():
+    ranking = TopK(3)
+    for score, name in [(0.2, "a"), (0.9, "b"), (0.5, "c"), (0.1, "d"), (0.7, "e")]:
+        ranking.push(score, name)
+    assert ranking.ranked() == [(0.9, "b"), (0.7, "e"), (0.5, "c")]
+    assert ranking.seen == 5
+
+def test_ties_keep_the_earlier_arrival():
+    ranking = TopK(2)
+    assert ranking.push(0.5, "first")
+    assert ranking.push(0.5, "second")
+    assert not ranking.push(0.5, "third")
+    assert ranking.ranked() == [(0.5, "first"), (0.5, "second")]
+
+def test_threshold_once_full():
+    ranking = TopK(2)
+    ranking.push(0.4, "a")
+    assert ranking.threshold is None
+    ranking.push(0.8, "b")
+    assert ranking.threshold == 0.4
+    ranking.push(0.6, "c")
+    assert ranking.threshold == 0.6
+
+def test_pushpop_reports_what_left_the_ranking():
+    ranking = TopK(1)
+    assert ranking.pushpop(0.5, "a") is None
+    assert ranking.pushpop(0.3, "b") == "b"
+    assert ranking.pushpop(0.7, "c") == "a"
+    assert list(ranking) == ["c"]
+
+def test_k_must_be_positive():
+    with pytest.raises(ValueError):
+        TopK(0)
+
+def rows(job_id, scores):
+    return [{"document": f"{name}.txt", "job_id": job_id, "overall_score": score}
+            for name, score in scores.items()]
+
+def test_writer_does_not_rank_a_document_twice(tmp_path):
+    writer = TopKWriter(str(tmp_path / "top.jsonl"), k=2)
+    batch = rows("job", {"a": 0.9, "b": 0.5, "c": 0.7})
+    writer.write(batch)
+    writer.write(batch)
+    writer.close()
+
+    with open(tmp_path / "top.jsonl", encoding="utf-8") as f:
+        written = [json.loads(line) for line in f]
+    assert [(row["document"], row["rank"]) for row in written] == [("a.txt", 1), ("c.txt", 2)]
+
+def test_writer_resumes_from_its_output(tmp_path):
+    path = str(tmp_path / "top.jsonl")
+    writer = TopKWriter(path, k=2)
+    writer.write(rows("job", {"a": 0.9, "b": 0.5}) + rows("other", {"x": 0.3}))
+    writer.close()
+
+    # A rerun replays the same rows, then sees a new one that evicts "b"
+    writer = TopKWriter(path, k=2)
+    writer.write(rows("job", {"a": 0.9, "b": 0.5}))
+    writer.write(rows("job", {"c": 0.8, "b": 0.5}))
+    assert writer.thresholds() == {"job": 0.8}
+    writer.close()
+
+    with open(path, encoding="utf-8") as f:
+        written = [(row["job_id"], row["document"]) for row in map(json.loads, f)]
+    assert sorted(written) == [("job", "a.txt"), ("job", "c.txt"), ("other", "x.txt")]
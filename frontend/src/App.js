@@ -22,6 +22,7 @@ function App() {
   const [currentStep, setCurrentStep] = useState(1);
   const [resumeFile, setResumeFile] = useState(null);
   const [resumeText, setResumeText] = useState("");
+  const [documentId, setDocumentId] = useState(null);
   const [jobDescription, setJobDescription] = useState("");
   const [analysisResults, setAnalysisResults] = useState(null);
   const [isLoading, setIsLoading] = useState(false);
@@ -49,8 +50,13 @@ function App() {
       setIsLoading(true);
       setLoadingMessage("Processing your resume...");
 
-      const result = await apiService.uploadResume(file);
+      // Upload in resumable, checksummed parts; the server keeps the parsed text
+      const result = await apiService.uploadResumeChunked(file, {
+        onProgress: (fraction) =>
+          setLoadingMessage(`Uploading your resume... ${Math.round(fraction * 100)}%`),
+      });
       setResumeFile(file);
+      setDocumentId(result.document_id);
       setResumeText(result.text_preview);
 
       toast.success("Resume uploaded successfully!");
@@ -94,9 +100,9 @@ function App() {
 
       let results;
 
-      if (resumeFile) {
-        // Use file upload analysis if file is available
-        results = await apiService.analyzeWithFile(jobDescription, resumeFile);
+      if (documentId) {
+        // Analyze the uploaded document without sending the file again
+        results = await apiService.analyzeDocument(documentId, jobDescription);
       } else {
         // Use text analysis
         results = await apiService.analyzeMatch(resumeText, jobDescription);
@@ -122,6 +128,7 @@ function App() {
   const handleStartOver = () => {
     setCurrentStep(1);
     setResumeFile(null);
+    setDocumentId(null);
     setResumeText("");
     setJobDescription("");
     setAnalysisResults(null);
@@ -74,6 +74,80 @@ export const apiService = {
     return response.data;
   },
 
+  // Upload a large file in checksummed parts. Survives dropped connections
+  // and page reloads: an interrupted upload resumes with the parts the
+  // server is still missing. Resolves to the /upload-resume response
+  // (use its document_id with /analyze).
+  async uploadResumeChunked(file, { partSize = 2 * 1024 * 1024, onProgress } = {}) {
+    const resumeKey = `chunked-upload:${file.name}:${file.size}:${file.lastModified}`;
+    let status = null;
+
+    const savedId = window.localStorage.getItem(resumeKey);
+    if (savedId) {
+      try {
+        status = (await api.get(`/uploads/${savedId}`)).data;
+      } catch (error) {
+        window.localStorage.removeItem(resumeKey);
+      }
+    }
+    if (!status) {
+      const formData = new FormData();
+      formData.append("filename", file.name);
+      formData.append("size", file.size);
+      status = (await api.post("/uploads", formData)).data;
+      window.localStorage.setItem(resumeKey, status.upload_id);
+    }
+
+    const size = Math.min(partSize, status.max_part_size);
+    for (const [start, end] of status.missing) {
+      for (let offset = start, partEnd; offset < end; offset = partEnd) {
+        partEnd = Math.min(offset + size, end);
+        // Fold a short tail into this part: only the part ending the file may be small
+        if (end < file.size && end - partEnd < status.min_part_size && end - offset <= status.max_part_size) {
+          partEnd = end;
+        }
+        const part = file.slice(offset, partEnd);
+        const buffer = await part.arrayBuffer();
+        const digest = await window.crypto.subtle.digest("SHA-256", buffer);
+        const checksum = Array.from(new Uint8Array(digest))
+          .map((byte) => byte.toString(16).padStart(2, "0"))
+          .join("");
+
+        for (let attempt = 1; ; attempt++) {
+          try {
+            status = (
+              await api.put(`/uploads/${status.upload_id}/parts`, buffer, {
+                params: { offset },
+                headers: {
+                  "Content-Type": "application/octet-stream",
+                  "X-Content-SHA256": checksum,
+                },
+              })
+            ).data;
+            break;
+          } catch (error) {
+            if (attempt >= 3 || error.response?.status < 500) throw error;
+          }
+        }
+        if (onProgress) onProgress(status.received_bytes / status.size);
+      }
+    }
+
+    const response = await api.post(`/uploads/${status.upload_id}/complete`);
+    window.localStorage.removeItem(resumeKey);
+    return response.data;
+  },
+
+  // Analyze a document stored by a previous upload against a job description
+  async analyzeDocument(documentId, jobDescription) {
+    const formData = new FormData();
+    formData.append("document_id", documentId);
+    formData.append("job_description", jobDescription);
+
+    const response = await api.post("/analyze", formData);
+    return response.data;
+  },
+
   // Alias for compatibility
   async analyzeResume(file, jobDescription = "") {
     return this.uploadResume(file, jobDescription);